@@ -1,7 +1,16 @@
 // src/services/ml-client.service.ts
+import { createHash } from 'crypto';
 import axios, { AxiosInstance } from 'axios';
 import { MLScoreResponse, ThesisMatchResponse, FounderEvaluationResponse } from '../types/ml.types';
 
+/**
+ * Content hash the ML service stores for a thesis registered with text
+ * only (no sectors or stages); mirrors thesis_cache.content_hash
+ */
+export function thesisContentHash(thesisText: string): string {
+  return createHash('sha256').update(thesisText, 'utf8').update('\0').update('\0').digest('hex');
+}
+
 export class MLClientService {
   private client: AxiosInstance;
   private readonly ML_SERVICE_URL: string;
@@ -13,6 +22,8 @@ export class MLClientService {
       timeout: 60000, // 60 seconds for ML operations
       headers: {
         'Content-Type': 'application/json',
+        // Lets the ML service drop work once this client has given up
+        'X-Request-Timeout-Ms': '60000',
       },
     });
   }
@@ -34,14 +45,76 @@ export class MLClientService {
   }
 
   /**
-   * Match thesis with pitch deck
+   * Register thesis so it can be matched by ID
    */
-  async matchThesis(pitchText: string, thesisText: string): Promise<ThesisMatchResponse> {
+  async registerThesis(thesisId: string, thesisText: string): Promise<void> {
     try {
-      const response = await this.client.post('/api/v1/match_thesis', {
-        pitch_text: pitchText,
+      await this.client.put(`/api/v1/theses/${encodeURIComponent(thesisId)}`, {
         thesis_text: thesisText,
       });
+    } catch (error: any) {
+      console.error('Thesis registration error:', error.message);
+      throw new Error(`ML service error: ${error.message}`);
+    }
+  }
+
+  /**
+   * Remove a registered thesis; one that is not registered is ignored
+   */
+  async unregisterThesis(thesisId: string): Promise<void> {
+    try {
+      await this.client.delete(`/api/v1/theses/${encodeURIComponent(thesisId)}`);
+    } catch (error: any) {
+      if (error.response?.status === 404) {
+        return;
+      }
+      console.error('Thesis unregistration error:', error.message);
+      throw new Error(`ML service error: ${error.message}`);
+    }
+  }
+
+  /**
+   * Match thesis with pitch deck
+   *
+   * With a thesis ID the ML service reuses its preprocessed copy of the
+   * thesis. When that copy is missing (404) or was registered with other
+   * content (409), the text is sent along with the ID so whichever worker
+   * answers registers it; should that fail too, the thesis is matched
+   * inline by text alone.
+   */
+  async matchThesis(
+    pitchText: string,
+    thesisText: string,
+    thesisId?: string
+  ): Promise<ThesisMatchResponse> {
+    const inline = { pitch_text: pitchText, thesis_text: thesisText };
+    try {
+      if (thesisId) {
+        const request = {
+          pitch_text: pitchText,
+          thesis_id: thesisId,
+          thesis_content_hash: thesisContentHash(thesisText),
+        };
+        try {
+          const response = await this.client.post('/api/v1/match_thesis', request);
+          return response.data;
+        } catch (error: any) {
+          if (error.response?.status !== 404 && error.response?.status !== 409) {
+            throw error;
+          }
+        }
+        try {
+          const response = await this.client.post('/api/v1/match_thesis', {
+            ...request,
+            thesis_text: thesisText,
+          });
+          return response.data;
+        } catch (error: any) {
+          console.error(`Thesis ${thesisId} re-registration error, matching inline:`, error.message);
+        }
+      }
+
+      const response = await this.client.post('/api/v1/match_thesis', inline);
       return response.data;
     } catch (error: any) {
       console.error('Thesis matching error:', error.message);
@@ -39,6 +39,16 @@ export class ThesisService {
       { new: true, runValidators: true }
     );
 
+    // Refresh the ML service's preprocessed copy; if this fails, the
+    // content hash sent with the next match makes it re-register
+    if (thesis && updateData.thesis_text) {
+      try {
+        await mlClientService.registerThesis(String(thesis._id), thesis.thesis_text);
+      } catch (error: any) {
+        console.error(`Thesis ${thesis._id} not re-registered:`, error.message);
+      }
+    }
+
     return thesis;
   }
 
@@ -79,7 +89,11 @@ export class ThesisService {
 
     // Use ML for semantic matching
     const pitchText = `${deal.description} ${deal.target_market} ${deal.competitive_advantage}`;
-    const mlMatch = await mlClientService.matchThesis(pitchText, thesis.thesis_text);
+    const mlMatch = await mlClientService.matchThesis(
+      pitchText,
+      thesis.thesis_text,
+      String(thesis._id)
+    );
 
     return {
       thesis_id: thesis._id,
@@ -175,7 +189,11 @@ export class ThesisService {
 
     const criteriaMatch = thesis.matchesCriteria(deal);
     const pitchText = `${deal.description} ${deal.target_market}`;
-    const mlMatch = await mlClientService.matchThesis(pitchText, thesis.thesis_text);
+    const mlMatch = await mlClientService.matchThesis(
+      pitchText,
+      thesis.thesis_text,
+      String(thesis._id)
+    );
 
     return {
       overall_alignment: mlMatch.relevancy_score,
@@ -194,11 +212,22 @@ export class ThesisService {
    * Deactivate thesis
    */
   async deactivateThesis(thesisId: string, userId: string): Promise<IInvestorThesis | null> {
-    return await InvestorThesis.findOneAndUpdate(
+    const thesis = await InvestorThesis.findOneAndUpdate(
       { _id: thesisId, investor_id: userId },
       { is_active: false },
       { new: true }
     );
+
+    // Inactive theses are no longer matched; drop the ML service's copy
+    if (thesis) {
+      try {
+        await mlClientService.unregisterThesis(String(thesis._id));
+      } catch (error: any) {
+        console.error(`Thesis ${thesis._id} not unregistered:`, error.message);
+      }
+    }
+
+    return thesis;
   }
 
   private generateRecommendations(criteriaMatch: boolean, score: number): string[] {
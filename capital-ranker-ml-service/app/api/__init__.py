@@ -1,4 +1,4 @@
 
-from . import scoring, thesis, founder
+from . import scoring, thesis, founder, portfolio, deals, drift, shadow
 
-__all__ = ["scoring", "thesis", "founder"]
\ No newline at end of file
+__all__ = ["scoring", "thesis", "founder", "portfolio", "deals", "drift", "shadow"]
\ No newline at end of file
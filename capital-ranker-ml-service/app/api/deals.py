@@ -0,0 +1,46 @@
+# ============================================
+# app/api/deals.py
+# Deal Deduplication API Endpoint
+# ============================================
+
+from fastapi import APIRouter, HTTPException
+from app.schemas.scoring_schema import DealDedupRequest, DealDedupResponse
+from app.services.container import services
+from app.services.dedup_service import deal_texts
+from app.utils.logger import setup_logger
+
+router = APIRouter()
+logger = setup_logger()
+
+@router.post("/deals/dedup", response_model=DealDedupResponse)
+async def dedup_deals(request: DealDedupRequest):
+    """
+    Find near-duplicate deals in a batch
+
+    Args:
+        request: Raw deal records (name and description are used) and
+            an optional similarity threshold
+
+    Returns:
+        Duplicate rows with their canonical row and clusters of
+        near-duplicates
+    """
+    try:
+        logger.info(f"Deduplicating {len(request.deals)} deals")
+
+        names, descriptions = deal_texts(request.deals)
+        groups = services.get("dedup").find_duplicates(
+            names, descriptions, threshold=request.threshold
+        )
+        duplicates = groups.duplicates()
+
+        return {
+            "count": len(request.deals),
+            "unique": len(request.deals) - len(duplicates),
+            "duplicates": duplicates,
+            "clusters": groups.clusters
+        }
+
+    except Exception as e:
+        logger.error(f"Error deduplicating deals: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,112 @@
+# ============================================
+# app/api/drift.py
+# Feature and Score Drift API Endpoints
+# ============================================
+
+from fastapi import APIRouter, HTTPException
+from app.schemas.drift_schema import (
+    DriftReportResponse,
+    DriftSketchResponse,
+    DriftReferenceRequest,
+    DriftMergeRequest
+)
+from app.services.container import services
+from app.utils.logger import setup_logger
+
+router = APIRouter()
+logger = setup_logger()
+
+@router.get("/drift", response_model=DriftReportResponse)
+async def drift_report():
+    """
+    Compare the distributions of recently scored deals with the
+    reference snapshot
+
+    Returns:
+        Per feature and sub-score: counts, missing rates, PSI,
+        Jensen-Shannon divergence, KS distance and a drift status
+    """
+    monitor = services.get("drift")
+    histograms = monitor.report()
+
+    return {
+        "observations": monitor.observations,
+        "reference_observations": (
+            monitor.reference_observations if monitor.reference is not None else None
+        ),
+        "drifted": [h["name"] for h in histograms if h["status"] == "significant"],
+        "histograms": histograms
+    }
+
+@router.get("/drift/sketch", response_model=DriftSketchResponse)
+async def drift_sketch():
+    """
+    Raw histogram counts of this worker
+
+    Counts from several workers add up element-wise; the sum can be
+    installed as the reference with PUT /drift/reference, or the
+    others' sketches added to one worker with POST /drift/merge.
+    """
+    monitor = services.get("drift")
+    counts, observations = monitor.snapshot()
+    reference = monitor.reference
+
+    return {
+        "layout": monitor.layout(),
+        "current": {"observations": observations, "counts": counts.tolist()},
+        "reference": None if reference is None else {
+            "observations": monitor.reference_observations,
+            "counts": reference.tolist()
+        }
+    }
+
+@router.put("/drift/reference", response_model=DriftReportResponse)
+async def set_drift_reference(request: DriftReferenceRequest, reset: bool = True):
+    """
+    Set the reference distribution
+
+    Args:
+        request: Sketch to use, e.g. merged from all workers; without
+            one, the current counts of this worker become the reference
+        reset: Start a new current window
+
+    Returns:
+        Drift report against the new reference
+    """
+    monitor = services.get("drift")
+    try:
+        if request.sketch is None:
+            monitor.set_reference(reset=reset)
+        else:
+            monitor.set_reference(
+                request.sketch.counts, request.sketch.observations, reset=reset
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    logger.info(
+        f"Drift reference set from {monitor.reference_observations} observations"
+    )
+    return await drift_report()
+
+@router.post("/drift/merge", response_model=DriftReportResponse)
+async def merge_drift_sketch(request: DriftMergeRequest):
+    """
+    Add another worker's current sketch to this worker's counts
+
+    Args:
+        request: Sketch from GET /drift/sketch of another worker, with
+            the same layout. Each sketch should be merged once per
+            window; the counts aren't deduplicated.
+
+    Returns:
+        Drift report over the combined counts
+    """
+    monitor = services.get("drift")
+    try:
+        monitor.merge(request.sketch.counts, request.sketch.observations)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    logger.info(f"Merged drift sketch of {request.sketch.observations} observations")
+    return await drift_report()
@@ -1,18 +1,25 @@
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from app.schemas.founder_schema import (
     FounderEvaluationRequest, 
     FounderEvaluationResponse
 )
-from app.models.founder_evaluator import FounderEvaluator
+from app.config.settings import settings
+from app.services.container import services
+from app.utils.http_cache import format_etag, if_none_match, not_modified, request_etag
 from app.utils.logger import setup_logger
+from app.utils.single_flight import SingleFlight, canonical_key
 
 router = APIRouter()
 logger = setup_logger()
-founder_evaluator = FounderEvaluator()
+evaluate_flight = SingleFlight()
 
 @router.post("/evaluate_founder", response_model=FounderEvaluationResponse)
-async def evaluate_founder(request: FounderEvaluationRequest):
+async def evaluate_founder(
+    request: FounderEvaluationRequest,
+    http_request: Request,
+    response: Response
+):
     """
     Evaluate founder profile
     
@@ -20,15 +27,27 @@ async def evaluate_founder(request: FounderEvaluationRequest):
         request: Founder profile data
         
     Returns:
-        Founder score with breakdown and red flags
+        Founder score with breakdown and red flags. The ETag is the
+        request hash under the model version; a matching If-None-Match
+        gets a 304 without evaluating.
     """
+    etag = request_etag(request, settings.ML_MODEL_VERSION)
+    tag = if_none_match(http_request, etag)
+    if tag is not None:
+        return not_modified(tag)
+    
     try:
         logger.info("Evaluating founder")
         
-        # Evaluate founder
-        result = founder_evaluator.evaluate(request.founder_data)
+        # Evaluate founder, sharing the result with identical concurrent requests
+        result = await evaluate_flight.run(
+            canonical_key(request),
+            services.get("founder_scores").evaluate,
+            request.founder_data
+        )
         
         logger.info(f"Founder evaluated: {result.founder_score.overall_score}")
+        response.headers["ETag"] = format_etag(etag)
         return result
         
     except Exception as e:
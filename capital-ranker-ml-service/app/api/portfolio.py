@@ -0,0 +1,67 @@
+# ============================================
+# app/api/portfolio.py
+# Portfolio Analytics API Endpoint
+# ============================================
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+from app.schemas.portfolio_schema import PortfolioAnalyticsResponse
+from app.api.scoring import LABEL_TABLES, batch_etag, read_deal_batch
+from app.services.container import services
+from app.services.portfolio_analytics import portfolio_analytics
+from app.utils.deadline import DeadlineExceeded
+from app.utils.http_cache import conditional_response
+from app.utils.logger import setup_logger
+
+router = APIRouter()
+logger = setup_logger()
+
+@router.post("/portfolio/analytics", response_model=PortfolioAnalyticsResponse)
+async def analyze_portfolio(
+    request: Request,
+    bins: int = Query(default=10, ge=1, le=100),
+    strict: bool = False
+):
+    """
+    Score a set of deals and aggregate the results
+
+    Args:
+        request: Deals in any format accepted by /score_deals/batch
+        bins: Histogram bins over the 0-100 score range
+        strict: Reject the whole set if any deal is invalid
+
+    Returns:
+        Per-score histograms and quantiles, stage and sector
+        breakdowns, and growth/risk/recommendation counts; conditional
+        and compressed like /score_deals/batch
+    """
+    etag = await batch_etag(request, bins, strict, services.get("scoring").model_version)
+    return await conditional_response(
+        request,
+        etag,
+        lambda: _analyze_portfolio(request, bins, strict),
+        services.get("response_cache")
+    )
+
+async def _analyze_portfolio(request: Request, bins: int, strict: bool) -> Response:
+    batch = await read_deal_batch(request, strict=strict)
+    scoring_service = services.get("scoring")
+
+    try:
+        logger.info(f"Analyzing portfolio of {len(batch.columns)} deals")
+        results = scoring_service.score_batch(batch.columns, batch.weights)
+        analytics = portfolio_analytics(batch.columns, results, LABEL_TABLES, bins)
+
+        return JSONResponse(content={
+            "count": len(batch.rows),
+            "total": batch.total,
+            "errors": batch.errors,
+            **analytics,
+            "ml_model_version": scoring_service.model_version
+        })
+
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.error(f"Error analyzing portfolio: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
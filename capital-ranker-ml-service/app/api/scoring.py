@@ -3,17 +3,65 @@
 # Deal Scoring API Endpoint
 # ============================================
 
-from fastapi import APIRouter, HTTPException
-from app.schemas.scoring_schema import ScoreRequest, ScoreResponse
-from app.services.scoring_service import ScoringService
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional, Tuple
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import ValidationError
+from app.schemas.scoring_schema import (
+    ScoreRequest,
+    ScoreResponse,
+    ScoringWeights,
+    BatchScoreRequest,
+    BatchScoreResponse,
+    ScoreExplanationResponse
+)
+from app.services.attribution import FEATURES, perturbation_attribution
+from app.services.analysis_templates import ANALYSIS_TEMPLATES, CATEGORIES
+from app.services.deal_columns import (
+    DealColumns,
+    NPZ_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE,
+    arrays_to_npz,
+    read_arrow,
+    read_npz
+)
+from app.services.container import services
+from app.services.dedup_service import deal_texts
+from app.services.scoring_service import (
+    SCORE_COLUMNS,
+    GROWTH_LABELS,
+    RISK_LABELS,
+    RECOMMENDATIONS
+)
+from app.config.settings import settings
+from app.utils.deadline import DeadlineExceeded
+from app.utils.http_cache import (
+    body_hash,
+    conditional_response,
+    format_etag,
+    if_none_match,
+    not_modified,
+    request_etag
+)
 from app.utils.logger import setup_logger
+from app.utils.micro_batcher import MicroBatcher
+from app.utils.single_flight import SingleFlight, canonical_key
 
 router = APIRouter()
 logger = setup_logger()
-scoring_service = ScoringService()
+score_flight = SingleFlight()
+score_batcher = MicroBatcher(
+    lambda requests: services.get("scoring").score_deals(
+        [r.deal_data for r in requests], [r.custom_weights for r in requests]
+    ),
+    max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=settings.MICRO_BATCH_WINDOW_MS
+)
 
 @router.post("/score_deal", response_model=ScoreResponse)
-async def score_deal(request: ScoreRequest):
+async def score_deal(request: ScoreRequest, http_request: Request, response: Response):
     """
     Score a deal using ML model
     
@@ -21,24 +69,357 @@ async def score_deal(request: ScoreRequest):
         request: Deal data and optional custom weights
         
     Returns:
-        Investment fit score with detailed breakdown
+        Investment fit score with detailed breakdown. The ETag is the
+        request hash under the model version; a matching If-None-Match
+        gets a 304 without scoring.
     """
+    etag = request_etag(request, services.get("scoring").model_version)
+    tag = if_none_match(http_request, etag)
+    if tag is not None:
+        return not_modified(tag)
+    
     try:
         logger.info(f"Scoring deal: {request.deal_data.name}")
         
-        # Score the deal
-        result = scoring_service.score_deal(
-            deal_data=request.deal_data,
-            custom_weights=request.custom_weights
+        # Score the deal in a micro-batch with other concurrent requests,
+        # sharing the result with identical ones
+        result = await score_flight.run(
+            canonical_key(request), score_batcher.submit, request
         )
         
         logger.info(f"Deal scored successfully: {result.investment_fit_score}")
+        response.headers["ETag"] = format_etag(etag)
         return result
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         logger.error(f"Error scoring deal: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+LABEL_TABLES = {
+    "growth_potential": GROWTH_LABELS,
+    "risk_level": RISK_LABELS,
+    "recommendation": RECOMMENDATIONS
+}
+
+@dataclass
+class DealBatch:
+    """Valid deals of a batch request plus the rows that were rejected"""
+    columns: DealColumns
+    weights: Optional[ScoringWeights]
+    rows: np.ndarray
+    errors: List[Dict[str, Any]]
+    total: int
+    duplicates: List[Dict[str, Any]] = field(default_factory=list)
+
+async def read_deal_batch(
+    request: Request,
+    strict: bool = False,
+    skip_duplicates: bool = False
+) -> DealBatch:
+    """
+    Parse and validate a batch of deals from JSON, an .npz bundle or
+    an Arrow stream
+    
+    Constraints are checked column-wise. Invalid rows are dropped and
+    reported, unless `strict` is set, in which case any invalid row
+    rejects the batch with a 422. Columnar payloads may carry a
+    4-element `weights` array (market, traction, team, financial).
+    With `skip_duplicates`, near-duplicates of an earlier valid deal
+    are dropped too and listed in `duplicates`; columnar payloads then
+    need `name` and `description` columns.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    body = await request.body()
+    
+    try:
+        if content_type == NPZ_MEDIA_TYPE:
+            arrays = read_npz(body)
+            columns = DealColumns.from_arrays(arrays)
+            weights = _columnar_weights(arrays)
+            errors = []
+        elif content_type == ARROW_MEDIA_TYPE:
+            arrays = read_arrow(body)
+            columns = DealColumns.from_arrays(arrays)
+            weights = None
+            errors = []
+        else:
+            payload = BatchScoreRequest.model_validate_json(body)
+            columns, errors = DealColumns.from_records(
+                payload.deals, services.get("scoring").team_scores
+            )
+            weights = payload.custom_weights
+            arrays = None
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    invalid, errors = columns.check(errors)
+    
+    if strict and errors:
+        raise HTTPException(status_code=422, detail={
+            "message": "Deals failed validation",
+            "errors": errors
+        })
+    
+    if errors:
+        logger.warning(
+            f"Dropping {int(invalid.sum())} of {len(columns)} deals that failed validation"
+        )
+    
+    rows = np.flatnonzero(~invalid)
+    duplicates = []
+    if skip_duplicates and len(rows):
+        names, descriptions = (
+            deal_texts(payload.deals) if arrays is None else _columnar_texts(arrays)
+        )
+        groups = services.get("dedup").find_duplicates(
+            [names[row] for row in rows], [descriptions[row] for row in rows]
+        )
+        duplicates = [
+            {**d, "row": int(rows[d["row"]]), "duplicate_of": int(rows[d["duplicate_of"]])}
+            for d in groups.duplicates()
+        ]
+        rows = rows[groups.duplicate_of < 0]
+    
+    return DealBatch(
+        columns=columns.take(rows) if len(rows) < len(columns) else columns,
+        weights=weights,
+        rows=rows,
+        errors=errors,
+        total=len(columns),
+        duplicates=duplicates
+    )
+
+async def batch_etag(request: Request, *parts: Any) -> str:
+    """
+    ETag of a batch request: the route, a hash of the raw body (so the
+    check needs no parsing), its content type, the Accept header that
+    picks the response format, and `parts` such as query parameters
+    and the model version
+    """
+    body = await request.body()
+    return request_etag(
+        request.url.path,
+        body_hash(body),
+        request.headers.get("content-type", "").split(";")[0].strip(),
+        request.headers.get("accept", ""),
+        *parts
+    )
+
+def _columnar_texts(arrays: Dict[str, np.ndarray]) -> Tuple[List[str], List[str]]:
+    """Names and descriptions of a columnar payload"""
+    if "name" not in arrays or "description" not in arrays:
+        raise HTTPException(
+            status_code=400,
+            detail="skip_duplicates requires name and description columns"
+        )
+    return (
+        [str(name) for name in arrays["name"]],
+        [str(description) for description in arrays["description"]]
+    )
+
+def _columnar_weights(arrays: Dict[str, np.ndarray]) -> Optional[ScoringWeights]:
+    """Scoring weights from the `weights` array of a columnar payload"""
+    if "weights" not in arrays:
+        return None
+    market, traction, team, financial = arrays["weights"].tolist()
+    return ScoringWeights(
+        market_weight=market,
+        traction_weight=traction,
+        team_weight=team,
+        financial_weight=financial
+    )
+
+def batch_response(
+    results: Dict[str, np.ndarray],
+    batch: DealBatch,
+    request: Request
+) -> Response:
+    """
+    Serialize batch score columns as JSON or, when the client accepts
+    it, as an .npz bundle with label tables for the coded columns
+    """
+    if NPZ_MEDIA_TYPE in request.headers.get("accept", ""):
+        arrays = dict(results)
+        arrays["rows"] = batch.rows
+        for name, labels in LABEL_TABLES.items():
+            arrays[f"{name}_labels"] = np.array(labels)
+        arrays["error_rows"] = np.array([e["row"] for e in batch.errors], dtype=np.int64)
+        arrays["error_fields"] = np.array([e["field"] for e in batch.errors], dtype=str)
+        arrays["error_messages"] = np.array([e["message"] for e in batch.errors], dtype=str)
+        arrays["duplicate_rows"] = np.array(
+            [d["row"] for d in batch.duplicates], dtype=np.int64
+        )
+        arrays["duplicate_of"] = np.array(
+            [d["duplicate_of"] for d in batch.duplicates], dtype=np.int64
+        )
+        
+        # Analysis as per-deal pattern codes into pattern -> message id tables
+        masks = arrays.pop("analysis_mask")
+        arrays["analysis_messages"] = np.array(ANALYSIS_TEMPLATES.messages)
+        for category in CATEGORIES:
+            arrays[category] = ANALYSIS_TEMPLATES.patterns(masks, category).astype(np.uint8)
+            arrays[f"{category}_patterns"] = ANALYSIS_TEMPLATES.pattern_table(category)
+        return Response(content=arrays_to_npz(arrays), media_type=NPZ_MEDIA_TYPE)
+    
+    content = {
+        "count": len(batch.rows),
+        "total": batch.total,
+        "rows": batch.rows.tolist(),
+        "errors": batch.errors,
+        "duplicates": batch.duplicates
+    }
+    for name in SCORE_COLUMNS:
+        content[name] = results[name].tolist()
+    for name, labels in LABEL_TABLES.items():
+        content[name] = [labels[code] for code in results[name].tolist()]
+    
+    # Analysis as message ids into one shared message table
+    content["analysis_messages"] = ANALYSIS_TEMPLATES.messages
+    masks = results["analysis_mask"]
+    for category in CATEGORIES:
+        pattern_ids = ANALYSIS_TEMPLATES.pattern_ids[category]
+        content[category] = [
+            pattern_ids[code]
+            for code in ANALYSIS_TEMPLATES.patterns(masks, category).tolist()
+        ]
+    content["ml_model_version"] = services.get("scoring").model_version
+    
+    return JSONResponse(content=content)
+
+@router.post("/score_deals/batch", response_model=BatchScoreResponse)
+async def score_deals_batch(
+    request: Request,
+    strict: bool = False,
+    skip_duplicates: bool = False
+):
+    """
+    Score many deals in one vectorized pass
+    
+    Args:
+        request: BatchScoreRequest JSON, or column arrays as an .npz
+            bundle (application/x-npz) or Arrow IPC stream
+            (application/vnd.apache.arrow.stream)
+        strict: Reject the whole batch if any deal is invalid
+        skip_duplicates: Score only the first of each group of
+            near-duplicate deals
+        
+    Returns:
+        Score columns for the valid deals, their original row numbers,
+        per-row validation errors and skipped duplicates; .npz when
+        Accept is application/x-npz. Responses carry an ETag (304 on a
+        matching If-None-Match), are gzip/zstd compressed per
+        Accept-Encoding and are cached compressed.
+    """
+    etag = await batch_etag(
+        request, strict, skip_duplicates, services.get("scoring").model_version
+    )
+    return await conditional_response(
+        request,
+        etag,
+        lambda: _score_deals_batch(request, strict, skip_duplicates),
+        services.get("response_cache")
+    )
+
+async def _score_deals_batch(
+    request: Request,
+    strict: bool,
+    skip_duplicates: bool
+) -> Response:
+    batch = await read_deal_batch(
+        request, strict=strict, skip_duplicates=skip_duplicates
+    )
+    
+    try:
+        logger.info(f"Scoring batch of {len(batch.columns)} deals")
+        results = services.get("scoring").score_batch(batch.columns, batch.weights)
+        return batch_response(results, batch, request)
+        
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.error(f"Error scoring batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/score_deals/explain", response_model=ScoreExplanationResponse)
+async def explain_scores(
+    request: Request,
+    method: Literal["exact", "perturbation"] = "exact",
+    strict: bool = False
+):
+    """
+    Attribute investment_fit_score to the input fields of each deal
+    
+    Args:
+        request: Deals in any format accepted by /score_deals/batch
+        method: `exact` per-rule contributions of the heuristic scorer,
+            or `perturbation`, scoring every deal with each feature
+            replaced by its baseline in one vectorized pass
+        strict: Reject the whole batch if any deal is invalid
+        
+    Returns:
+        Base value and an N x F contribution matrix over `features`,
+        conditional and compressed like /score_deals/batch
+    """
+    etag = await batch_etag(request, method, strict, services.get("scoring").model_version)
+    return await conditional_response(
+        request,
+        etag,
+        lambda: _explain_scores(request, method, strict),
+        services.get("response_cache")
+    )
+
+async def _explain_scores(
+    request: Request,
+    method: Literal["exact", "perturbation"],
+    strict: bool
+) -> Response:
+    batch = await read_deal_batch(request, strict=strict)
+    columns = batch.columns
+    scoring_service = services.get("scoring")
+    
+    try:
+        logger.info(f"Explaining scores of {len(columns)} deals ({method})")
+        overall = scoring_service.score_columns(columns, batch.weights)['investment_fit_score']
+        
+        if method == "exact":
+            base, by_feature = scoring_service.attribute(columns, batch.weights)
+            residual = np.zeros(len(columns))
+        else:
+            base, by_feature, residual = perturbation_attribution(
+                lambda deals: scoring_service.score_columns(
+                    deals, batch.weights
+                )['investment_fit_score'],
+                columns
+            )
+        
+        contributions = np.column_stack(
+            [by_feature.get(feature, np.zeros(len(columns))) for feature in FEATURES]
+        ) if len(columns) else np.zeros((0, len(FEATURES)))
+        
+        return JSONResponse(content={
+            "count": len(batch.rows),
+            "total": batch.total,
+            "rows": batch.rows.tolist(),
+            "errors": batch.errors,
+            "method": method,
+            "features": list(FEATURES),
+            "base_value": np.round(base, 4).tolist(),
+            "contributions": np.round(contributions, 4).tolist(),
+            "residual": np.round(residual, 4).tolist(),
+            "investment_fit_score": np.round(overall, 2).tolist(),
+            "ml_model_version": scoring_service.model_version
+        })
+        
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.error(f"Error explaining scores: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ============================================
 # app/api/thesis.py
 # Thesis Matching API Endpoint
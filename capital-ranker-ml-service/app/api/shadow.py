@@ -0,0 +1,32 @@
+# ============================================
+# app/api/shadow.py
+# Shadow Scoring Comparison API Endpoint
+# ============================================
+
+from fastapi import APIRouter
+from app.schemas.shadow_schema import ShadowStatsResponse
+from app.services.container import services
+from app.services.scoring_service import RECOMMENDATIONS
+
+router = APIRouter()
+
+@router.get("/shadow", response_model=ShadowStatsResponse)
+async def shadow_stats():
+    """
+    Compare the shadow candidate model with the primary one on the
+    sampled live traffic scored so far
+
+    Returns:
+        Score delta statistics per score, a histogram of overall score
+        deltas and recommendation changes (primary -> candidate)
+    """
+    primary_version = services.get("scoring").model_version
+    shadow = services.get("shadow")
+    if shadow is None:
+        return {"enabled": False, "primary_version": primary_version}
+
+    return {
+        "enabled": True,
+        "primary_version": primary_version,
+        **shadow.stats(list(RECOMMENDATIONS))
+    }
@@ -1,42 +1,345 @@
 
-from fastapi import APIRouter, HTTPException
-from app.schemas.thesis_schema import ThesisMatchRequest, ThesisMatchResponse
-from app.services.nlp_service import NLPService
+import base64
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from app.schemas.thesis_schema import (
+    ThesisMatchRequest,
+    ThesisMatchResponse,
+    ThesisRegistrationRequest,
+    ThesisRegistrationResponse,
+    ThesisRankRequest,
+    ThesisRankResponse,
+    SubscriptionRequest,
+    SubscriptionResponse,
+    PercolateRequest,
+    PercolateResponse
+)
+from app.schemas.embedding_schema import (
+    EmbeddingRequest,
+    EmbeddingResponse,
+    EmbeddingBatchRequest
+)
+from app.services.container import services
+from app.services.deal_columns import DealColumns
+from app.services.thesis_cache import ThesisChanged
+from app.utils.deadline import DeadlineExceeded
+from app.utils.http_cache import (
+    conditional_response,
+    format_etag,
+    if_none_match,
+    not_modified,
+    request_etag
+)
 from app.utils.logger import setup_logger
+from app.config.settings import settings
+from app.utils.micro_batcher import MicroBatcher
+from app.utils.single_flight import SingleFlight, canonical_key
 
 router = APIRouter()
 logger = setup_logger()
-nlp_service = NLPService()
+match_flight = SingleFlight()
+embedding_batcher = MicroBatcher(
+    lambda texts: services.get("nlp").generate_embeddings(texts).tolist(),
+    max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=settings.MICRO_BATCH_WINDOW_MS
+)
 
 @router.post("/match_thesis", response_model=ThesisMatchResponse)
-async def match_thesis(request: ThesisMatchRequest):
+async def match_thesis(request: ThesisMatchRequest, http_request: Request, response: Response):
     """
     Match investor thesis with pitch deck
     
     Args:
-        request: Pitch text and thesis text
+        request: Pitch text and thesis text or registered thesis ID
         
     Returns:
-        Relevancy score with matched keywords and sections
+        Relevancy score with matched keywords and sections. The ETag
+        covers the route, the request, the registered theses (BM25
+        scores depend on the whole corpus), the model version and the
+        tokenizer mode; a matching If-None-Match gets a 304 without
+        matching.
     """
+    nlp_service = services.get("nlp")
+    etag = request_etag(
+        http_request.url.path,
+        request,
+        nlp_service.theses.fingerprint(),
+        services.get("scoring").model_version,
+        settings.TOKENIZER_MODE
+    )
+    tag = if_none_match(http_request, etag)
+    if tag is not None:
+        return not_modified(tag)
+    
     try:
         logger.info("Matching thesis with pitch")
         
-        # Perform matching
-        result = nlp_service.match_thesis(
+        # Perform matching, sharing the result with identical concurrent requests
+        result = await match_flight.run(
+            canonical_key(request),
+            nlp_service.match_thesis,
             pitch_text=request.pitch_text,
-            thesis_text=request.thesis_text
+            thesis_text=request.thesis_text,
+            thesis_id=request.thesis_id,
+            pitch_sectors=request.pitch_sectors,
+            pitch_stage=request.pitch_stage,
+            thesis_sectors=request.thesis_sectors,
+            thesis_stages=request.thesis_stages,
+            thesis_content_hash=request.thesis_content_hash
         )
         
         logger.info(f"Thesis matched: {result.relevancy_score}%")
+        response.headers["ETag"] = format_etag(etag)
         return result
         
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ThesisChanged as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         logger.error(f"Error matching thesis: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/generate_embedding")
-async def generate_embedding(request: dict):
+@router.put("/theses/{thesis_id}", response_model=ThesisRegistrationResponse)
+async def register_thesis(thesis_id: str, request: ThesisRegistrationRequest):
+    """
+    Register an investor thesis for matching by ID
+    
+    Args:
+        thesis_id: Thesis identifier used by the backend
+        request: Thesis text
+        
+    Returns:
+        Content hash and extracted keywords of the stored thesis
+    """
+    try:
+        thesis, updated = services.get("nlp").register_thesis(
+            thesis_id,
+            request.thesis_text,
+            sectors=request.sectors,
+            stages=request.stages
+        )
+        
+        logger.info(f"Thesis registered: {thesis_id} (updated={updated})")
+        return ThesisRegistrationResponse(
+            thesis_id=thesis.thesis_id,
+            content_hash=thesis.content_hash,
+            keywords=thesis.keywords,
+            updated=updated
+        )
+        
+    except Exception as e:
+        logger.error(f"Error registering thesis: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/theses/{thesis_id}")
+async def unregister_thesis(thesis_id: str):
+    """
+    Remove a registered thesis
+    """
+    if not services.get("nlp").theses.remove(thesis_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Thesis '{thesis_id}' is not registered"
+        )
+    return {"thesis_id": thesis_id, "deleted": True}
+
+@router.post("/theses/rank", response_model=ThesisRankResponse)
+async def rank_theses(request: ThesisRankRequest, http_request: Request, response: Response):
+    """
+    Rank all registered theses against a pitch with BM25
+    
+    Args:
+        request: Pitch text, optional structured fields and result count
+        
+    Returns:
+        Top matching theses by relevancy, with an ETag like /match_thesis
+    """
+    nlp_service = services.get("nlp")
+    etag = request_etag(
+        http_request.url.path,
+        request,
+        nlp_service.theses.fingerprint(),
+        services.get("scoring").model_version,
+        settings.TOKENIZER_MODE
+    )
+    tag = if_none_match(http_request, etag)
+    if tag is not None:
+        return not_modified(tag)
+    
+    try:
+        results = nlp_service.rank_theses(
+            pitch_text=request.pitch_text,
+            top_k=request.top_k,
+            pitch_sectors=request.pitch_sectors,
+            pitch_stage=request.pitch_stage
+        )
+        
+        response.headers["ETag"] = format_etag(etag)
+        return ThesisRankResponse(
+            results=results,
+            total_theses=len(nlp_service.theses)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error ranking theses: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/subscriptions/{subscription_id}", response_model=SubscriptionResponse)
+async def subscribe(subscription_id: str, request: SubscriptionRequest):
+    """
+    Save a thesis subscription for deal alerts
+    
+    Args:
+        subscription_id: Subscription identifier used by the backend
+        request: Required/optional terms, sector and stage constraints
+            and thresholds, defaulting to those of a registered thesis
+        
+    Returns:
+        The subscription as compiled (index terms after tokenization)
+    """
+    optional_terms = request.optional_terms
+    sectors, stages = request.sectors, request.stages
+    if request.thesis_id is not None:
+        thesis = services.get("nlp").theses.get(request.thesis_id)
+        if thesis is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Thesis '{request.thesis_id}' is not registered"
+            )
+        optional_terms = optional_terms or thesis.keywords
+        sectors = sectors or list(thesis.sectors)
+        stages = stages or list(thesis.stages)
+    
+    try:
+        subscription = services.get("percolator").subscribe(
+            subscription_id,
+            required_terms=request.required_terms,
+            optional_terms=optional_terms,
+            sectors=sectors,
+            stages=stages,
+            min_relevancy=request.min_relevancy,
+            min_score=request.min_score
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    logger.info(f"Subscription saved: {subscription_id}")
+    return SubscriptionResponse(
+        subscription_id=subscription.subscription_id,
+        required_terms=list(subscription.required_terms),
+        optional_terms=list(subscription.optional_terms),
+        sectors=list(subscription.sectors),
+        stages=list(subscription.stages),
+        min_relevancy=subscription.min_relevancy,
+        min_score=subscription.min_score
+    )
+
+@router.delete("/subscriptions/{subscription_id}")
+async def unsubscribe(subscription_id: str):
+    """
+    Remove a thesis subscription
+    """
+    if not services.get("percolator").unsubscribe(subscription_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Subscription '{subscription_id}' does not exist"
+        )
+    return {"subscription_id": subscription_id, "deleted": True}
+
+@router.post("/subscriptions/percolate", response_model=PercolateResponse)
+async def percolate(request: PercolateRequest, http_request: Request):
+    """
+    Find the subscriptions each incoming deal triggers
+    
+    Args:
+        request: Deals with text (or deal_data), sectors, stage and
+            optionally an investment fit score
+        
+    Returns:
+        Triggered subscriptions per deal, most relevant first. The ETag
+        covers the deals, the saved subscriptions and the model
+        version; responses are compressed and cached like
+        /score_deals/batch.
+    """
+    etag = request_etag(
+        http_request.url.path,
+        request,
+        services.get("percolator").fingerprint(),
+        services.get("scoring").model_version
+    )
+    return await conditional_response(
+        http_request,
+        etag,
+        lambda: _percolate(request),
+        services.get("response_cache")
+    )
+
+async def _percolate(request: PercolateRequest) -> Response:
+    try:
+        percolator = services.get("percolator")
+        index = percolator.index()
+        deals = request.deals
+        
+        scores = np.array([
+            np.nan if d.investment_fit_score is None else d.investment_fit_score
+            for d in deals
+        ])
+        # Deals without a score are scored only if a threshold needs it
+        unscored = [
+            i for i, d in enumerate(deals)
+            if d.investment_fit_score is None and d.deal_data is not None
+        ]
+        if unscored and index.needs_score:
+            scoring = services.get("scoring")
+            deal_data = [deals[i].deal_data for i in unscored]
+            columns = DealColumns.from_deals(
+                deal_data, scoring.team_scores([d.founders for d in deal_data])
+            )
+            scored = scoring.score_columns(columns)
+            scores[unscored] = scored["investment_fit_score"]
+        
+        matches = percolator.percolate(
+            texts=[
+                d.text if d.text is not None
+                else f"{d.deal_data.name} {d.deal_data.description}"
+                for d in deals
+            ],
+            sectors=[
+                d.sectors or (d.deal_data.sector if d.deal_data else [])
+                for d in deals
+            ],
+            stages=[
+                d.stage or (d.deal_data.stage if d.deal_data else None)
+                for d in deals
+            ],
+            scores=scores,
+            index=index
+        )
+        
+        return JSONResponse(content=PercolateResponse(
+            results=[
+                {
+                    "deal_id": deal.deal_id,
+                    "matches": [
+                        {"subscription_id": s, "relevancy_score": r}
+                        for s, r in deal_matches
+                    ]
+                }
+                for deal, deal_matches in zip(deals, matches)
+            ],
+            total_subscriptions=len(index.subscriptions)
+        ).model_dump(mode="json"))
+        
+    except Exception as e:
+        logger.error(f"Error percolating deals: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/generate_embedding", response_model=EmbeddingResponse)
+async def generate_embedding(request: EmbeddingRequest):
     """
     Generate text embedding for similarity search
     
@@ -47,17 +350,84 @@ async def generate_embedding(request: dict):
         Embedding vector
     """
     try:
-        text = request.get("text", "")
-        if not text:
-            raise ValueError("Text is required")
-            
-        embedding = nlp_service.generate_embedding(text)
+        # Embedded in a micro-batch with other concurrent requests
+        embedding = await embedding_batcher.submit(request.text)
         
-        return {
-            "embedding": embedding,
-            "dimension": len(embedding)
-        }
+        return EmbeddingResponse(
+            embedding=embedding,
+            dimension=len(embedding)
+        )
         
     except Exception as e:
         logger.error(f"Error generating embedding: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/embeddings/batch")
+async def generate_embeddings_batch(request: EmbeddingBatchRequest, http_request: Request):
+    """
+    Generate embeddings for many texts in one pass
+    
+    Args:
+        request: Texts and response format. "binary" (or an
+            application/octet-stream Accept header) returns raw
+            little-endian float32 rows with the shape in headers.
+        
+    Returns:
+        Embedding matrix as JSON lists, base64 or binary, conditional
+        and compressed like /score_deals/batch
+    """
+    etag = request_etag(
+        http_request.url.path,
+        request,
+        http_request.headers.get("accept", ""),
+        settings.ML_MODEL_VERSION
+    )
+    return await conditional_response(
+        http_request,
+        etag,
+        lambda: _generate_embeddings_batch(request, http_request),
+        services.get("response_cache")
+    )
+
+async def _generate_embeddings_batch(
+    request: EmbeddingBatchRequest,
+    http_request: Request
+) -> Response:
+    try:
+        logger.info(f"Generating {len(request.texts)} embeddings")
+        matrix = services.get("nlp").generate_embeddings(request.texts)
+        rows, dimension = matrix.shape
+        
+        wants_binary = (
+            request.format == "binary" or
+            "application/octet-stream" in http_request.headers.get("accept", "")
+        )
+        if wants_binary:
+            return Response(
+                content=matrix.astype("<f4", copy=False).tobytes(),
+                media_type="application/octet-stream",
+                headers={
+                    "X-Embedding-Shape": f"{rows},{dimension}",
+                    "X-Embedding-Dtype": "float32-le"
+                }
+            )
+        
+        if request.format == "base64":
+            return JSONResponse(content={
+                "encoding": "base64",
+                "dtype": "float32-le",
+                "shape": [rows, dimension],
+                "data": base64.b64encode(
+                    matrix.astype("<f4", copy=False).tobytes()
+                ).decode("ascii")
+            })
+        
+        return JSONResponse(content={
+            "embeddings": matrix.tolist(),
+            "dimension": dimension,
+            "count": rows
+        })
+        
+    except Exception as e:
+        logger.error(f"Error generating embeddings: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,4 @@
+# ============================================
+# app/cli/__init__.py
+# Command-Line Tools: python -m app.cli <command>
+# ============================================
@@ -0,0 +1,26 @@
+# ============================================
+# app/cli/__main__.py
+# Command-Line Entry Point
+# ============================================
+
+import argparse
+import sys
+
+from app.cli import score, train
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Capital Ranker ML Service tools"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    score.add_parser(commands)
+    train.add_parser(commands)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# ============================================
+# app/cli/score.py
+# Offline Bulk Scoring of Deal Files
+# ============================================
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config.settings import settings
+from app.services.deal_columns import DealColumns
+from app.services.deal_files import csv_record, file_format, parse_line, read_chunks
+from app.services.scoring_service import (
+    ScoringService,
+    SCORE_COLUMNS,
+    GROWTH_LABELS,
+    RISK_LABELS,
+    RECOMMENDATIONS
+)
+
+LABEL_TABLES = {
+    "growth_potential": GROWTH_LABELS,
+    "risk_level": RISK_LABELS,
+    "recommendation": RECOMMENDATIONS
+}
+OUTPUT_FIELDS = ("row", "id", "name", *SCORE_COLUMNS, *LABEL_TABLES, "errors")
+
+# Scoring service of each worker process
+_service: Optional[ScoringService] = None
+
+
+def add_parser(commands):
+    parser = commands.add_parser(
+        "score",
+        help="Score a CSV/JSONL file of deals across a process pool",
+        description=(
+            "Read deals in chunks, score each chunk in a worker process "
+            "and write results in input order. Progress is checkpointed "
+            "after every chunk; --resume continues an interrupted run."
+        )
+    )
+    parser.add_argument("input", help="CSV or JSONL file of deals")
+    parser.add_argument("output", help="CSV or JSONL results file")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Input format (default: from the extension)")
+    parser.add_argument("--output-format", choices=("csv", "jsonl"), help="Default: from the extension")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint")
+    parser.add_argument(
+        "--model-version", default=settings.ML_MODEL_VERSION,
+        help="Use the weights of MODEL_PATH/<version>.npz if present"
+    )
+    parser.set_defaults(run=run)
+
+
+def _init_worker(model_version: str):
+    global _service
+    from app.services.container import model_weights
+    _service = ScoringService(
+        model_version=model_version, default_weights=model_weights(model_version)
+    )
+
+
+def score_chunk(task: Tuple[int, str, str, List[Any]]) -> Tuple[int, int, bytes]:
+    """
+    Parse, validate and score one chunk in a worker
+
+    Returns the number of rows, the number of invalid rows and the
+    encoded output lines, one per input row in input order.
+    """
+    start, fmt, output_format, raw = task
+    records = [parse_line(r) if fmt == "jsonl" else csv_record(r) for r in raw]
+    columns, errors = DealColumns.from_records(records, _service.team_scores)
+    invalid, errors = columns.check(errors)
+    valid = np.flatnonzero(~invalid)
+    results = _service.score_batch(columns.take(valid))
+
+    values = {name: results[name].tolist() for name in SCORE_COLUMNS}
+    for name, labels in LABEL_TABLES.items():
+        values[name] = [labels[code] for code in results[name].tolist()]
+    position = np.full(len(records), -1)
+    position[valid] = np.arange(len(valid))
+    row_errors: Dict[int, List[str]] = {}
+    for error in errors:
+        row_errors.setdefault(error["row"], []).append(f"{error['field']}: {error['message']}")
+
+    rows = []
+    for i, record in enumerate(records):
+        record = record if isinstance(record, dict) else {}
+        row = {"row": start + i, "id": record.get("id"), "name": record.get("name")}
+        if position[i] >= 0:
+            row.update({name: column[position[i]] for name, column in values.items()})
+        else:
+            row["errors"] = row_errors.get(i, [])
+        rows.append(row)
+
+    return len(records), int(invalid.sum()), _encode(rows, output_format)
+
+
+def _encode(rows: List[Dict[str, Any]], output_format: str) -> bytes:
+    if output_format == "jsonl":
+        return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+    for row in rows:
+        if "errors" in row:
+            row["errors"] = "; ".join(row["errors"])
+        writer.writerow(row)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _save_checkpoint(path: str, state: Dict[str, Any]):
+    # Written atomically so an interruption never leaves half a checkpoint
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(state, f)
+    os.replace(temporary, path)
+
+
+def run(args) -> int:
+    if args.workers < 1 or args.chunk_size < 1:
+        print("--workers and --chunk-size must be at least 1", file=sys.stderr)
+        return 2
+    try:
+        fmt = file_format(args.input, args.format)
+        output_format = file_format(args.output, args.output_format)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    # Before the output is opened, and truncated, for nothing
+    try:
+        with open(args.input, "rb"):
+            pass
+    except OSError as e:
+        print(f"Cannot read {args.input}: {e.strerror}", file=sys.stderr)
+        return 2
+    checkpoint = args.checkpoint or f"{args.output}.checkpoint"
+
+    # Rows already scored and the output size that holds exactly them
+    start, offset, invalid = 0, 0, 0
+    if args.resume and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            state = json.load(f)
+        if state["input"] != os.path.abspath(args.input):
+            print(f"Checkpoint {checkpoint} belongs to {state['input']}", file=sys.stderr)
+            return 2
+        start, offset, invalid = state["rows"], state["output_bytes"], state["invalid"]
+        print(f"Resuming at row {start}", file=sys.stderr)
+
+    try:
+        out = open(args.output, "r+b" if offset else "wb")
+    except OSError as e:
+        print(f"Cannot write {args.output}: {e.strerror}", file=sys.stderr)
+        return 2
+    out.truncate(offset)
+    out.seek(offset)
+    if not offset and output_format == "csv":
+        out.write((",".join(OUTPUT_FIELDS) + "\r\n").encode("utf-8"))
+
+    done = start
+    started = time.perf_counter()
+
+    def commit(future: Future):
+        nonlocal done, invalid
+        rows, bad, data = future.result()
+        out.write(data)
+        out.flush()
+        done += rows
+        invalid += bad
+        _save_checkpoint(checkpoint, {
+            "input": os.path.abspath(args.input),
+            "rows": done,
+            "invalid": invalid,
+            "output_bytes": out.tell()
+        })
+        elapsed = time.perf_counter() - started
+        print(
+            f"\r{done} rows scored, {invalid} invalid, "
+            f"{(done - start) / max(elapsed, 1e-9):,.0f} rows/s",
+            end="", file=sys.stderr, flush=True
+        )
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(args.model_version,)
+        ) as pool:
+            # Bounded number of chunks in flight, committed in input order
+            pending: Deque[Future] = deque()
+            row = start
+            for chunk in read_chunks(args.input, args.chunk_size, fmt, start, parse=False):
+                pending.append(pool.submit(score_chunk, (row, fmt, output_format, chunk)))
+                row += len(chunk)
+                if len(pending) >= 2 * args.workers:
+                    commit(pending.popleft())
+            while pending:
+                commit(pending.popleft())
+    except KeyboardInterrupt:
+        print(f"\nInterrupted at row {done}; rerun with --resume to continue", file=sys.stderr)
+        return 130
+    finally:
+        out.close()
+
+    elapsed = time.perf_counter() - started
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    print(
+        f"\nScored {done - start} rows in {elapsed:.1f}s "
+        f"({(done - start) / max(elapsed, 1e-9):,.0f} rows/s, {args.workers} workers); "
+        f"results in {args.output}",
+        file=sys.stderr
+    )
+    return 0
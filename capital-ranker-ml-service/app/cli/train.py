@@ -0,0 +1,77 @@
+# ============================================
+# app/cli/train.py
+# Train Scoring Models from Historical Outcomes
+# ============================================
+
+import json
+import os
+import sys
+
+from app.config.settings import settings
+from app.services.feature_engineering import FEATURE_SETS
+from app.services.training_service import TrainingConfig, TrainingService
+from app.models.linear_model import TASKS
+
+
+def add_parser(commands):
+    parser = commands.add_parser(
+        "train",
+        help="Fit a linear/logistic model on historical deals and outcomes",
+        description=(
+            "Stream deals with outcomes from CSV/JSONL, cross-validate and "
+            "write an .npz model artifact. A model over the sub-scores "
+            "(the default) gives the service its ScoringWeights."
+        )
+    )
+    parser.add_argument("data", help="CSV or JSONL file of deals with outcomes")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Default: from the extension")
+    parser.add_argument("--outcome", default="outcome", help="Outcome field (default: outcome)")
+    parser.add_argument("--task", choices=TASKS, default="logistic")
+    parser.add_argument(
+        "--features", default="sub-scores",
+        help=f"Feature set ({', '.join(FEATURE_SETS)}) or comma-separated feature names"
+    )
+    parser.add_argument("--version", required=True, help="Model version, e.g. v1.1.0")
+    parser.add_argument("--output", help="Artifact path (default: MODEL_PATH/<version>.npz)")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds (0 = none)")
+    parser.add_argument("--learning-rate", type=float, default=0.01)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.set_defaults(run=run)
+
+
+def run(args) -> int:
+    from app.services.scoring_service import ScoringService
+
+    features = FEATURE_SETS.get(args.features) or tuple(
+        name.strip() for name in args.features.split(",") if name.strip()
+    )
+    config = TrainingConfig(
+        task=args.task,
+        features=features,
+        outcome=args.outcome,
+        fmt=args.format,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        epochs=args.epochs,
+        folds=args.folds,
+        learning_rate=args.learning_rate,
+        l2=args.l2,
+        seed=args.seed
+    )
+    try:
+        model = TrainingService(config, ScoringService()).train(args.data, args.version)
+    except (ValueError, OSError) as e:
+        print(f"Training failed: {e}", file=sys.stderr)
+        return 2
+
+    output = args.output or os.path.join(settings.MODEL_PATH, f"{args.version}.npz")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    model.save(output)
+
+    print(json.dumps(model.metrics, indent=2))
+    print(f"Model written to {output}")
+    return 0
@@ -37,6 +37,66 @@ class Settings(BaseSettings):
     ML_MODEL_VERSION: str = "v1.0.0"
     MODEL_PATH: str = "models_storage/"
     
+    # Service initialization: "parallel" builds all services at startup,
+    # "lazy" builds each on its first request
+    SERVICE_INIT_MODE: str = "parallel"
+    
+    # Thesis Matching
+    THESIS_CACHE_SIZE: int = 1024
+    TOKENIZER_MODE: str = "unicode"  # "unicode" or "ascii"
+    
+    # Registered theses and subscriptions, in files shared by the workers
+    # of a host ("" = held by each worker alone; then run one worker)
+    STATE_PATH: str = "state/"
+    
+    # Founder evaluations cached by profile hash for deal scoring
+    FOUNDER_CACHE_SIZE: int = 10000
+    
+    # Deal features and sub-scores shared by all workers in shared memory.
+    # Entries are keyed by deal and ML_MODEL_VERSION, and the segment
+    # name carries a hash of the scoring code, so changed rules start a
+    # fresh segment; the old one stays in /dev/shm until unlinked
+    SHARED_STORE_ENABLED: bool = False
+    SHARED_STORE_NAME: str = "capital-ranker-scores"
+    SHARED_STORE_CAPACITY: int = 65536  # Slots, a power of two
+    
+    # Batch responses cached by ETag, stored compressed (0 = no cache);
+    # bodies under COMPRESSION_MIN_BYTES are sent uncompressed
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    COMPRESSION_MIN_BYTES: int = 1024
+    
+    # Request deadline when no X-Request-Timeout-Ms header is sent (0 = none)
+    DEFAULT_REQUEST_TIMEOUT_MS: int = 0
+    
+    # Admission Control
+    ADMISSION_MAX_CONCURRENCY: int = 32
+    ADMISSION_CLIENT_CONCURRENCY: int = 64  # in flight, queued included
+    ADMISSION_BATCH_ROUTE_CONCURRENCY: int = 4
+    ADMISSION_INTERACTIVE_WEIGHT: float = 4.0
+    ADMISSION_BATCH_WEIGHT: float = 1.0
+    ADMISSION_QUEUE_SIZE: int = 256
+    ADMISSION_QUEUE_TIMEOUT: float = 10.0  # seconds
+    
+    # Micro-Batching of single-item scoring and embedding requests
+    MICRO_BATCH_MAX_SIZE: int = 64
+    MICRO_BATCH_WINDOW_MS: float = 2.0
+    
+    # Drift monitoring of scored deals' features and sub-scores
+    DRIFT_MONITOR_ENABLED: bool = True
+    
+    # Shadow scoring: a sample of live scoring requests is re-scored by
+    # a candidate model version in the background (empty = off)
+    SHADOW_MODEL_VERSION: str = ""
+    SHADOW_WEIGHTS: str = ""  # market,traction,team,financial; empty = defaults
+    SHADOW_SAMPLE_RATE: float = 0.05
+    SHADOW_QUEUE_SIZE: int = 64
+    SHADOW_WORKERS: int = 1
+    
+    # Deal Deduplication
+    DEDUP_THRESHOLD: float = 0.8
+    MINHASH_PERMUTATIONS: int = 128
+    LSH_BANDS: int = 16
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     
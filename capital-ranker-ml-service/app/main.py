@@ -3,28 +3,87 @@
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 # Import routers
-from app.api import scoring, thesis, founder
+from app.api import scoring, thesis, founder, portfolio, deals, drift, shadow
 from app.config.settings import settings
+from app.middleware import AdmissionControlMiddleware, DeadlineMiddleware
+from app.services.container import services, shared_state_ok
+from app.utils.metrics import metrics
 from app.utils.logger import setup_logger
 
 # Initialize logger
 logger = setup_logger()
 
+# Startup and shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Log startup, warm services in the background and release them on
+    shutdown. The server accepts connections immediately; /ready
+    reports when the services are warm.
+    """
+    logger.info("="*50)
+    logger.info("Capital Ranker ML Service Starting...")
+    logger.info(f"Environment: {settings.ENVIRONMENT}")
+    logger.info(f"Debug Mode: {settings.DEBUG}")
+    logger.info(f"Host: {settings.HOST}:{settings.PORT}")
+    logger.info(f"Service Init: {settings.SERVICE_INIT_MODE}")
+    logger.info("="*50)
+    if not shared_state_ok():
+        logger.error(
+            "Several workers without STATE_PATH: theses and subscriptions "
+            "would differ per worker, so /ready stays 503"
+        )
+    
+    warm_up = None
+    if settings.SERVICE_INIT_MODE != "lazy":
+        warm_up = asyncio.create_task(services.warm_up())
+    services.started = True
+    
+    yield
+    
+    logger.info("Capital Ranker ML Service Shutting Down...")
+    if warm_up is not None and not warm_up.done():
+        warm_up.cancel()
+    services.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title="Capital Ranker ML Service",
     description="AI/ML powered investment scoring and analysis",
     version="1.0.0",
     docs_url="/docs",  # Swagger UI
-    redoc_url="/redoc"  # ReDoc
+    redoc_url="/redoc",  # ReDoc
+    lifespan=lifespan
 )
 
-# CORS middleware
+# Admission control: per-client/per-route limits and fair queueing
+# between interactive and batch requests
+app.add_middleware(
+    AdmissionControlMiddleware,
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    client_concurrency=settings.ADMISSION_CLIENT_CONCURRENCY,
+    batch_route_concurrency=settings.ADMISSION_BATCH_ROUTE_CONCURRENCY,
+    interactive_weight=settings.ADMISSION_INTERACTIVE_WEIGHT,
+    batch_weight=settings.ADMISSION_BATCH_WEIGHT,
+    queue_size=settings.ADMISSION_QUEUE_SIZE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT
+)
+
+# Request deadlines; wrapping admission so time spent queued counts
+app.add_middleware(
+    DeadlineMiddleware,
+    default_timeout_ms=settings.DEFAULT_REQUEST_TIMEOUT_MS
+)
+
+# CORS middleware; added last so it wraps the others and their
+# 429/503/504 responses carry CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -37,6 +96,10 @@ app.add_middleware(
 app.include_router(scoring.router, prefix="/api/v1", tags=["Scoring"])
 app.include_router(thesis.router, prefix="/api/v1", tags=["Thesis"])
 app.include_router(founder.router, prefix="/api/v1", tags=["Founder"])
+app.include_router(portfolio.router, prefix="/api/v1", tags=["Portfolio"])
+app.include_router(deals.router, prefix="/api/v1", tags=["Deals"])
+app.include_router(drift.router, prefix="/api/v1", tags=["Monitoring"])
+app.include_router(shadow.router, prefix="/api/v1", tags=["Monitoring"])
 
 # Health check endpoint
 @app.get("/health")
@@ -55,6 +118,33 @@ async def health_check():
         }
     )
 
+# Readiness endpoint
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint: 503 until the services needed to serve requests
+    are warm, with the state of each, and always with several workers
+    that don't share their theses and subscriptions
+    """
+    ready = services.ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "starting",
+            "init_mode": settings.SERVICE_INIT_MODE,
+            "shared_state": shared_state_ok(),
+            "components": services.status()
+        }
+    )
+
+# Metrics endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Service metrics in Prometheus text format
+    """
+    return PlainTextResponse(metrics.render())
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -66,10 +156,14 @@ async def root():
         "version": "1.0.0",
         "documentation": "/docs",
         "health": "/health",
+        "ready": "/ready",
+        "metrics": "/metrics",
         "endpoints": {
             "scoring": "/api/v1/score_deal",
             "thesis": "/api/v1/match_thesis",
-            "founder": "/api/v1/evaluate_founder"
+            "founder": "/api/v1/evaluate_founder",
+            "portfolio": "/api/v1/portfolio/analytics",
+            "drift": "/api/v1/drift"
         }
     }
 
@@ -85,27 +179,6 @@ async def global_exception_handler(request, exc):
         }
     )
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """
-    Actions to perform on startup
-    """
-    logger.info("="*50)
-    logger.info("Capital Ranker ML Service Starting...")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info(f"Debug Mode: {settings.DEBUG}")
-    logger.info(f"Host: {settings.HOST}:{settings.PORT}")
-    logger.info("="*50)
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """
-    Actions to perform on shutdown
-    """
-    logger.info("Capital Ranker ML Service Shutting Down...")
-
 # Run the application (for development)
 if __name__ == "__main__":
     uvicorn.run(
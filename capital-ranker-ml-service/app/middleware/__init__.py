@@ -0,0 +1,5 @@
+
+from .admission import AdmissionControlMiddleware
+from .deadline import DeadlineMiddleware
+
+__all__ = ["AdmissionControlMiddleware", "DeadlineMiddleware"]
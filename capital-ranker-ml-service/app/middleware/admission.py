@@ -0,0 +1,259 @@
+# ============================================
+# app/middleware/admission.py
+# Admission Control and Fair Queueing
+# ============================================
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from app.utils.logger import setup_logger
+from app.utils.metrics import metrics
+
+logger = setup_logger()
+
+rejections = metrics.counter(
+    "ml_admission_rejected_total",
+    "Requests turned away by admission control",
+    labels=("status", "priority")
+)
+
+PRIORITY_HEADER = b"x-priority"
+CLIENT_HEADER = b"x-client-id"
+PRIORITY_CLASSES = ("interactive", "batch")
+
+# Bulk endpoints default to the batch class and get their own limit
+BATCH_ROUTES = (
+    "/api/v1/score_deals/batch",
+    "/api/v1/score_deals/explain",
+    "/api/v1/portfolio/analytics",
+    "/api/v1/deals/dedup",
+    "/api/v1/embeddings/batch",
+    "/api/v1/subscriptions/percolate",
+)
+
+
+class Rejected(Exception):
+    """Request turned away; carries the HTTP status and a retry hint"""
+
+    def __init__(self, status_code: int, message: str, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after
+
+
+class FairScheduler:
+    """
+    Global concurrency slots handed out by weighted fair queueing
+
+    Each priority class has a pass value advanced by 1 / weight per
+    admitted request (stride scheduling); when slots are contended, the
+    waiting class with the lowest pass goes next, so classes share
+    slots in proportion to their weights and none starves.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        weights: Dict[str, float],
+        queue_size: int
+    ):
+        self.max_concurrency = max_concurrency
+        self.weights = weights
+        self.queue_size = queue_size
+        self.active = 0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {c: deque() for c in weights}
+        self._passes: Dict[str, float] = {c: 0.0 for c in weights}
+        self._clock = 0.0
+
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def acquire(self, priority: str, timeout: float) -> bool:
+        """Wait for a slot; False when the queue is full or the wait times out"""
+        if self.active < self.max_concurrency and not self.queued():
+            self._admit(priority)
+            return True
+
+        queue = self._queues[priority]
+        if len(queue) >= self.queue_size:
+            return False
+        if not queue:
+            # A class that was idle does not bank credit for the idle time
+            self._passes[priority] = max(self._passes[priority], self._clock)
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._abandon(queue, waiter)
+            return False
+        except asyncio.CancelledError:
+            self._abandon(queue, waiter)
+            raise
+
+    def _abandon(self, queue: Deque[asyncio.Future], waiter: asyncio.Future):
+        if waiter.done():
+            # Granted just as the wait ended; hand the slot back
+            self.release()
+        else:
+            waiter.cancel()
+            queue.remove(waiter)
+
+    def release(self):
+        """Free a slot and grant it to the next waiter in fair order"""
+        self.active -= 1
+        while self.active < self.max_concurrency:
+            priority = self._next_class()
+            if priority is None:
+                return
+            waiter = self._queues[priority].popleft()
+            self._admit(priority)
+            waiter.set_result(True)
+
+    def _next_class(self) -> Optional[str]:
+        waiting = [c for c, queue in self._queues.items() if queue]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda c: self._passes[c])
+
+    def _admit(self, priority: str):
+        self.active += 1
+        self._clock = self._passes[priority]
+        self._passes[priority] += 1.0 / self.weights[priority]
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware limiting concurrent API requests
+
+    Requests over the per-client or per-route concurrency limit are
+    rejected with 429; the rest wait for a global slot, shared between
+    the interactive and batch priority classes (X-Priority header,
+    defaulting by route) by weighted fair queueing. A full queue or a
+    queue wait past the timeout rejects with 503. Rejections carry a
+    Retry-After estimated from recent service times.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_concurrency: int = 32,
+        client_concurrency: int = 64,
+        batch_route_concurrency: int = 4,
+        interactive_weight: float = 4.0,
+        batch_weight: float = 1.0,
+        queue_size: int = 256,
+        queue_timeout: float = 10.0,
+        path_prefix: str = "/api/"
+    ):
+        self.app = app
+        self.client_concurrency = client_concurrency
+        self.route_limits = {route: batch_route_concurrency for route in BATCH_ROUTES}
+        self.queue_timeout = queue_timeout
+        self.path_prefix = path_prefix
+        self.scheduler = FairScheduler(
+            max_concurrency,
+            {"interactive": interactive_weight, "batch": batch_weight},
+            queue_size
+        )
+        self._clients: Dict[str, int] = {}
+        self._routes: Dict[str, int] = {}
+        # Moving average of request duration, for Retry-After hints
+        self._service_time = 0.1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        client, route, priority = self._classify(scope)
+        try:
+            self._enter(client, route)
+        except Rejected as rejection:
+            rejections.inc(status=rejection.status_code, priority=priority)
+            await self._reject(send, rejection)
+            return
+
+        try:
+            if not await self.scheduler.acquire(priority, self.queue_timeout):
+                logger.warning(f"Admission queue rejected {priority} request to {route}")
+                rejections.inc(status=503, priority=priority)
+                await self._reject(send, Rejected(
+                    503, "Service is at capacity", self._retry_after()
+                ))
+                return
+
+            start = time.perf_counter()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.scheduler.release()
+                elapsed = time.perf_counter() - start
+                self._service_time += 0.1 * (elapsed - self._service_time)
+        finally:
+            self._leave(client, route)
+
+    def _classify(self, scope) -> Tuple[str, str, str]:
+        headers = dict(scope.get("headers") or [])
+        route = scope["path"]
+
+        client = headers.get(CLIENT_HEADER, b"").decode("latin-1")
+        if not client:
+            client = (scope.get("client") or ("unknown", 0))[0]
+
+        priority = headers.get(PRIORITY_HEADER, b"").decode("latin-1").lower()
+        if priority not in PRIORITY_CLASSES:
+            priority = "batch" if route in self.route_limits else "interactive"
+
+        return client, route, priority
+
+    def _enter(self, client: str, route: str):
+        if self._clients.get(client, 0) >= self.client_concurrency:
+            raise Rejected(
+                429, "Too many concurrent requests from this client", self._retry_after()
+            )
+        limit = self.route_limits.get(route)
+        if limit is not None and self._routes.get(route, 0) >= limit:
+            raise Rejected(
+                429, "Too many concurrent requests to this endpoint", self._retry_after()
+            )
+
+        self._clients[client] = self._clients.get(client, 0) + 1
+        if limit is not None:
+            self._routes[route] = self._routes.get(route, 0) + 1
+
+    def _leave(self, client: str, route: str):
+        self._clients[client] -= 1
+        if not self._clients[client]:
+            del self._clients[client]
+        if route in self._routes:
+            self._routes[route] -= 1
+
+    def _retry_after(self) -> int:
+        """Seconds until the current backlog is likely served"""
+        backlog = self.scheduler.queued() + 1
+        slots = self.scheduler.max_concurrency
+        return max(1, math.ceil(self._service_time * backlog / slots))
+
+    async def _reject(self, send, rejection: Rejected):
+        body = json.dumps({
+            "error": "Too many requests" if rejection.status_code == 429 else "Service unavailable",
+            "message": rejection.message
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": rejection.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(rejection.retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
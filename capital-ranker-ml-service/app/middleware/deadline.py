@@ -0,0 +1,120 @@
+# ============================================
+# app/middleware/deadline.py
+# Request Deadlines and Client Disconnects
+# ============================================
+
+import asyncio
+import json
+from typing import Optional
+
+from app.utils.deadline import Deadline, DeadlineExceeded, cancellations, current_deadline
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+TIMEOUT_HEADER = b"x-request-timeout-ms"
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware giving every API request a Deadline
+
+    The time budget comes from the X-Request-Timeout-Ms header (or the
+    default timeout). The handler runs as a task that is cancelled once
+    the budget is spent or the client disconnects, and the Deadline in
+    `current_deadline` is flagged so work in threads stops at its next
+    `check_deadline` checkpoint. Abandoned requests get a 504 if no
+    response was started.
+    """
+
+    def __init__(self, app, default_timeout_ms: int = 0, path_prefix: str = "/api/"):
+        self.app = app
+        self.default_timeout_ms = default_timeout_ms
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        deadline = Deadline(self._timeout(scope))
+        token = current_deadline.set(deadline)
+        loop = asyncio.get_running_loop()
+        started = False
+        watcher: Optional[asyncio.Future] = None
+
+        async def watch_disconnect():
+            message = await receive()
+            if message["type"] == "http.disconnect" and not handler.done():
+                deadline.cancel("disconnected")
+                handler.cancel()
+            return message
+
+        async def tracked_receive():
+            nonlocal watcher
+            if watcher is not None:
+                return await asyncio.shield(watcher)
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body", False):
+                # Body fully read; from here on receive only reports disconnects
+                watcher = asyncio.ensure_future(watch_disconnect())
+            return message
+
+        async def tracked_send(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        def expire():
+            if not handler.done():
+                handler.cancel()
+
+        handler = asyncio.ensure_future(self.app(scope, tracked_receive, tracked_send))
+        timer = None
+        if deadline.remaining() is not None:
+            timer = loop.call_later(deadline.remaining(), expire)
+
+        try:
+            await handler
+        except (asyncio.CancelledError, DeadlineExceeded) as e:
+            reason = deadline.reason
+            if reason is None:
+                # Cancelled from outside (e.g. server shutdown)
+                handler.cancel()
+                raise
+            if isinstance(e, asyncio.CancelledError):
+                cancellations.inc(reason=reason, stage="handler")
+            logger.warning(f"Abandoned request to {scope['path']}: {reason}")
+            if not started and reason != "disconnected":
+                await self._timeout_response(send)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if watcher is not None:
+                watcher.cancel()
+            current_deadline.reset(token)
+
+    def _timeout(self, scope) -> Optional[float]:
+        headers = dict(scope.get("headers") or [])
+        value = headers.get(TIMEOUT_HEADER)
+        try:
+            timeout_ms = float(value) if value is not None else self.default_timeout_ms
+        except ValueError:
+            timeout_ms = self.default_timeout_ms
+        return timeout_ms / 1000 if timeout_ms > 0 else None
+
+    async def _timeout_response(self, send):
+        body = json.dumps({
+            "error": "Deadline exceeded",
+            "message": "Request deadline passed before it completed"
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
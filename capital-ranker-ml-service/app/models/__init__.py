@@ -1,4 +1,5 @@
 
 from .founder_evaluator import FounderEvaluator
+from .linear_model import LinearModel
 
-__all__ = ["FounderEvaluator"]
\ No newline at end of file
+__all__ = ["FounderEvaluator", "LinearModel"]
\ No newline at end of file
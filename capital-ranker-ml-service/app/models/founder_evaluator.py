@@ -1,3 +1,4 @@
+from typing import List
 from app.schemas.founder_schema import (
     FounderData,
     FounderEvaluationResponse,
@@ -16,6 +17,15 @@ class FounderEvaluator:
     def __init__(self):
         logger.info("Founder evaluator initialized")
     
+    def evaluate_batch(
+        self,
+        founders: List[FounderData]
+    ) -> List[FounderEvaluationResponse]:
+        """
+        Evaluate many founders in one call
+        """
+        return [self.evaluate(founder) for founder in founders]
+    
     def evaluate(self, founder_data: FounderData) -> FounderEvaluationResponse:
         """
         Evaluate founder and generate score
@@ -0,0 +1,166 @@
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.scoring_schema import ScoringWeights
+from app.services.feature_engineering import SUB_SCORE_FEATURES
+
+TASKS = ('logistic', 'linear')
+
+
+def sigmoid(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1 + np.tanh(0.5 * z))
+
+
+@dataclass
+class LinearModel:
+    """
+    Linear or logistic model over standardized features, stored as an
+    .npz artifact
+    """
+    task: str
+    features: Tuple[str, ...]
+    mean: np.ndarray
+    scale: np.ndarray
+    coef: np.ndarray
+    intercept: float
+    version: str = ""
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Probabilities (logistic) or values (linear) for a feature matrix"""
+        z = ((X - self.mean) / self.scale) @ self.coef + self.intercept
+        return sigmoid(z) if self.task == 'logistic' else z
+
+    def raw_coef(self) -> np.ndarray:
+        """Coefficients per unit of the unstandardized features"""
+        return self.coef / self.scale
+
+    def scoring_weights(self) -> Optional[ScoringWeights]:
+        """
+        Sub-score weights implied by a model over SUB_SCORE_FEATURES
+
+        Negative coefficients are dropped and the rest normalized to
+        sum to 1, like the default weights. None for models over other
+        features or without a positive coefficient.
+        """
+        if tuple(self.features) != SUB_SCORE_FEATURES:
+            return None
+        coef = np.maximum(self.raw_coef(), 0)
+        if coef.sum() <= 0:
+            return None
+        market, traction, team, financial = (coef / coef.sum()).tolist()
+        return ScoringWeights(
+            market_weight=round(market, 4),
+            traction_weight=round(traction, 4),
+            team_weight=round(team, 4),
+            financial_weight=round(financial, 4)
+        )
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            task=np.array(self.task),
+            features=np.array(self.features),
+            mean=self.mean,
+            scale=self.scale,
+            coef=self.coef,
+            intercept=np.array(self.intercept),
+            version=np.array(self.version),
+            metrics=np.array(json.dumps(self.metrics))
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LinearModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                task=str(data['task']),
+                features=tuple(str(name) for name in data['features']),
+                mean=data['mean'],
+                scale=data['scale'],
+                coef=data['coef'],
+                intercept=float(data['intercept']),
+                version=str(data['version']),
+                metrics=json.loads(str(data['metrics']))
+            )
+
+
+class StackedSGD:
+    """
+    Several linear/logistic models trained side by side with Adam
+
+    Each model sees the rows its mask allows, so one pass over a
+    mini-batch updates every cross-validation fold model and the final
+    model together. Inputs must already be standardized.
+    """
+
+    def __init__(
+        self,
+        task: str,
+        n_models: int,
+        n_features: int,
+        learning_rate: float = 0.01,
+        l2: float = 1e-4,
+        beta1: float = 0.9,
+        beta2: float = 0.999,
+        eps: float = 1e-8
+    ):
+        if task not in TASKS:
+            raise ValueError(f"Unknown task '{task}'; expected one of {TASKS}")
+        self.task = task
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.beta1, self.beta2, self.eps = beta1, beta2, eps
+        # Weights with the intercept in the last column
+        self.params = np.zeros((n_models, n_features + 1))
+        self._m = np.zeros_like(self.params)
+        self._v = np.zeros_like(self.params)
+        self._t = 0
+
+    def decision(self, X: np.ndarray) -> np.ndarray:
+        """(rows, models) linear predictors"""
+        return X @ self.params[:, :-1].T + self.params[:, -1]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        z = self.decision(X)
+        return sigmoid(z) if self.task == 'logistic' else z
+
+    def step(self, X: np.ndarray, y: np.ndarray, mask: np.ndarray):
+        """One Adam update of every model on its rows of a mini-batch"""
+        counts = mask.sum(axis=0)
+        if not counts.any():
+            return
+        # Gradient of log loss or half squared error w.r.t. the predictor
+        residual = (self.predict(X) - y[:, None]) * mask
+        counts = np.maximum(counts, 1)[:, None]
+        grad = np.empty_like(self.params)
+        grad[:, :-1] = residual.T @ X / counts + self.l2 * self.params[:, :-1]
+        grad[:, -1] = residual.sum(axis=0) / counts[:, 0]
+
+        self._t += 1
+        self._m = self.beta1 * self._m + (1 - self.beta1) * grad
+        self._v = self.beta2 * self._v + (1 - self.beta2) * grad ** 2
+        m_hat = self._m / (1 - self.beta1 ** self._t)
+        v_hat = self._v / (1 - self.beta2 ** self._t)
+        self.params -= self.learning_rate * m_hat / (np.sqrt(v_hat) + self.eps)
+
+    def model(
+        self,
+        index: int,
+        features: Sequence[str],
+        mean: np.ndarray,
+        scale: np.ndarray,
+        **kwargs
+    ) -> LinearModel:
+        return LinearModel(
+            task=self.task,
+            features=tuple(features),
+            mean=mean,
+            scale=scale,
+            coef=self.params[index, :-1].copy(),
+            intercept=float(self.params[index, -1]),
+            **kwargs
+        )
@@ -1,12 +1,27 @@
 
 from .scoring_schema import (
     DealData, ScoreRequest, ScoreResponse,
-    ScoreBreakdown, DetailedAnalysis
+    ScoreBreakdown, DetailedAnalysis,
+    BatchScoreRequest, BatchScoreResponse, ScoreExplanationResponse,
+    DuplicateRow, DealDedupRequest, DealDedupResponse
 )
 from .thesis_schema import (
     ThesisMatchRequest, ThesisMatchResponse,
-    SimilarityBreakdown, MatchedSection
+    SimilarityBreakdown, MatchedSection,
+    ThesisRegistrationRequest, ThesisRegistrationResponse,
+    ThesisRankRequest, ThesisRankResponse, ThesisRank
 )
+from .embedding_schema import (
+    EmbeddingRequest, EmbeddingResponse, EmbeddingBatchRequest
+)
+from .portfolio_schema import (
+    PortfolioAnalyticsResponse, ScoreDistribution, GroupStats
+)
+from .drift_schema import (
+    DriftReportResponse, HistogramDrift,
+    DriftSketch, DriftSketchResponse, DriftReferenceRequest
+)
+from .shadow_schema import ShadowStatsResponse, ShadowScoreDelta
 from .founder_schema import (
     FounderEvaluationRequest, FounderEvaluationResponse,
     FounderScoreBreakdown, RedFlag
@@ -14,6 +29,14 @@ from .founder_schema import (
 
 __all__ = [
     "DealData", "ScoreRequest", "ScoreResponse",
+    "BatchScoreRequest", "BatchScoreResponse", "ScoreExplanationResponse",
+    "DealDedupRequest", "DealDedupResponse",
     "ThesisMatchRequest", "ThesisMatchResponse",
+    "ThesisRegistrationRequest", "ThesisRegistrationResponse",
+    "ThesisRankRequest", "ThesisRankResponse",
+    "EmbeddingRequest", "EmbeddingResponse", "EmbeddingBatchRequest",
+    "PortfolioAnalyticsResponse",
+    "DriftReportResponse", "DriftSketchResponse", "DriftReferenceRequest",
+    "ShadowStatsResponse",
     "FounderEvaluationRequest", "FounderEvaluationResponse"
 ]
\ No newline at end of file
@@ -0,0 +1,41 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+class HistogramDrift(BaseModel):
+    """Current vs reference distribution of one feature or score"""
+    name: str
+    kind: str
+    count: int
+    missing_rate: Optional[float] = None
+    reference_count: Optional[int] = None
+    reference_missing_rate: Optional[float] = None
+    psi: Optional[float] = None
+    js_divergence: Optional[float] = None
+    ks_statistic: Optional[float] = None
+    status: str
+
+class DriftReportResponse(BaseModel):
+    """Divergence of every monitored histogram from the reference"""
+    observations: int
+    reference_observations: Optional[int] = None
+    drifted: List[str]
+    histograms: List[HistogramDrift]
+
+class DriftSketch(BaseModel):
+    """Raw histogram counts; sketches with the same layout add up"""
+    observations: int = Field(..., ge=0)
+    counts: List[int]
+
+class DriftSketchResponse(BaseModel):
+    """Current and reference sketches with the layout to read them"""
+    layout: List[Dict[str, Any]]
+    current: DriftSketch
+    reference: Optional[DriftSketch] = None
+
+class DriftReferenceRequest(BaseModel):
+    """Reference sketch, e.g. merged from all workers"""
+    sketch: Optional[DriftSketch] = None
+
+class DriftMergeRequest(BaseModel):
+    """Sketch of another worker to add to this one's current counts"""
+    sketch: DriftSketch
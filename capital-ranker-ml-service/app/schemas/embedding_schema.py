@@ -0,0 +1,16 @@
+from typing import List, Literal
+from pydantic import BaseModel, Field
+
+class EmbeddingRequest(BaseModel):
+    """Request for a single text embedding"""
+    text: str = Field(min_length=1)
+
+class EmbeddingResponse(BaseModel):
+    """Single text embedding"""
+    embedding: List[float]
+    dimension: int
+
+class EmbeddingBatchRequest(BaseModel):
+    """Request for embedding many texts at once"""
+    texts: List[str] = Field(min_length=1, max_length=10000)
+    format: Literal["json", "base64", "binary"] = "json"
@@ -0,0 +1,30 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+from .scoring_schema import RowError
+
+class ScoreDistribution(BaseModel):
+    """Histogram over 0-100 plus summary statistics of one score"""
+    bin_edges: List[float]
+    counts: List[int]
+    quantiles: Dict[str, Optional[float]]
+    mean: Optional[float] = None
+
+class GroupStats(BaseModel):
+    """Deals and mean investment fit score of one stage or sector"""
+    name: str
+    count: int
+    mean_score: float
+
+class PortfolioAnalyticsResponse(BaseModel):
+    """Aggregate analytics of a scored set of deals"""
+    count: int
+    total: int
+    errors: List[RowError]
+    distributions: Dict[str, ScoreDistribution]
+    stages: List[GroupStats]
+    sectors: List[GroupStats]
+    growth_potential: Dict[str, int]
+    risk_level: Dict[str, int]
+    recommendation: Dict[str, int]
+    ml_model_version: str
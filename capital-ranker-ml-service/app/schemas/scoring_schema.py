@@ -1,6 +1,7 @@
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
+from app.schemas.founder_schema import FounderData
 
 class DealMetrics(BaseModel):
     """Deal metrics data"""
@@ -24,6 +25,7 @@ class DealData(BaseModel):
     team_size: int = Field(ge=1)
     founded_date: str
     location: Dict[str, str]
+    founders: List[FounderData] = []
 
 class ScoringWeights(BaseModel):
     """Custom scoring weights"""
@@ -64,3 +66,87 @@ class ScoreResponse(BaseModel):
     detailed_analysis: DetailedAnalysis
     confidence: float = Field(ge=0, le=1)
     ml_model_version: str
+
+class BatchScoreRequest(BaseModel):
+    """
+    Request for scoring many deals
+
+    Deals are raw DealData-shaped records; they are validated
+    column-wise so malformed rows can be reported individually.
+    """
+    deals: List[Any] = Field(min_length=1)
+    custom_weights: Optional[ScoringWeights] = None
+
+class RowError(BaseModel):
+    """Validation error for one deal of a batch"""
+    row: int
+    field: str
+    message: str
+
+class DuplicateRow(BaseModel):
+    """Deal skipped as a near-duplicate of an earlier row"""
+    row: int
+    duplicate_of: int
+    similarity: float
+
+class BatchScoreResponse(BaseModel):
+    """
+    Column arrays of scores, one entry per valid deal
+
+    Analysis lists hold indices into analysis_messages.
+    """
+    count: int
+    total: int
+    rows: List[int]
+    errors: List[RowError]
+    duplicates: List[DuplicateRow] = []
+    investment_fit_score: List[float]
+    market_score: List[float]
+    traction_score: List[float]
+    team_score: List[float]
+    financial_score: List[float]
+    confidence: List[float]
+    growth_potential: List[str]
+    risk_level: List[str]
+    recommendation: List[str]
+    analysis_messages: List[str]
+    strengths: List[List[int]]
+    weaknesses: List[List[int]]
+    key_risks: List[List[int]]
+    opportunities: List[List[int]]
+    ml_model_version: str
+
+class ScoreExplanationResponse(BaseModel):
+    """
+    Per-feature contributions to investment_fit_score, one row per
+    valid deal
+
+    base_value + sum(contributions[i]) + residual[i] equals
+    investment_fit_score[i]; the residual is zero for exact attribution.
+    """
+    count: int
+    total: int
+    rows: List[int]
+    errors: List[RowError]
+    method: str
+    features: List[str]
+    base_value: List[float]
+    contributions: List[List[float]]
+    residual: List[float]
+    investment_fit_score: List[float]
+    ml_model_version: str
+
+class DealDedupRequest(BaseModel):
+    """Raw deal records to check for near-duplicates"""
+    deals: List[Any] = Field(min_length=1)
+    threshold: Optional[float] = Field(default=None, ge=0, le=1)
+
+class DealDedupResponse(BaseModel):
+    """
+    Near-duplicate groups of a batch; each cluster lists its canonical
+    (first) row followed by its duplicates
+    """
+    count: int
+    unique: int
+    duplicates: List[DuplicateRow]
+    clusters: List[List[int]]
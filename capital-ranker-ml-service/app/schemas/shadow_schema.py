@@ -0,0 +1,25 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+class ShadowScoreDelta(BaseModel):
+    """Candidate minus primary score over the compared deals"""
+    mean_delta: Optional[float] = None
+    mean_abs_delta: Optional[float] = None
+    rmse: Optional[float] = None
+    max_abs_delta: float
+
+class ShadowStatsResponse(BaseModel):
+    """Comparison of the shadow candidate model with the primary one"""
+    enabled: bool
+    primary_version: str
+    candidate_version: Optional[str] = None
+    sample_rate: Optional[float] = None
+    compared_requests: int = 0
+    compared_deals: int = 0
+    queued: int = 0
+    scores: Dict[str, ShadowScoreDelta] = {}
+    delta_edges: List[float] = []
+    delta_counts: List[int] = []
+    recommendation_flips: int = 0
+    flip_rate: Optional[float] = None
+    flip_matrix: Dict[str, Dict[str, int]] = {}
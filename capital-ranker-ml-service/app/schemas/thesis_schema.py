@@ -1,10 +1,38 @@
-from typing import List
-from pydantic import BaseModel, Field
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from app.schemas.scoring_schema import DealData
 
 class ThesisMatchRequest(BaseModel):
     """Request for thesis matching"""
     pitch_text: str = Field(min_length=50)
+    thesis_text: Optional[str] = Field(default=None, min_length=50)
+    # With thesis_text too, the text is registered under it if it isn't yet
+    thesis_id: Optional[str] = None
+    # content_hash the caller registered thesis_id with; 409 if it differs
+    thesis_content_hash: Optional[str] = None
+    pitch_sectors: List[str] = []
+    pitch_stage: Optional[str] = None
+    thesis_sectors: List[str] = []
+    thesis_stages: List[str] = []
+
+    @model_validator(mode="after")
+    def check_thesis_source(self):
+        if self.thesis_text is None and self.thesis_id is None:
+            raise ValueError("Either thesis_text or thesis_id is required")
+        return self
+
+class ThesisRegistrationRequest(BaseModel):
+    """Request for registering a thesis"""
     thesis_text: str = Field(min_length=50)
+    sectors: List[str] = []
+    stages: List[str] = []
+
+class ThesisRegistrationResponse(BaseModel):
+    """Registered thesis summary"""
+    thesis_id: str
+    content_hash: str
+    keywords: List[str]
+    updated: bool
 
 class SimilarityBreakdown(BaseModel):
     """Similarity breakdown"""
@@ -24,3 +52,81 @@ class ThesisMatchResponse(BaseModel):
     matched_keywords: List[str]
     similarity_breakdown: SimilarityBreakdown
     matched_sections: List[MatchedSection]
+
+class ThesisRankRequest(BaseModel):
+    """Request for ranking registered theses against a pitch"""
+    pitch_text: str = Field(min_length=50)
+    pitch_sectors: List[str] = []
+    pitch_stage: Optional[str] = None
+    top_k: int = Field(default=10, ge=1, le=1000)
+
+class ThesisRank(BaseModel):
+    """Relevancy of one registered thesis"""
+    thesis_id: str
+    relevancy_score: float = Field(ge=0, le=100)
+    semantic_similarity: float = Field(ge=0, le=100)
+
+class ThesisRankResponse(BaseModel):
+    """Registered theses ranked by relevancy"""
+    results: List[ThesisRank]
+    total_theses: int
+
+class SubscriptionRequest(BaseModel):
+    """
+    Thesis subscription for deal alerts; with a registered thesis_id its
+    keywords, sectors and stages are the defaults
+    """
+    thesis_id: Optional[str] = None
+    required_terms: List[str] = []
+    optional_terms: List[str] = []
+    sectors: List[str] = []
+    stages: List[str] = []
+    min_relevancy: float = Field(default=0, ge=0, le=100)
+    min_score: Optional[float] = Field(default=None, ge=0, le=100)
+
+class SubscriptionResponse(BaseModel):
+    """Compiled subscription"""
+    subscription_id: str
+    required_terms: List[str]
+    optional_terms: List[str]
+    sectors: List[str]
+    stages: List[str]
+    min_relevancy: float
+    min_score: Optional[float] = None
+
+class PercolateDeal(BaseModel):
+    """
+    Incoming deal; text, sectors and stage default to those of
+    deal_data, which is also scored when a subscription needs a score
+    """
+    deal_id: str
+    text: Optional[str] = None
+    sectors: List[str] = []
+    stage: Optional[str] = None
+    investment_fit_score: Optional[float] = None
+    deal_data: Optional[DealData] = None
+
+    @model_validator(mode="after")
+    def check_text_source(self):
+        if self.text is None and self.deal_data is None:
+            raise ValueError("Either text or deal_data is required")
+        return self
+
+class PercolateRequest(BaseModel):
+    """Deals to match against every subscription"""
+    deals: List[PercolateDeal] = Field(min_length=1, max_length=10000)
+
+class SubscriptionMatch(BaseModel):
+    """Subscription triggered by a deal"""
+    subscription_id: str
+    relevancy_score: float = Field(ge=0, le=100)
+
+class DealSubscriptions(BaseModel):
+    """Subscriptions one deal triggers, most relevant first"""
+    deal_id: str
+    matches: List[SubscriptionMatch]
+
+class PercolateResponse(BaseModel):
+    """Triggered subscriptions per deal"""
+    results: List[DealSubscriptions]
+    total_subscriptions: int
@@ -1,6 +1,18 @@
 
-from .scoring_service import ScoringService
-from .nlp_service import NLPService
-from .feature_engineering import FeatureEngineering
+import importlib
 
-__all__ = ["ScoringService", "NLPService", "FeatureEngineering"]
\ No newline at end of file
+# Service classes are imported on first access, so importing one
+# submodule does not load all the others
+_EXPORTS = {
+    "ScoringService": ".scoring_service",
+    "NLPService": ".nlp_service",
+    "FeatureEngineering": ".feature_engineering",
+}
+
+__all__ = ["ScoringService", "NLPService", "FeatureEngineering"]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,142 @@
+# ============================================
+# app/services/analysis_templates.py
+# Precomputed Detailed Analysis Messages
+# ============================================
+
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.deal_columns import DealColumns, STAGE_CODES, sector_mask
+
+Condition = Callable[[DealColumns, Dict[str, np.ndarray]], np.ndarray]
+
+# category -> ((message, condition), ...), fallback message when none hold
+ANALYSIS_RULES: Dict[str, Tuple[Tuple[Tuple[str, Condition], ...], Optional[str]]] = {
+    'strengths': ((
+        ("Strong market opportunity in growing sector",
+         lambda d, s: s['market_score'] >= 70),
+        ("Excellent traction and growth metrics",
+         lambda d, s: s['traction_score'] >= 70),
+        ("Experienced team with domain expertise",
+         lambda d, s: s['team_score'] >= 70),
+        ("Solid financial position with healthy runway",
+         lambda d, s: s['financial_score'] >= 70),
+    ), "Promising early-stage opportunity"),
+    'weaknesses': ((
+        ("Limited market opportunity or competitive sector",
+         lambda d, s: s['market_score'] < 50),
+        ("Needs to demonstrate stronger traction",
+         lambda d, s: s['traction_score'] < 50),
+        ("Small team size may limit execution capability",
+         lambda d, s: s['team_score'] < 50),
+        ("Limited runway requires attention",
+         lambda d, s: s['financial_score'] < 50),
+    ), None),
+    'key_risks': ((
+        ("Critical: Short runway (< 6 months)",
+         lambda d, s: d.runway_months < 6),
+        ("Slow growth rate may indicate market fit issues",
+         lambda d, s: d.growth_rate_yoy < 20),
+        ("Very small team size",
+         lambda d, s: d.team_size < 3),
+    ), "Standard startup execution risks"),
+    'opportunities': ((
+        ("Operating in high-growth technology sector",
+         lambda d, s: (d.sector_mask & sector_mask(('ai-ml', 'saas'))) != 0),
+        ("Strong growth momentum to capitalize on",
+         lambda d, s: d.growth_rate_yoy > 50),
+        ("Early-stage entry with significant upside potential",
+         lambda d, s: np.isin(d.stage, [STAGE_CODES['seed'], STAGE_CODES['series-a']])),
+    ), None),
+}
+
+CATEGORIES = tuple(ANALYSIS_RULES)
+
+
+class AnalysisTemplates:
+    """
+    Rule conditions packed into one bitmask per deal
+
+    Every condition pattern of a category maps to a precomputed tuple
+    of interned messages (and their ids in `messages`), so analysis
+    for a batch is one vectorized mask evaluation plus table lookups.
+    """
+
+    def __init__(self):
+        self.messages: List[str] = []
+        message_ids: Dict[str, int] = {}
+
+        def message_id(message: str) -> int:
+            if message not in message_ids:
+                message_ids[message] = len(self.messages)
+                self.messages.append(sys.intern(message))
+            return message_ids[message]
+
+        self.offsets: Dict[str, int] = {}
+        self.widths: Dict[str, int] = {}
+        self.pattern_messages: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+        self.pattern_ids: Dict[str, Tuple[Tuple[int, ...], ...]] = {}
+
+        offset = 0
+        for category, (rules, fallback) in ANALYSIS_RULES.items():
+            ids = [message_id(message) for message, _ in rules]
+            fallback_id = message_id(fallback) if fallback else None
+
+            patterns = []
+            for pattern in range(1 << len(rules)):
+                selected = tuple(
+                    ids[bit] for bit in range(len(rules)) if pattern >> bit & 1
+                )
+                if not selected and fallback_id is not None:
+                    selected = (fallback_id,)
+                patterns.append(selected)
+
+            self.offsets[category] = offset
+            self.widths[category] = len(rules)
+            self.pattern_ids[category] = tuple(patterns)
+            self.pattern_messages[category] = tuple(
+                tuple(self.messages[i] for i in selected) for selected in patterns
+            )
+            offset += len(rules)
+
+        self.messages = tuple(self.messages)
+
+    def condition_masks(
+        self,
+        columns: DealColumns,
+        scores: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Bitmask of every rule condition, one uint16 per deal"""
+        masks = np.zeros(len(columns), dtype=np.uint16)
+        for category, (rules, _) in ANALYSIS_RULES.items():
+            offset = self.offsets[category]
+            for bit, (_, condition) in enumerate(rules):
+                masks |= condition(columns, scores).astype(np.uint16) << (offset + bit)
+        return masks
+
+    def patterns(self, masks: np.ndarray, category: str) -> np.ndarray:
+        """Per-deal pattern code of one category"""
+        width = self.widths[category]
+        return (masks >> self.offsets[category]) & ((1 << width) - 1)
+
+    def messages_for(self, mask: int) -> Dict[str, Tuple[str, ...]]:
+        """Message tuples of every category for one deal's mask"""
+        return {
+            category: self.pattern_messages[category][
+                mask >> self.offsets[category] & ((1 << self.widths[category]) - 1)
+            ]
+            for category in CATEGORIES
+        }
+
+    def pattern_table(self, category: str) -> np.ndarray:
+        """Pattern code -> message ids, padded with -1"""
+        patterns = self.pattern_ids[category]
+        table = np.full((len(patterns), self.widths[category]), -1, dtype=np.int16)
+        for code, selected in enumerate(patterns):
+            table[code, :len(selected)] = selected
+        return table
+
+
+ANALYSIS_TEMPLATES = AnalysisTemplates()
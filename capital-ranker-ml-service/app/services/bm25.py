@@ -0,0 +1,140 @@
+# ============================================
+# app/services/bm25.py
+# BM25 Relevance Scoring over the Thesis Corpus
+# ============================================
+
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+class BM25Index:
+    """
+    BM25 index over a corpus of term-count documents
+
+    Postings are stored per term as (doc id, term frequency) arrays and
+    document length normalization is precomputed, so a query is scored
+    against every document with a single weighted bincount.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[Counter],
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        self.k1 = k1
+        self.b = b
+        self.num_docs = len(documents)
+
+        self.vocabulary: Dict[str, int] = {}
+        postings_docs: List[List[int]] = []
+        postings_tfs: List[List[int]] = []
+        for doc_id, counts in enumerate(documents):
+            for term, tf in counts.items():
+                term_id = self.vocabulary.get(term)
+                if term_id is None:
+                    term_id = len(self.vocabulary)
+                    self.vocabulary[term] = term_id
+                    postings_docs.append([])
+                    postings_tfs.append([])
+                postings_docs[term_id].append(doc_id)
+                postings_tfs[term_id].append(tf)
+
+        self.postings_docs = [np.asarray(d, dtype=np.int32) for d in postings_docs]
+        self.postings_tfs = [np.asarray(t, dtype=np.float32) for t in postings_tfs]
+
+        self.doc_freq = np.array([len(d) for d in postings_docs], dtype=np.float32)
+        self.idf = self._idf(self.doc_freq, self.num_docs)
+
+        self.doc_lengths = np.array(
+            [sum(counts.values()) for counts in documents], dtype=np.float32
+        )
+        self.avg_doc_length = float(self.doc_lengths.mean()) if self.num_docs else 0.0
+        self.length_norm = self._length_norm(self.doc_lengths)
+
+        # BM25 of each document queried with its own terms, used to
+        # normalize scores into [0, 1]
+        self.self_scores = np.zeros(self.num_docs, dtype=np.float32)
+        for term_id in range(len(self.vocabulary)):
+            docs = self.postings_docs[term_id]
+            tfs = self.postings_tfs[term_id]
+            self.self_scores[docs] += self.idf[term_id] * self._saturate(
+                tfs, self.length_norm[docs]
+            )
+
+    def _idf(self, doc_freq: np.ndarray, num_docs: int) -> np.ndarray:
+        """Non-negative BM25 inverse document frequency"""
+        return np.log1p((num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def _length_norm(self, lengths: np.ndarray) -> np.ndarray:
+        """Per-document k1 * (1 - b + b * |d| / avgdl)"""
+        avg = self.avg_doc_length or 1.0
+        return self.k1 * (1 - self.b + self.b * lengths / avg)
+
+    def _saturate(self, tfs: np.ndarray, norm: np.ndarray) -> np.ndarray:
+        """Term-frequency saturation tf * (k1 + 1) / (tf + norm)"""
+        return tfs * (self.k1 + 1) / (tfs + norm)
+
+    def score(self, query_terms: Iterable[str]) -> np.ndarray:
+        """Raw BM25 score of the query against every document"""
+        term_ids = [
+            self.vocabulary[term] for term in set(query_terms)
+            if term in self.vocabulary
+        ]
+        if not term_ids or not self.num_docs:
+            return np.zeros(self.num_docs, dtype=np.float32)
+
+        docs = np.concatenate([self.postings_docs[t] for t in term_ids])
+        tfs = np.concatenate([self.postings_tfs[t] for t in term_ids])
+        idf = np.concatenate([
+            np.full(len(self.postings_docs[t]), self.idf[t], dtype=np.float32)
+            for t in term_ids
+        ])
+
+        contributions = idf * self._saturate(tfs, self.length_norm[docs])
+        return np.bincount(docs, weights=contributions, minlength=self.num_docs)
+
+    def normalized_scores(self, query_terms: Iterable[str]) -> np.ndarray:
+        """BM25 scores divided by each document's self score"""
+        scores = self.score(query_terms)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = np.where(self.self_scores > 0, scores / self.self_scores, 0.0)
+        return np.clip(normalized, 0.0, 1.0)
+
+    def score_external(
+        self,
+        query_terms: Iterable[str],
+        document: Counter
+    ) -> float:
+        """
+        Normalized score of the query against a document outside the index
+
+        Corpus statistics are taken from the index as if the document
+        had been added to it.
+        """
+        if not document:
+            return 0.0
+
+        num_docs = self.num_docs + 1
+        doc_length = float(sum(document.values()))
+        avg = (float(self.doc_lengths.sum()) + doc_length) / num_docs
+        norm = self.k1 * (1 - self.b + self.b * doc_length / avg)
+
+        terms = list(document)
+        doc_freq = np.array([
+            len(self.postings_docs[self.vocabulary[t]]) if t in self.vocabulary else 0
+            for t in terms
+        ], dtype=np.float32) + 1
+        idf = self._idf(doc_freq, num_docs)
+        tfs = np.array([document[t] for t in terms], dtype=np.float32)
+        weights = idf * self._saturate(tfs, norm)
+
+        query = set(query_terms)
+        matched = np.array([t in query for t in terms])
+
+        self_score = float(weights.sum())
+        if self_score <= 0:
+            return 0.0
+        return min(1.0, float(weights[matched].sum()) / self_score)
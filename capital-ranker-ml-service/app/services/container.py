@@ -0,0 +1,253 @@
+# ============================================
+# app/services/container.py
+# Lazily Built Service Instances and Readiness
+# ============================================
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class ServiceContainer:
+    """
+    Shared service instances, each built on first use
+
+    Services are registered as factories, so importing the routers costs
+    nothing and a worker can accept connections before its models and
+    indexes are loaded. `warm_up` builds everything in parallel in the
+    threadpool; requests arriving earlier build what they need
+    themselves, once, under a per-service lock.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._instances: Dict[str, Any] = {}
+        self._init_ms: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self.started = False
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """Service instance, built on first call"""
+        if name in self._instances:
+            return self._instances[name]
+
+        with self._locks[name]:
+            if name not in self._instances:
+                started = time.perf_counter()
+                try:
+                    self._instances[name] = self._factories[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._errors.pop(name, None)
+                self._init_ms[name] = (time.perf_counter() - started) * 1000
+                logger.info(f"Initialized {name} in {self._init_ms[name]:.1f}ms")
+            return self._instances[name]
+
+    def is_warm(self, name: str) -> bool:
+        return name in self._instances
+
+    async def warm_up(self):
+        """Build every registered service concurrently"""
+        results = await asyncio.gather(
+            *(run_in_threadpool(self.get, name) for name in self._factories),
+            return_exceptions=True
+        )
+        for name, result in zip(self._factories, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to initialize {name}: {result}")
+
+    @property
+    def ready(self) -> bool:
+        """
+        Startup finished and, unless services are built lazily, all of
+        them are warm. Never with several workers but no STATE_PATH, as
+        each would hold its own theses and subscriptions.
+        """
+        if not self.started or self._errors or not shared_state_ok():
+            return False
+        return settings.SERVICE_INIT_MODE == "lazy" or all(
+            self.is_warm(name) for name in self._factories
+        )
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Warm state, init time and last error per service"""
+        return {
+            name: {
+                "warm": self.is_warm(name),
+                "init_ms": round(self._init_ms[name], 2) if name in self._init_ms else None,
+                "error": self._errors.get(name)
+            }
+            for name in self._factories
+        }
+
+    def shutdown(self):
+        for instance in self._instances.values():
+            close = getattr(instance, "close", None)
+            if callable(close):
+                close()
+        self._instances.clear()
+        self._init_ms.clear()
+        self.started = False
+
+
+def worker_count() -> int:
+    """Worker processes serving the app, per WEB_CONCURRENCY (uvicorn, gunicorn)"""
+    try:
+        return int(os.environ.get("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+def shared_state_ok() -> bool:
+    """Registered theses and subscriptions are the same in every worker"""
+    return bool(settings.STATE_PATH) or worker_count() <= 1
+
+
+def state_records(name: str):
+    """Records file under STATE_PATH, or None to keep state per process"""
+    if not settings.STATE_PATH:
+        return None
+    from app.services.shared_records import SharedRecords
+    return SharedRecords(os.path.join(settings.STATE_PATH, f"{name}.json"))
+
+
+def model_weights(version: str):
+    """
+    ScoringWeights fitted by `python -m app.cli train` for a model
+    version, or None without a usable MODEL_PATH/<version>.npz artifact
+    """
+    path = os.path.join(settings.MODEL_PATH, f"{version}.npz")
+    if not os.path.exists(path):
+        return None
+    from app.models.linear_model import LinearModel
+
+    weights = LinearModel.load(path).scoring_weights()
+    if weights is None:
+        logger.warning(f"Model artifact {path} has no sub-score weights; using defaults")
+    else:
+        logger.info(f"Loaded scoring weights for {version} from {path}")
+    return weights
+
+
+def _scoring_service():
+    from app.services.scoring_service import ScoringService
+    return ScoringService(
+        drift_monitor=services.get("drift") if settings.DRIFT_MONITOR_ENABLED else None,
+        shadow=services.get("shadow"),
+        default_weights=model_weights(settings.ML_MODEL_VERSION),
+        founder_scores=services.get("founder_scores"),
+        store=services.get("shared_store")
+    )
+
+
+def _shared_store():
+    """Score store shared by the workers, or None when off"""
+    if not settings.SHARED_STORE_ENABLED:
+        return None
+    from app.services.shared_store import SharedScoreStore
+    return SharedScoreStore(
+        settings.SHARED_STORE_NAME, capacity=settings.SHARED_STORE_CAPACITY
+    )
+
+
+def _shadow_scorer():
+    """Candidate model re-scoring sampled traffic, or None when off"""
+    if not settings.SHADOW_MODEL_VERSION:
+        return None
+    from app.schemas.scoring_schema import ScoringWeights
+    from app.services.scoring_service import ScoringService
+    from app.services.shadow_scoring import ShadowScorer
+
+    weights = model_weights(settings.SHADOW_MODEL_VERSION)
+    if settings.SHADOW_WEIGHTS:
+        market, traction, team, financial = (
+            float(w) for w in settings.SHADOW_WEIGHTS.split(',')
+        )
+        weights = ScoringWeights(
+            market_weight=market, traction_weight=traction,
+            team_weight=team, financial_weight=financial
+        )
+    candidate = ScoringService(
+        model_version=settings.SHADOW_MODEL_VERSION, default_weights=weights
+    )
+    return ShadowScorer(
+        candidate,
+        sample_rate=settings.SHADOW_SAMPLE_RATE,
+        queue_size=settings.SHADOW_QUEUE_SIZE,
+        workers=settings.SHADOW_WORKERS
+    )
+
+
+def _drift_monitor():
+    from app.services.drift_monitor import DriftMonitor
+    return DriftMonitor()
+
+
+def _nlp_service():
+    from app.services.nlp_service import NLPService
+    return NLPService(store=state_records("theses"))
+
+
+def _percolator():
+    from app.services.percolator import Percolator
+    from app.services.tokenizer import Tokenizer
+    return Percolator(
+        Tokenizer(mode=settings.TOKENIZER_MODE), store=state_records("subscriptions")
+    )
+
+
+def _founder_evaluator():
+    from app.models.founder_evaluator import FounderEvaluator
+    return FounderEvaluator()
+
+
+def _founder_scores():
+    from app.services.founder_scores import FounderScoreCache
+    return FounderScoreCache(
+        services.get("founder"), max_size=settings.FOUNDER_CACHE_SIZE
+    )
+
+
+def _dedup_service():
+    from app.services.dedup_service import DedupService
+    return DedupService(
+        num_perm=settings.MINHASH_PERMUTATIONS,
+        bands=settings.LSH_BANDS,
+        threshold=settings.DEDUP_THRESHOLD
+    )
+
+
+def _response_cache():
+    from app.utils.http_cache import ResponseCache
+    return ResponseCache(
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+        min_compress_bytes=settings.COMPRESSION_MIN_BYTES
+    )
+
+
+services = ServiceContainer()
+services.register("drift", _drift_monitor)
+services.register("shadow", _shadow_scorer)
+services.register("shared_store", _shared_store)
+services.register("scoring", _scoring_service)
+services.register("nlp", _nlp_service)
+services.register("percolator", _percolator)
+services.register("founder", _founder_evaluator)
+services.register("founder_scores", _founder_scores)
+services.register("dedup", _dedup_service)
+services.register("response_cache", _response_cache)
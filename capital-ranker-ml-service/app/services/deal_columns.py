@@ -0,0 +1,430 @@
+# ============================================
+# app/services/deal_columns.py
+# Columnar Deal Representation for Batch Scoring
+# ============================================
+
+import io
+import zipfile
+import zlib
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import ValidationError
+
+from app.schemas.founder_schema import FounderData
+from app.schemas.scoring_schema import DealData
+
+STAGES = ('pre-seed', 'seed', 'series-a', 'series-b', 'series-c', 'growth')
+STAGE_CODES = {stage: code for code, stage in enumerate(STAGES)}
+UNKNOWN_STAGE = -1
+
+SECTORS = (
+    'fintech', 'healthtech', 'edtech', 'e-commerce', 'saas', 'ai-ml',
+    'blockchain', 'iot', 'cybersecurity', 'climate-tech', 'agritech',
+    'mobility', 'real-estate', 'logistics', 'hr-tech', 'martech',
+    'consumer', 'enterprise', 'devtools', 'other'
+)
+SECTOR_BITS = {sector: 1 << bit for bit, sector in enumerate(SECTORS)}
+
+TECH_HUBS = ('US', 'United States', 'UK', 'Singapore', 'India')
+
+NPZ_MEDIA_TYPE = "application/x-npz"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def sector_mask(sectors: Sequence[str]) -> int:
+    """Bitmask of known sectors; unknown sectors set no bits"""
+    mask = 0
+    for sector in sectors:
+        mask |= SECTOR_BITS.get(sector, 0)
+    return mask
+
+
+def is_tech_hub(country: str) -> bool:
+    """Country matches one of the tech hubs"""
+    country = country.lower()
+    return any(hub.lower() in country for hub in TECH_HUBS)
+
+
+def tech_hub_array(countries: np.ndarray) -> np.ndarray:
+    """Vectorized is_tech_hub over an array of country strings"""
+    lowered = np.char.lower(countries.astype(str))
+    hub = np.zeros(len(lowered), dtype=bool)
+    for name in TECH_HUBS:
+        hub |= np.char.find(lowered, name.lower()) >= 0
+    return hub
+
+
+@dataclass
+class DealColumns:
+    """
+    Deal data as one array per field
+
+    Optional metrics (gross_margin, customer_count) use NaN for missing.
+    Stages are coded by position in STAGES (-1 for unknown) and sectors
+    as a bitmask over SECTORS. `founder_score` is the mean overall
+    founder evaluation of the deal's founders, NaN without founders.
+    """
+    revenue: np.ndarray
+    growth_rate_mom: np.ndarray
+    growth_rate_yoy: np.ndarray
+    burn_rate: np.ndarray
+    runway_months: np.ndarray
+    gross_margin: np.ndarray
+    customer_count: np.ndarray
+    team_size: np.ndarray
+    stage: np.ndarray
+    sector_mask: np.ndarray
+    tech_hub: np.ndarray
+    founder_score: np.ndarray
+
+    FLOAT_FIELDS = (
+        'revenue', 'growth_rate_mom', 'growth_rate_yoy', 'burn_rate',
+        'runway_months', 'gross_margin', 'customer_count', 'team_size'
+    )
+    OPTIONAL_FIELDS = ('gross_margin', 'customer_count')
+
+    def __len__(self) -> int:
+        return len(self.revenue)
+
+    @classmethod
+    def from_deals(
+        cls,
+        deals: Sequence[DealData],
+        founder_score: Optional[np.ndarray] = None
+    ) -> "DealColumns":
+        """Build columns from validated deal objects"""
+        def optional(value) -> float:
+            return np.nan if value is None else value
+
+        return cls(
+            revenue=np.array([d.metrics.revenue for d in deals], dtype=np.float64),
+            growth_rate_mom=np.array(
+                [d.metrics.growth_rate_mom for d in deals], dtype=np.float64
+            ),
+            growth_rate_yoy=np.array(
+                [d.metrics.growth_rate_yoy for d in deals], dtype=np.float64
+            ),
+            burn_rate=np.array([d.metrics.burn_rate for d in deals], dtype=np.float64),
+            runway_months=np.array(
+                [d.metrics.runway_months for d in deals], dtype=np.float64
+            ),
+            gross_margin=np.array(
+                [optional(d.metrics.gross_margin) for d in deals], dtype=np.float64
+            ),
+            customer_count=np.array(
+                [optional(d.metrics.customer_count) for d in deals], dtype=np.float64
+            ),
+            team_size=np.array([d.team_size for d in deals], dtype=np.float64),
+            stage=np.array(
+                [STAGE_CODES.get(d.stage, UNKNOWN_STAGE) for d in deals], dtype=np.int8
+            ),
+            sector_mask=np.array(
+                [sector_mask(d.sector) for d in deals], dtype=np.uint32
+            ),
+            tech_hub=np.array(
+                [is_tech_hub(d.location.get('country', '')) for d in deals], dtype=bool
+            ),
+            founder_score=(
+                np.full(len(deals), np.nan) if founder_score is None
+                else np.asarray(founder_score, dtype=np.float64)
+            )
+        )
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Any],
+        team_scores: Optional[Callable[[Sequence[Sequence[FounderData]]], np.ndarray]] = None
+    ) -> Tuple["DealColumns", List[Dict[str, Any]]]:
+        """
+        Build columns from raw deal dicts without per-deal model objects
+
+        Values are coerced field by field; rows with missing or
+        malformed fields are reported in the returned error list and
+        left with placeholder values, to be dropped by the caller.
+        Range constraints are checked separately by `check`. Founder
+        profiles are validated and, with `team_scores`, turned into the
+        founder_score column in one call for the whole batch.
+        """
+        size = len(records)
+        columns = {name: np.zeros(size) for name in cls.FLOAT_FIELDS}
+        for name in cls.OPTIONAL_FIELDS:
+            columns[name][:] = np.nan
+        stage = np.full(size, UNKNOWN_STAGE, dtype=np.int8)
+        sectors = np.zeros(size, dtype=np.uint32)
+        tech_hub = np.zeros(size, dtype=bool)
+        teams: List[List[FounderData]] = [[] for _ in range(size)]
+        errors: List[Dict[str, Any]] = []
+
+        def fail(row: int, field: str, message: str):
+            errors.append({"row": row, "field": field, "message": message})
+
+        for row, record in enumerate(records):
+            if not isinstance(record, dict):
+                fail(row, "deal", "must be an object")
+                continue
+
+            missing = [f for f in REQUIRED_DEAL_FIELDS if f not in record]
+            for field in missing:
+                fail(row, field, "field required")
+
+            metrics = record.get("metrics", {})
+            if not isinstance(metrics, dict):
+                fail(row, "metrics", "must be an object")
+                metrics = {}
+
+            for name in cls.FLOAT_FIELDS:
+                source = record if name == "team_size" else metrics
+                value = source.get(name)
+                if value is None:
+                    continue
+                number = _coerce_number(value)
+                if number is None:
+                    fail(row, name, "must be a number")
+                else:
+                    columns[name][row] = number
+
+            if "stage" in record:
+                if isinstance(record["stage"], str):
+                    stage[row] = STAGE_CODES.get(record["stage"], UNKNOWN_STAGE)
+                else:
+                    fail(row, "stage", "must be a string")
+
+            if "sector" in record:
+                value = record["sector"]
+                if isinstance(value, list) and all(isinstance(v, str) for v in value):
+                    sectors[row] = sector_mask(value)
+                else:
+                    fail(row, "sector", "must be a list of strings")
+
+            if "location" in record:
+                value = record["location"]
+                if isinstance(value, dict):
+                    tech_hub[row] = is_tech_hub(str(value.get("country", "")))
+                else:
+                    fail(row, "location", "must be an object")
+
+            if record.get("founders"):
+                value = record["founders"]
+                try:
+                    if not isinstance(value, list):
+                        raise ValueError
+                    teams[row] = [FounderData.model_validate(f) for f in value]
+                except (ValidationError, ValueError):
+                    fail(row, "founders", "must be a list of founder profiles")
+
+            for field in ("name", "description", "founded_date"):
+                if field in record and not isinstance(record[field], str):
+                    fail(row, field, "must be a string")
+
+        return cls(
+            stage=stage,
+            sector_mask=sectors,
+            tech_hub=tech_hub,
+            founder_score=(
+                team_scores(teams) if team_scores is not None and any(teams)
+                else np.full(size, np.nan)
+            ),
+            **columns
+        ), errors
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "DealColumns":
+        """
+        Build columns from named arrays (an .npz bundle or Arrow table)
+
+        Required: revenue, runway_months, team_size and either stage
+        codes or stage_name strings. Other metrics default to 0 (or NaN
+        for optional ones); sectors come from sector_mask, tech hubs
+        from tech_hub or country strings and founder_score (precomputed
+        team scores, NaN for none) is optional.
+        """
+        for name in ('revenue', 'runway_months', 'team_size'):
+            if name not in arrays:
+                raise ValueError(f"Missing required column: {name}")
+
+        size = len(arrays['revenue'])
+        columns = {}
+        for name in cls.FLOAT_FIELDS:
+            if name in arrays:
+                column = np.asarray(arrays[name], dtype=np.float64)
+            else:
+                fill = np.nan if name in cls.OPTIONAL_FIELDS else 0.0
+                column = np.full(size, fill)
+            columns[name] = column
+
+        if 'stage' in arrays:
+            # Range-checked before the int8 cast, which would wrap 257 to 1;
+            # bad codes become len(STAGES) so `check` rejects the row
+            codes = np.asarray(arrays['stage'], dtype=np.float64)
+            known = (codes >= UNKNOWN_STAGE) & (codes < len(STAGES)) & (codes == np.round(codes))
+            columns['stage'] = np.where(known, codes, len(STAGES)).astype(np.int8)
+        elif 'stage_name' in arrays:
+            columns['stage'] = np.array(
+                [STAGE_CODES.get(str(s), UNKNOWN_STAGE) for s in arrays['stage_name']],
+                dtype=np.int8
+            )
+        else:
+            raise ValueError("Missing required column: stage or stage_name")
+
+        columns['sector_mask'] = np.asarray(
+            arrays.get('sector_mask', np.zeros(size)), dtype=np.uint32
+        )
+
+        if 'tech_hub' in arrays:
+            columns['tech_hub'] = np.asarray(arrays['tech_hub'], dtype=bool)
+        elif 'country' in arrays:
+            columns['tech_hub'] = tech_hub_array(np.asarray(arrays['country']))
+        else:
+            columns['tech_hub'] = np.zeros(size, dtype=bool)
+
+        columns['founder_score'] = np.asarray(
+            arrays.get('founder_score', np.full(size, np.nan)), dtype=np.float64
+        )
+
+        for name, column in columns.items():
+            if len(column) != size:
+                raise ValueError(
+                    f"Column {name} has {len(column)} rows, expected {size}"
+                )
+
+        return cls(**columns)
+
+    @classmethod
+    def from_npz(cls, payload: bytes) -> "DealColumns":
+        """Read columns from an .npz bundle"""
+        return cls.from_arrays(read_npz(payload))
+
+    @classmethod
+    def from_arrow(cls, payload: bytes) -> "DealColumns":
+        """Read columns from an Arrow IPC stream (requires pyarrow)"""
+        return cls.from_arrays(read_arrow(payload))
+
+    def check(
+        self,
+        parse_errors: Sequence[Dict[str, Any]] = ()
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """
+        Check the DealData/DealMetrics field constraints column-wise
+
+        Returns the row mask of violations and one error per failed
+        (row, field) pair. Rows with `parse_errors` from `from_records`
+        count as invalid; their placeholder values fail constraints too,
+        so only the parse error is reported for those fields.
+        """
+        invalid = np.zeros(len(self), dtype=bool)
+        errors: List[Dict[str, Any]] = []
+
+        for name, message, rule in COLUMN_CONSTRAINTS:
+            with np.errstate(invalid="ignore"):
+                failed = rule(getattr(self, name))
+            if failed.any():
+                invalid |= failed
+                errors.extend(
+                    {"row": row, "field": name, "message": message}
+                    for row in np.flatnonzero(failed).tolist()
+                )
+
+        if parse_errors:
+            reported = {(e["row"], e["field"]) for e in parse_errors}
+            broken_rows = {e["row"] for e in parse_errors if e["field"] == "deal"}
+            errors = [
+                e for e in errors
+                if (e["row"], e["field"]) not in reported and e["row"] not in broken_rows
+            ]
+            invalid[[e["row"] for e in parse_errors]] = True
+            errors.extend(parse_errors)
+
+        errors.sort(key=lambda e: e["row"])
+        return invalid, errors
+
+    def validate(self) -> np.ndarray:
+        """Row mask of constraint violations"""
+        return self.check()[0]
+
+    def take(self, rows: np.ndarray) -> "DealColumns":
+        """Subset of rows (index array or boolean mask)"""
+        return DealColumns(**{
+            f.name: getattr(self, f.name)[rows] for f in fields(self)
+        })
+
+
+def _coerce_number(value: Any) -> Optional[float]:
+    """Lax numeric coercion matching Pydantic: numbers and numeric strings"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _not_integer(column: np.ndarray) -> np.ndarray:
+    return np.isfinite(column) & (column % 1 != 0)
+
+
+# (field, message, violation mask) checked by DealColumns.check
+COLUMN_CONSTRAINTS: Tuple[Tuple[str, str, Callable[[np.ndarray], np.ndarray]], ...] = (
+    ('revenue', 'must be a finite number >= 0', lambda c: ~(c >= 0) | np.isinf(c)),
+    ('growth_rate_mom', 'must be a finite number', lambda c: ~np.isfinite(c)),
+    ('growth_rate_yoy', 'must be a finite number', lambda c: ~np.isfinite(c)),
+    ('burn_rate', 'must be a finite number >= 0', lambda c: ~(c >= 0) | np.isinf(c)),
+    ('runway_months', 'must be a finite number >= 0', lambda c: ~(c >= 0) | np.isinf(c)),
+    ('gross_margin', 'must be a finite number', np.isinf),
+    ('customer_count', 'must be an integer', lambda c: np.isinf(c) | _not_integer(c)),
+    ('team_size', 'must be an integer >= 1', lambda c: ~(c >= 1) | np.isinf(c) | _not_integer(c)),
+    ('stage', 'unknown stage code', lambda c: (c < UNKNOWN_STAGE) | (c >= len(STAGES))),
+    ('founder_score', 'must be between 0 and 100', lambda c: (c < 0) | (c > 100)),
+)
+
+REQUIRED_DEAL_FIELDS = (
+    'name', 'description', 'sector', 'stage', 'metrics',
+    'team_size', 'founded_date', 'location'
+)
+
+
+def read_npz(payload: bytes) -> Dict[str, np.ndarray]:
+    """
+    Load every array of an .npz bundle (pickled objects are refused)
+
+    Anything else, a bare .npy array included, is a ValueError.
+    """
+    # Local file header, or the end record of an empty archive
+    if payload[:4] not in (b'PK\x03\x04', b'PK\x05\x06'):
+        raise ValueError("Invalid .npz payload: not a zip archive")
+    try:
+        bundle = np.load(io.BytesIO(payload), allow_pickle=False)
+        if not isinstance(bundle, np.lib.npyio.NpzFile):
+            raise ValueError("not an .npz bundle")
+        with bundle:
+            return {name: bundle[name] for name in bundle.files}
+    except (zipfile.BadZipFile, OSError, KeyError, EOFError, zlib.error,
+            TypeError, ValueError) as e:
+        raise ValueError(f"Invalid .npz payload: {e}")
+
+
+def read_arrow(payload: bytes) -> Dict[str, np.ndarray]:
+    """Load every column of an Arrow IPC stream (requires pyarrow)"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError("Arrow IPC payloads require pyarrow to be installed")
+
+    table = pa.ipc.open_stream(payload).read_all()
+    return {
+        name: table.column(name).to_numpy(zero_copy_only=False)
+        for name in table.column_names
+    }
+
+
+def arrays_to_npz(arrays: Dict[str, np.ndarray]) -> bytes:
+    """Serialize named arrays as an uncompressed .npz bundle"""
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
@@ -0,0 +1,118 @@
+# ============================================
+# app/services/deal_files.py
+# Chunked Reading of Deal Files (CSV / JSONL)
+# ============================================
+
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.schemas.scoring_schema import DealMetrics
+
+FILE_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+# Flat CSV columns that go into the nested deal record
+METRIC_COLUMNS = tuple(DealMetrics.model_fields)
+LOCATION_COLUMNS = ('city', 'country')
+SECTOR_SEPARATORS = (';', '|')
+
+
+def file_format(path: str, fmt: Optional[str] = None) -> str:
+    """'csv' or 'jsonl', from `fmt` or the file extension"""
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(
+            f"Cannot tell the format of '{path}'; use .csv or .jsonl or pass the format"
+        )
+    return FILE_FORMATS[extension]
+
+
+def csv_record(row: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Deal record in the API's nested shape from a flat CSV row
+
+    Metric columns go into `metrics`, city/country into `location` and
+    `sector` is split on ';' or '|'. Empty cells count as missing; any
+    other column (ids, outcomes) is kept as is.
+    """
+    record: Dict[str, Any] = {}
+    metrics: Dict[str, str] = {}
+    location: Dict[str, str] = {}
+    for key, value in row.items():
+        if key is None or value is None or value == '':
+            continue
+        if key in METRIC_COLUMNS:
+            metrics[key] = value
+        elif key in LOCATION_COLUMNS:
+            location[key] = value
+        elif key == 'sector':
+            for separator in SECTOR_SEPARATORS:
+                value = value.replace(separator, ',')
+            record['sector'] = [s.strip() for s in value.split(',') if s.strip()]
+        else:
+            record[key] = value
+    record['metrics'] = metrics
+    if location:
+        record['location'] = location
+    return record
+
+
+def parse_line(line: str) -> Any:
+    """
+    Deal record of a JSONL line; None if it is not valid JSON, so row
+    numbers stay aligned and `DealColumns.from_records` reports it
+    """
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+def iter_records(
+    path: str,
+    fmt: Optional[str] = None,
+    start: int = 0,
+    parse: bool = True
+) -> Iterator[Any]:
+    """
+    Deal records of a file, from record number `start` on
+
+    With `parse=False` JSONL lines and CSV rows are yielded as read,
+    for `parse_line` or `csv_record` in another process.
+    """
+    fmt = file_format(path, fmt)
+    with open(path, newline='' if fmt == 'csv' else None, encoding='utf-8') as f:
+        if fmt == 'csv':
+            for row, values in enumerate(csv.DictReader(f)):
+                if row >= start:
+                    yield csv_record(values) if parse else values
+            return
+
+        row = 0
+        for line in f:
+            if not line.strip():
+                continue
+            if row >= start:
+                yield parse_line(line) if parse else line
+            row += 1
+
+
+def read_chunks(
+    path: str,
+    chunk_size: int,
+    fmt: Optional[str] = None,
+    start: int = 0,
+    parse: bool = True
+) -> Iterator[List[Any]]:
+    """Lists of at most `chunk_size` records; only one is held at a time"""
+    chunk: List[Any] = []
+    for record in iter_records(path, fmt, start, parse):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
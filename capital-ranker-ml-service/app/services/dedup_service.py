@@ -0,0 +1,255 @@
+# ============================================
+# app/services/dedup_service.py
+# Near-Duplicate Deal Detection (MinHash / LSH)
+# ============================================
+
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.services.tokenizer import Tokenizer
+from app.config.settings import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Company-form suffixes dropped from names before comparison
+LEGAL_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'gmbh', 'plc', 'pvt', 'private', 'sa', 'ag', 'bv'
+})
+
+EMPTY_SLOT = np.uint32(0xFFFFFFFF)
+
+# Shingles hashed per chunk when building signatures, bounding the
+# (permutations x shingles) scratch matrix
+SIGNATURE_CHUNK = 1 << 16
+
+
+@dataclass
+class DuplicateGroups:
+    """
+    Near-duplicate clusters of a batch
+
+    duplicate_of holds, for each duplicate, the lowest canonical row it
+    is at least threshold-similar to, or -1 for canonical rows;
+    similarity is the estimated Jaccard similarity to that row, so it
+    is never below the threshold. Clusters group each canonical row
+    with its duplicates.
+    """
+    duplicate_of: np.ndarray
+    similarity: np.ndarray
+    clusters: List[List[int]]
+
+    def duplicates(self) -> List[Dict[str, Any]]:
+        """One entry per non-canonical row"""
+        rows = np.flatnonzero(self.duplicate_of >= 0)
+        return [
+            {
+                "row": row,
+                "duplicate_of": int(self.duplicate_of[row]),
+                "similarity": round(float(self.similarity[row]), 4)
+            }
+            for row in rows.tolist()
+        ]
+
+
+class DedupService:
+    """
+    MinHash signatures over name and description shingles, with LSH
+    banding so candidate pairs come from shared buckets instead of an
+    all-pairs comparison
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        threshold: float = 0.8,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self.tokenizer = Tokenizer(mode=settings.TOKENIZER_MODE)
+
+        # Multiply-shift hash family: h(x) = (a * x + b) mod 2^64 >> 32
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) * 2 + 1
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def normalize_name(self, name: str) -> str:
+        """Casefolded name tokens without company-form suffixes"""
+        tokens = self.tokenizer.normalize(name).split()
+        return ' '.join(t for t in tokens if t not in LEGAL_SUFFIXES)
+
+    def shingles(self, name: str, description: str) -> np.ndarray:
+        """Hashed name, description term and term-bigram shingles"""
+        terms = self.tokenizer.tokenize(description)
+        shingles = set(terms)
+        shingles.update(f"{a} {b}" for a, b in zip(terms, terms[1:]))
+
+        normalized = self.normalize_name(name)
+        if normalized:
+            shingles.add(f"name:{normalized}")
+
+        return np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+
+    def signatures(
+        self,
+        names: Sequence[str],
+        descriptions: Sequence[str]
+    ) -> np.ndarray:
+        """
+        MinHash signature matrix, one uint32 row per deal
+
+        Deals without any shingle keep EMPTY_SLOT everywhere.
+        """
+        hashed = [self.shingles(n, d) for n, d in zip(names, descriptions)]
+        lengths = np.array([len(h) for h in hashed], dtype=np.int64)
+        signatures = np.full((len(hashed), self.num_perm), EMPTY_SLOT, dtype=np.uint32)
+        if not lengths.any():
+            return signatures
+
+        flat = np.concatenate(hashed)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        # Whole deals per chunk, so every minimum is taken within a chunk
+        start = 0
+        while start < len(hashed):
+            end = start + 1
+            while end < len(hashed) and offsets[end + 1] - offsets[start] <= SIGNATURE_CHUNK:
+                end += 1
+
+            rows = start + np.flatnonzero(lengths[start:end])
+            if len(rows):
+                values = flat[offsets[start]:offsets[end]]
+                hashes = ((self._a[:, None] * values + self._b[:, None]) >> 32).astype(np.uint32)
+                signatures[rows] = np.minimum.reduceat(
+                    hashes, offsets[rows] - offsets[start], axis=1
+                ).T
+            start = end
+
+        return signatures
+
+    def candidate_pairs(self, signatures: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        (leader, member) pairs of rows sharing a band bucket
+
+        Each bucket member is paired with the bucket's lowest row only,
+        keeping candidates linear in the batch size. This trades recall
+        for speed: two members of a bucket are not compared in that
+        band, so a pair is only found through a band where one of them
+        leads or through a chain of matches that `find_duplicates`
+        then re-checks.
+        """
+        width = self.rows_per_band
+        pairs = []
+        for band in range(self.bands):
+            keys = np.ascontiguousarray(
+                signatures[rows, band * width:(band + 1) * width]
+            ).view(np.dtype((np.void, 4 * width))).ravel()
+            _, bucket = np.unique(keys, return_inverse=True)
+
+            order = np.argsort(bucket, kind="stable")
+            sorted_buckets = bucket[order]
+            is_start = np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]]
+            leaders = order[np.flatnonzero(is_start)][np.cumsum(is_start) - 1]
+            shared = leaders != order
+            pairs.append(np.column_stack((rows[leaders[shared]], rows[order[shared]])))
+
+        if not pairs:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.unique(np.concatenate(pairs), axis=0)
+
+    def find_duplicates(
+        self,
+        names: Sequence[str],
+        descriptions: Sequence[str],
+        threshold: float = None
+    ) -> DuplicateGroups:
+        """
+        Cluster near-duplicate deals of a batch
+
+        Verified candidate pairs are chained into connected groups with
+        union-find. Chaining alone would attribute a row to a group root
+        it was never compared with (A~B and B~C, but not A~C), so within
+        each group rows are attributed in order to the first canonical
+        row they are threshold-similar to, and become canonical
+        themselves when there is none.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        size = len(names)
+        signatures = self.signatures(names, descriptions)
+
+        # Deals without content never match anything
+        rows = np.flatnonzero((signatures != EMPTY_SLOT).any(axis=1))
+        pairs = self.candidate_pairs(signatures, rows)
+        if len(pairs):
+            similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+            pairs = pairs[similarity >= threshold]
+
+        parent = np.arange(size)
+
+        def find(row: int) -> int:
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        for left, right in pairs.tolist():
+            left, right = find(left), find(right)
+            if left != right:
+                # Lowest row stays the root, i.e. the canonical deal
+                parent[max(left, right)] = min(left, right)
+
+        roots = np.array([find(row) for row in range(size)], dtype=np.int64)
+        groups: Dict[int, List[int]] = {}
+        for row in np.flatnonzero(np.bincount(roots, minlength=size)[roots] > 1).tolist():
+            groups.setdefault(int(roots[row]), []).append(row)
+
+        duplicate_of = np.full(size, -1, dtype=np.int64)
+        similarity = np.zeros(size)
+        for group in groups.values():
+            canonical = [group[0]]
+            for row in group[1:]:
+                matches = (signatures[canonical] == signatures[row]).mean(axis=1)
+                similar = np.flatnonzero(matches >= threshold)
+                if len(similar):
+                    duplicate_of[row] = canonical[similar[0]]
+                    similarity[row] = matches[similar[0]]
+                else:
+                    canonical.append(row)
+
+        duplicates = np.flatnonzero(duplicate_of >= 0)
+        clusters: Dict[int, List[int]] = {}
+        for row in duplicates.tolist():
+            clusters.setdefault(int(duplicate_of[row]), [int(duplicate_of[row])]).append(row)
+
+        logger.info(f"Found {len(duplicates)} near-duplicates among {size} deals")
+        return DuplicateGroups(
+            duplicate_of=duplicate_of,
+            similarity=similarity,
+            clusters=sorted(clusters.values())
+        )
+
+
+def deal_texts(records: Sequence[Any]) -> Tuple[List[str], List[str]]:
+    """Name and description of raw deal records, empty where missing"""
+    def text(record: Any, field: str) -> str:
+        value = record.get(field) if isinstance(record, dict) else None
+        return value if isinstance(value, str) else ""
+
+    return (
+        [text(r, "name") for r in records],
+        [text(r, "description") for r in records]
+    )
@@ -0,0 +1,275 @@
+# ============================================
+# app/services/drift_monitor.py
+# Streaming Feature and Score Drift Monitoring
+# ============================================
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.deal_columns import DealColumns, SECTORS, STAGES
+
+# Fixed bin edges, identical in every worker, so sketches merge by adding
+# counts. Heavy-tailed metrics use log-spaced edges.
+SCORE_EDGES = np.linspace(0, 100, 21)
+NUMERIC_EDGES: Dict[str, np.ndarray] = {
+    'revenue': np.concatenate(([0.0], np.logspace(3, 9, 25))),
+    'growth_rate_mom': np.linspace(-50, 100, 16),
+    'growth_rate_yoy': np.linspace(-100, 500, 25),
+    'burn_rate': np.concatenate(([0.0], np.logspace(3, 8, 21))),
+    'runway_months': np.linspace(0, 48, 25),
+    'gross_margin': np.linspace(-100, 100, 21),
+    'customer_count': np.concatenate(([0.0], np.logspace(0, 7, 29))),
+    'team_size': np.array(
+        [1, 2, 3, 5, 8, 13, 20, 30, 50, 100, 200, 500, 1000], dtype=float
+    ),
+    # Unknown stages (-1) land in the underflow bin
+    'stage': np.arange(len(STAGES)) - 0.5,
+}
+DRIFT_SCORES = (
+    'investment_fit_score', 'market_score', 'traction_score',
+    'team_score', 'financial_score'
+)
+
+# Population stability index thresholds
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+# Pseudo-count per bin so empty bins don't make the divergences infinite
+SMOOTHING = 0.5
+
+
+@dataclass(frozen=True)
+class Histogram:
+    """
+    Slice of the flat count vector holding one histogram
+
+    Numeric histograms have len(edges) + 1 bins (underflow, between
+    edges, overflow); sector counts one bin per sector, a deal adding
+    to every sector it is in. The slot after the bins counts missing
+    values (NaN, or no known sector).
+    """
+    name: str
+    kind: str  # "feature" or "score"
+    offset: int
+    bins: int
+    edges: Optional[np.ndarray] = None
+
+    @property
+    def missing(self) -> int:
+        return self.offset + self.bins
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "offset": self.offset,
+            "bins": self.bins,
+            "edges": None if self.edges is None else self.edges.tolist(),
+            "labels": list(SECTORS) if self.name == 'sector' else None
+        }
+
+
+def _layout() -> Tuple[List[Histogram], int]:
+    histograms = []
+    offset = 0
+    specs = [(name, 'feature', edges) for name, edges in NUMERIC_EDGES.items()]
+    specs.append(('sector', 'feature', None))
+    specs += [(name, 'score', SCORE_EDGES) for name in DRIFT_SCORES]
+    for name, kind, edges in specs:
+        bins = len(SECTORS) if edges is None else len(edges) + 1
+        histograms.append(Histogram(name, kind, offset, bins, edges))
+        offset += bins + 1
+    return histograms, offset
+
+
+class DriftMonitor:
+    """
+    Fixed-size histograms of every deal feature and sub-score
+
+    All histograms live in one int64 vector that every scored batch adds
+    to in place, so the cost per deal is constant and the retained
+    memory is fixed. A batch needs O(batch size) scratch for its bin
+    indexes (and a sector buffer kept at the largest batch seen), but
+    nothing the size of the count vector. Count vectors from several
+    workers add up to the sketch of all of them (`merge`), and the
+    current counts are compared against a reference snapshot
+    (population stability index, Jensen-Shannon divergence,
+    Kolmogorov-Smirnov distance over bins).
+    """
+
+    def __init__(self):
+        self.histograms, self.size = _layout()
+        self.counts = np.zeros(self.size, dtype=np.int64)
+        self.observations = 0
+        self.reference: Optional[np.ndarray] = None
+        self.reference_observations = 0
+        self._lock = threading.Lock()
+        # Reused for sector bit tests; grows to the largest batch
+        self._sector_scratch = np.zeros(0, dtype=np.uint32)
+
+    def layout(self) -> List[Dict[str, Any]]:
+        """Histogram positions in the count vector, for mergers"""
+        return [histogram.describe() for histogram in self.histograms]
+
+    def observe(self, columns: DealColumns, scores: Dict[str, np.ndarray]):
+        """Add a scored batch to the histograms"""
+        if not len(columns):
+            return
+
+        n = len(columns)
+        slots = []
+        sector = None
+        for histogram in self.histograms:
+            if histogram.edges is None:
+                sector = histogram
+                continue
+            values = (
+                scores[histogram.name] if histogram.kind == 'score'
+                else getattr(columns, histogram.name)
+            )
+            # NaN sorts past the last edge; send it to the missing slot
+            slot = np.searchsorted(histogram.edges, values, side='right')
+            if values.dtype.kind == 'f':
+                slot[np.isnan(values)] = histogram.bins
+            slots.append((histogram, slot))
+
+        masks = columns.sector_mask
+        with self._lock:
+            counts = self.counts
+            for histogram, slot in slots:
+                # Bins plus the missing slot, added straight into the slice
+                counts[histogram.offset:histogram.missing + 1] += np.bincount(
+                    slot, minlength=histogram.bins + 1
+                )
+
+            if len(self._sector_scratch) < n:
+                self._sector_scratch = np.zeros(n, dtype=np.uint32)
+            scratch = self._sector_scratch[:n]
+            present = int(np.bitwise_or.reduce(masks))
+            for bit in range(len(SECTORS)):
+                if not present >> bit & 1:
+                    continue
+                np.bitwise_and(masks, np.uint32(1 << bit), out=scratch)
+                counts[sector.offset + bit] += np.count_nonzero(scratch)
+            counts[sector.missing] += n - np.count_nonzero(masks)
+            self.observations += n
+
+    def merge(self, counts: np.ndarray, observations: int):
+        """Add another worker's sketch to the current counts"""
+        counts = self._check(counts)
+        with self._lock:
+            self.counts += counts
+            self.observations += observations
+
+    def snapshot(self) -> Tuple[np.ndarray, int]:
+        with self._lock:
+            return self.counts.copy(), self.observations
+
+    def set_reference(
+        self,
+        counts: Optional[np.ndarray] = None,
+        observations: int = 0,
+        reset: bool = True
+    ):
+        """
+        Compare against the given sketch, or the current counts when
+        none is given, optionally starting a new current window
+        """
+        with self._lock:
+            if counts is None:
+                counts, observations = self.counts.copy(), self.observations
+            self.reference = self._check(counts).copy()
+            self.reference_observations = observations
+            if reset:
+                self.counts[:] = 0
+                self.observations = 0
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Divergence of each histogram from the reference"""
+        current, _ = self.snapshot()
+        reference = self.reference
+        return [
+            {
+                "name": histogram.name,
+                "kind": histogram.kind,
+                **_histogram_drift(
+                    current[histogram.offset:histogram.missing + 1],
+                    None if reference is None
+                    else reference[histogram.offset:histogram.missing + 1],
+                    ordered=histogram.edges is not None
+                )
+            }
+            for histogram in self.histograms
+        ]
+
+    def _check(self, counts: np.ndarray) -> np.ndarray:
+        counts = np.asarray(counts, dtype=np.int64)
+        if counts.shape != (self.size,):
+            raise ValueError(
+                f"Sketch has {counts.size} counts, expected {self.size}"
+            )
+        if (counts < 0).any():
+            raise ValueError("Sketch counts must not be negative")
+        return counts
+
+
+def _histogram_drift(
+    current: np.ndarray,
+    reference: Optional[np.ndarray],
+    ordered: bool
+) -> Dict[str, Any]:
+    """
+    Counts, missing rates and divergences of one histogram; the last
+    slot of each count vector is the missing count
+    """
+    stats: Dict[str, Any] = {
+        "count": int(current[:-1].sum()),
+        "missing_rate": _missing_rate(current),
+        "reference_count": None,
+        "reference_missing_rate": None,
+        "psi": None,
+        "js_divergence": None,
+        "ks_statistic": None,
+        "status": "no-reference"
+    }
+    if reference is None:
+        return stats
+
+    stats["reference_count"] = int(reference[:-1].sum())
+    stats["reference_missing_rate"] = _missing_rate(reference)
+    if not current.sum() or not reference.sum():
+        stats["status"] = "insufficient-data"
+        return stats
+
+    q = (current + SMOOTHING) / (current.sum() + SMOOTHING * len(current))
+    p = (reference + SMOOTHING) / (
+        reference.sum() + SMOOTHING * len(reference)
+    )
+    psi = float(np.sum((q - p) * np.log(q / p)))
+    m = (p + q) / 2
+    js = float(
+        0.5 * np.sum(p * np.log2(p / m)) + 0.5 * np.sum(q * np.log2(q / m))
+    )
+
+    stats["psi"] = round(psi, 6)
+    stats["js_divergence"] = round(js, 6)
+    if ordered and current[:-1].sum() and reference[:-1].sum():
+        cdf_current = np.cumsum(current[:-1]) / current[:-1].sum()
+        cdf_reference = np.cumsum(reference[:-1]) / reference[:-1].sum()
+        stats["ks_statistic"] = round(
+            float(np.max(np.abs(cdf_current - cdf_reference))), 6
+        )
+    stats["status"] = (
+        "significant" if psi >= PSI_SIGNIFICANT
+        else "moderate" if psi >= PSI_MODERATE
+        else "stable"
+    )
+    return stats
+
+
+def _missing_rate(counts: np.ndarray) -> Optional[float]:
+    total = counts.sum()
+    return round(float(counts[-1] / total), 6) if total else None
@@ -1,13 +1,70 @@
 
 import numpy as np
 from datetime import datetime
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Sequence
+
+from app.services.deal_columns import DealColumns, STAGES, sector_mask
+from app.services.scoring_service import HIGH_GROWTH_SECTORS
+
+# Sub-scores of the rule-based scorer, scaled to 0-1; a linear model over
+# exactly these features yields ScoringWeights
+SUB_SCORE_FEATURES = ('market_score', 'traction_score', 'team_score', 'financial_score')
+
+# Column-wise versions of extract_features, plus the optional metrics
+COLUMN_FEATURES: Dict[str, Callable[[DealColumns], np.ndarray]] = {
+    'log_revenue': lambda c: np.log1p(c.revenue),
+    'growth_rate_yoy': lambda c: c.growth_rate_yoy / 100,
+    'growth_rate_mom': lambda c: c.growth_rate_mom / 100,
+    'runway': lambda c: c.runway_months / 24,
+    'burn_rate': lambda c: c.burn_rate / 100000,
+    'log_team_size': lambda c: np.log1p(c.team_size),
+    'log_customer_count': lambda c: np.log1p(np.nan_to_num(c.customer_count)),
+    'gross_margin': lambda c: np.nan_to_num(c.gross_margin) / 100,
+    'has_gross_margin': lambda c: (~np.isnan(c.gross_margin)).astype(np.float64),
+    'tech_hub': lambda c: c.tech_hub.astype(np.float64),
+    'high_growth_sector': lambda c: (
+        (c.sector_mask & sector_mask(HIGH_GROWTH_SECTORS)) != 0
+    ).astype(np.float64),
+    **{
+        f'stage_{stage}': (lambda code: lambda c: (c.stage == code).astype(np.float64))(code)
+        for code, stage in enumerate(STAGES)
+    }
+}
+ENGINEERED_FEATURES = tuple(COLUMN_FEATURES)
+
+FEATURE_SETS = {
+    'sub-scores': SUB_SCORE_FEATURES,
+    'engineered': ENGINEERED_FEATURES,
+    'all': SUB_SCORE_FEATURES + ENGINEERED_FEATURES
+}
 
 class FeatureEngineering:
     """
     Extract and engineer features from raw data
     """
     
+    def __init__(self, scoring_service=None):
+        # Needed for SUB_SCORE_FEATURES only
+        self.scoring_service = scoring_service
+    
+    def transform(self, columns: DealColumns, names: Sequence[str]) -> np.ndarray:
+        """
+        Feature matrix of a batch, one column per name in `names`
+        (SUB_SCORE_FEATURES or COLUMN_FEATURES)
+        """
+        matrix = np.empty((len(columns), len(names)), dtype=np.float64)
+        scores = None
+        for j, name in enumerate(names):
+            if name in SUB_SCORE_FEATURES:
+                if scores is None:
+                    scores = self.scoring_service.score_columns(columns)
+                matrix[:, j] = scores[name] / 100
+            elif name in COLUMN_FEATURES:
+                matrix[:, j] = COLUMN_FEATURES[name](columns)
+            else:
+                raise ValueError(f"Unknown feature '{name}'")
+        return matrix
+    
     def extract_features(self, deal_data: Dict[str, Any]) -> np.ndarray:
         """
         Extract numerical features from deal data
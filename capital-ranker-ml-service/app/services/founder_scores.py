@@ -0,0 +1,86 @@
+# ============================================
+# app/services/founder_scores.py
+# Cache of Founder Evaluations for Deal Scoring
+# ============================================
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from app.schemas.founder_schema import FounderData, FounderEvaluationResponse
+from app.utils.single_flight import canonical_key
+
+
+def profile_hash(founder: FounderData) -> str:
+    """Stable hash of a founder profile, independent of key order"""
+    return canonical_key(founder)
+
+
+class FounderScoreCache:
+    """
+    Bounded LRU cache of founder evaluations keyed by profile hash
+
+    A founder who appears on many deals is evaluated once. Lookups for
+    a batch collect every profile missing from the cache and evaluate
+    them in one pass outside the lock, so concurrent batches never
+    wait on each other's evaluations.
+    """
+
+    def __init__(self, evaluator, max_size: int = 10000):
+        self.evaluator = evaluator
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, FounderEvaluationResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate_many(
+        self,
+        founders: Sequence[FounderData]
+    ) -> List[FounderEvaluationResponse]:
+        """Evaluations of the given profiles, from the cache where possible"""
+        keys = [profile_hash(founder) for founder in founders]
+        found: Dict[str, FounderEvaluationResponse] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = entry
+
+        missing = {
+            key: founder for key, founder in zip(keys, founders) if key not in found
+        }
+        evaluated = self.evaluator.evaluate_batch(list(missing.values()))
+        found.update(zip(missing, evaluated))
+
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+            for key, entry in zip(missing, evaluated):
+                self._entries[key] = entry
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+        return [found[key] for key in keys]
+
+    def evaluate(self, founder: FounderData) -> FounderEvaluationResponse:
+        return self.evaluate_many([founder])[0]
+
+    def team_scores(self, teams: Sequence[Sequence[FounderData]]) -> np.ndarray:
+        """Mean overall founder score per team; NaN for teams without founders"""
+        founders = [founder for team in teams for founder in team]
+        overall = np.array(
+            [e.founder_score.overall_score for e in self.evaluate_many(founders)],
+            dtype=np.float64
+        )
+        sizes = np.array([len(team) for team in teams], dtype=np.int64)
+        owners = np.repeat(np.arange(len(teams)), sizes)
+        totals = np.bincount(owners, weights=overall, minlength=len(teams))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(sizes > 0, totals / sizes, np.nan)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,74 +3,198 @@
 # NLP Service for Thesis Matching
 # ============================================
 
-from typing import List, Tuple
-import re
+from typing import List, Optional, Sequence, Tuple
+import threading
+import numpy as np
 from collections import Counter
 from app.schemas.thesis_schema import (
     ThesisMatchResponse,
     SimilarityBreakdown,
-    MatchedSection
+    MatchedSection,
+    ThesisRank
 )
+from app.services.bm25 import BM25Index
+from app.services.sentence_index import SentenceIndex, pairwise_similarity
+from app.services.shared_records import SharedRecords
+from app.services.taxonomy import TaxonomyMatcher
+from app.services.thesis_cache import PreparedThesis, ThesisCache, ThesisChanged, content_hash
+from app.services.tokenizer import Tokenizer
+from app.config.settings import settings
+from app.utils.deadline import check_deadline
 from app.utils.logger import setup_logger
 
 logger = setup_logger()
 
+EMBEDDING_DIM = 128
+
+STAGE_ORDER = ['pre-seed', 'seed', 'series-a', 'series-b', 'series-c']
+
+# Relevancy weights for structured matches; the rest goes to semantic
+SECTOR_WEIGHT = 0.25
+STAGE_WEIGHT = 0.15
+
 class NLPService:
     """
     NLP service for text analysis and matching
     Simple implementation without heavy ML libraries
     """
     
-    def __init__(self):
-        self.stop_words = set([
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-            'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-            'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that',
-            'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
-        ])
+    def __init__(self, store: Optional[SharedRecords] = None):
+        self.tokenizer = Tokenizer(mode=settings.TOKENIZER_MODE)
+        self.taxonomy = TaxonomyMatcher(self.tokenizer)
+        self.theses = ThesisCache(
+            self.prepare_thesis,
+            max_size=settings.THESIS_CACHE_SIZE,
+            store=store
+        )
+        self._corpus = None
+        self._corpus_lock = threading.Lock()
         logger.info("NLP service initialized")
     
+    def prepare_thesis(
+        self,
+        thesis_id: str,
+        thesis_text: str,
+        sectors: Sequence[str] = (),
+        stages: Sequence[str] = ()
+    ) -> PreparedThesis:
+        """
+        Preprocess, extract keywords and vectorize a thesis once
+        """
+        thesis_clean = self._preprocess_text(thesis_text)
+        mentions = self.taxonomy.match(thesis_text)
+        
+        return PreparedThesis(
+            thesis_id=thesis_id,
+            content_hash=content_hash(thesis_text, sectors, stages),
+            text=thesis_text,
+            clean_text=thesis_clean,
+            keywords=self._extract_keywords(thesis_clean),
+            term_counts=Counter(self._filter_terms(thesis_clean)),
+            sentence_index=SentenceIndex(thesis_text, self._tokenize),
+            sectors=tuple(sectors),
+            stages=tuple(stages),
+            text_sectors=mentions.top_sectors(),
+            text_stages=tuple(mentions.stages)
+        )
+    
+    def register_thesis(
+        self,
+        thesis_id: str,
+        thesis_text: str,
+        sectors: Sequence[str] = (),
+        stages: Sequence[str] = ()
+    ) -> Tuple[PreparedThesis, bool]:
+        """
+        Cache the prepared form of a thesis under its ID
+        """
+        return self.theses.register(thesis_id, thesis_text, sectors, stages)
+    
+    def _corpus_index(self) -> Tuple[BM25Index, List[PreparedThesis]]:
+        """BM25 index over registered theses, rebuilt when they change"""
+        with self._corpus_lock:
+            version = self.theses.version
+            if self._corpus is None or self._corpus[0] != version:
+                theses = self.theses.values()
+                index = BM25Index([t.term_counts for t in theses])
+                self._corpus = (version, index, theses)
+            return self._corpus[1], self._corpus[2]
+    
     def match_thesis(
         self,
         pitch_text: str,
-        thesis_text: str
+        thesis_text: Optional[str] = None,
+        thesis_id: Optional[str] = None,
+        pitch_sectors: Sequence[str] = (),
+        pitch_stage: Optional[str] = None,
+        thesis_sectors: Sequence[str] = (),
+        thesis_stages: Sequence[str] = (),
+        thesis_content_hash: Optional[str] = None
     ) -> ThesisMatchResponse:
         """
         Match investor thesis with startup pitch
+        
+        The thesis is given either as raw text or as the ID of a
+        registered thesis. Given both, the text (with the thesis
+        sectors and stages) is registered under the ID unless it
+        already is, so any worker can answer. Sector and stage matches
+        use the structured fields when both sides provide them. With
+        `thesis_content_hash` a registered thesis whose content has
+        since changed raises ThesisChanged, so the caller registers it
+        again.
         """
-        # Preprocess texts
+        if thesis_id is not None and thesis_text is not None:
+            thesis, _ = self.register_thesis(
+                thesis_id, thesis_text, thesis_sectors, thesis_stages
+            )
+        elif thesis_id is not None:
+            thesis = self.theses.get(thesis_id)
+            if thesis is None:
+                raise KeyError(f"Thesis '{thesis_id}' is not registered")
+            if thesis_content_hash is not None and thesis.content_hash != thesis_content_hash:
+                raise ThesisChanged(
+                    f"Thesis '{thesis_id}' is registered with different content; register it again"
+                )
+        elif thesis_text is not None:
+            thesis = self.prepare_thesis("", thesis_text)
+        else:
+            raise ValueError("Either thesis_text or thesis_id is required")
+        
+        # Preprocess pitch
+        check_deadline("preprocess")
         pitch_clean = self._preprocess_text(pitch_text)
-        thesis_clean = self._preprocess_text(thesis_text)
+        pitch_terms = self._filter_terms(pitch_clean)
         
         # Extract keywords
+        check_deadline("keyword_extraction")
         pitch_keywords = self._extract_keywords(pitch_clean)
-        thesis_keywords = self._extract_keywords(thesis_clean)
+        thesis_keywords = thesis.keywords
         
         # Find matched keywords
         matched = set(pitch_keywords) & set(thesis_keywords)
         matched_keywords = list(matched)[:10]  # Top 10
         
-        # Calculate semantic similarity (simple word overlap)
-        semantic_sim = self._calculate_similarity(
-            pitch_keywords,
-            thesis_keywords
+        # Calculate semantic similarity (BM25 against the thesis corpus)
+        check_deadline("similarity")
+        index, corpus = self._corpus_index()
+        position = next(
+            (i for i, t in enumerate(corpus) if t is thesis), None
+        )
+        if position is not None:
+            semantic_sim = float(index.normalized_scores(pitch_terms)[position])
+        else:
+            semantic_sim = index.score_external(pitch_terms, thesis.term_counts)
+        
+        # Sector and stage matches from the structured fields, or the
+        # taxonomy terms found in the texts where those are missing
+        check_deadline("structured_match")
+        pitch_sectors, pitch_stage = self._pitch_taxonomy(
+            pitch_text, pitch_sectors, pitch_stage
+        )
+        sector_sim = self._sector_match(
+            pitch_sectors, thesis_sectors or thesis.sectors or thesis.text_sectors
+        )
+        stage_sim = self._stage_match(
+            pitch_stage, thesis_stages or thesis.stages or thesis.text_stages
         )
         
         # Calculate relevancy score
-        relevancy = semantic_sim * 100
+        relevancy = self._combine_relevancy(semantic_sim, sector_sim, stage_sim)
         
-        # Create similarity breakdown
+        # Create similarity breakdown; with neither structured data nor
+        # taxonomy terms the sector and stage components fall back to
+        # text similarity
         breakdown = SimilarityBreakdown(
-            sector_match=semantic_sim * 100,
-            stage_match=semantic_sim * 100,
+            sector_match=(semantic_sim if sector_sim is None else sector_sim) * 100,
+            stage_match=(semantic_sim if stage_sim is None else stage_sim) * 100,
             semantic_similarity=semantic_sim * 100
         )
         
         # Find matched sections
+        check_deadline("section_matching")
         matched_sections = self._find_matched_sections(
             pitch_text,
-            thesis_text,
+            thesis.sentence_index,
             matched_keywords
         )
         
@@ -81,88 +205,187 @@ class NLPService:
             matched_sections=matched_sections
         )
     
-    def _preprocess_text(self, text: str) -> str:
-        """Clean and preprocess text"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters
-        text = re.sub(r'[^a-z0-9\s]', ' ', text)
+    def rank_theses(
+        self,
+        pitch_text: str,
+        top_k: int = 10,
+        pitch_sectors: Sequence[str] = (),
+        pitch_stage: Optional[str] = None
+    ) -> List[ThesisRank]:
+        """
+        Score a pitch against every registered thesis in one pass
+        """
+        pitch_terms = self._tokenize(pitch_text)
+        pitch_sectors, pitch_stage = self._pitch_taxonomy(
+            pitch_text, pitch_sectors, pitch_stage
+        )
+        index, corpus = self._corpus_index()
+        semantic = index.normalized_scores(pitch_terms)
         
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+        ranks = []
+        for thesis, semantic_sim in zip(corpus, semantic.tolist()):
+            relevancy = self._combine_relevancy(
+                semantic_sim,
+                self._sector_match(pitch_sectors, thesis.sectors or thesis.text_sectors),
+                self._stage_match(pitch_stage, thesis.stages or thesis.text_stages)
+            )
+            ranks.append(ThesisRank(
+                thesis_id=thesis.thesis_id,
+                relevancy_score=round(relevancy, 2),
+                semantic_similarity=round(semantic_sim * 100, 2)
+            ))
         
-        return text
+        ranks.sort(key=lambda r: r.relevancy_score, reverse=True)
+        return ranks[:top_k]
     
-    def _extract_keywords(self, text: str, top_n: int = 20) -> List[str]:
-        """Extract important keywords from text"""
-        # Split into words
-        words = text.split()
-        
-        # Remove stop words
-        words = [w for w in words if w not in self.stop_words and len(w) > 3]
+    def _pitch_taxonomy(
+        self,
+        pitch_text: str,
+        pitch_sectors: Sequence[str],
+        pitch_stage: Optional[str]
+    ) -> Tuple[Sequence[str], Optional[str]]:
+        """Structured pitch sectors and stage, else those the text mentions most"""
+        if pitch_sectors and pitch_stage:
+            return pitch_sectors, pitch_stage
+        mentions = self.taxonomy.match(pitch_text)
+        return (
+            pitch_sectors or mentions.top_sectors(),
+            pitch_stage or mentions.top_stage()
+        )
+    
+    def _sector_match(
+        self,
+        pitch_sectors: Sequence[str],
+        thesis_sectors: Sequence[str]
+    ) -> Optional[float]:
+        """Share of the smaller sector list covered by the other one"""
+        if not pitch_sectors or not thesis_sectors:
+            return None
         
-        # Count word frequency
-        word_freq = Counter(words)
+        pitch_set = {s.lower() for s in pitch_sectors}
+        thesis_set = {s.lower() for s in thesis_sectors}
+        return len(pitch_set & thesis_set) / min(len(pitch_set), len(thesis_set))
+    
+    def _stage_match(
+        self,
+        pitch_stage: Optional[str],
+        thesis_stages: Sequence[str]
+    ) -> Optional[float]:
+        """Full match for a targeted stage, half credit per stage away"""
+        if not pitch_stage or not thesis_stages:
+            return None
         
-        # Get top N keywords
-        keywords = [word for word, _ in word_freq.most_common(top_n)]
+        stage = pitch_stage.lower()
+        targets = {s.lower() for s in thesis_stages}
+        if stage in targets:
+            return 1.0
+        if stage not in STAGE_ORDER:
+            return 0.0
         
-        return keywords
+        distances = [
+            abs(STAGE_ORDER.index(stage) - STAGE_ORDER.index(t))
+            for t in targets if t in STAGE_ORDER
+        ]
+        if not distances:
+            return 0.0
+        return max(0.0, 1.0 - 0.5 * min(distances))
     
-    def _calculate_similarity(
+    def _combine_relevancy(
         self,
-        keywords1: List[str],
-        keywords2: List[str]
+        semantic: float,
+        sector: Optional[float],
+        stage: Optional[float]
     ) -> float:
         """
-        Calculate Jaccard similarity between two keyword lists
+        Weighted relevancy (0-100); missing components hand their
+        weight to the semantic similarity
         """
-        set1 = set(keywords1)
-        set2 = set(keywords2)
+        score = 0.0
+        semantic_weight = 1.0
+        for value, weight in ((sector, SECTOR_WEIGHT), (stage, STAGE_WEIGHT)):
+            if value is not None:
+                score += value * weight
+                semantic_weight -= weight
         
-        if not set1 or not set2:
-            return 0.0
+        return (score + semantic * semantic_weight) * 100
+    
+    def _preprocess_text(self, text: str) -> str:
+        """Clean and preprocess text"""
+        return self.tokenizer.normalize(text)
+    
+    def _filter_terms(self, text: str) -> List[str]:
+        """Split preprocessed text and drop stop words and short tokens"""
+        return self.tokenizer.filter(text)
+    
+    def _tokenize(self, text: str) -> List[str]:
+        """Preprocess raw text into content terms"""
+        return self.tokenizer.tokenize(text)
+    
+    def _extract_keywords(self, text: str, top_n: int = 20) -> List[str]:
+        """Extract important keywords from text"""
+        # Split into words and remove stop words
+        words = self._filter_terms(text)
         
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
+        # Count word frequency
+        word_freq = Counter(words)
+        
+        # Get top N keywords
+        keywords = [word for word, _ in word_freq.most_common(top_n)]
         
-        return intersection / union if union > 0 else 0.0
+        return keywords
     
     def _find_matched_sections(
         self,
         pitch: str,
-        thesis: str,
+        thesis_index: SentenceIndex,
         keywords: List[str]
     ) -> List[MatchedSection]:
         """
         Find text sections that contain matched keywords
         """
-        sections = []
+        pitch_index = SentenceIndex(pitch, self._tokenize)
         
-        # Split into sentences
-        pitch_sentences = re.split(r'[.!?]+', pitch)
-        thesis_sentences = re.split(r'[.!?]+', thesis)
-        
-        # Find sentences with keywords
+        # Candidate sentences per keyword, found by postings lookup
+        candidates = []
         for keyword in keywords[:5]:  # Top 5 keywords
-            # Find in pitch
-            pitch_matches = [s.strip() for s in pitch_sentences 
-                           if keyword.lower() in s.lower()]
+            pitch_ids = pitch_index.lookup(keyword)
+            thesis_ids = thesis_index.lookup(keyword)
+            if pitch_ids and thesis_ids:
+                candidates.append((pitch_ids, thesis_ids))
+        
+        if not candidates:
+            return []
+        
+        # Score all candidate sentence pairs in one batched operation
+        pitch_ids = sorted({i for ids, _ in candidates for i in ids})
+        thesis_ids = sorted({i for _, ids in candidates for i in ids})
+        similarity = pairwise_similarity(
+            pitch_index, pitch_ids, thesis_index, thesis_ids
+        )
+        pitch_rows = {sentence_id: row for row, sentence_id in enumerate(pitch_ids)}
+        thesis_cols = {sentence_id: col for col, sentence_id in enumerate(thesis_ids)}
+        
+        sections = []
+        for keyword_pitch_ids, keyword_thesis_ids in candidates:
+            rows = [pitch_rows[i] for i in keyword_pitch_ids]
+            cols = [thesis_cols[i] for i in keyword_thesis_ids]
+            block = similarity[np.ix_(rows, cols)]
+            row, col = np.unravel_index(int(np.argmax(block)), block.shape)
+            best = block[row, col]
+            if best < 0:
+                continue  # Every pair already reported for an earlier keyword
+            
+            # Don't report the same sentence pair twice
+            similarity[rows[row], cols[col]] = -1.0
             
-            # Find in thesis
-            thesis_matches = [s.strip() for s in thesis_sentences 
-                            if keyword.lower() in s.lower()]
+            sections.append(MatchedSection(
+                thesis_section=thesis_index.sentences[keyword_thesis_ids[col]][:200],
+                pitch_section=pitch_index.sentences[keyword_pitch_ids[row]][:200],
+                similarity=round(float(best), 4)
+            ))
             
-            if pitch_matches and thesis_matches:
-                sections.append(MatchedSection(
-                    thesis_section=thesis_matches[0][:200],
-                    pitch_section=pitch_matches[0][:200],
-                    similarity=0.8
-                ))
-                
-                if len(sections) >= 3:  # Limit to 3 sections
-                    break
+            if len(sections) >= 3:  # Limit to 3 sections
+                break
         
         return sections
     
@@ -171,24 +394,30 @@ class NLPService:
         Generate simple text embedding (word frequency based)
         For production, use sentence-transformers or OpenAI embeddings
         """
-        # Preprocess
-        clean_text = self._preprocess_text(text)
-        keywords = self._extract_keywords(clean_text, top_n=50)
+        return self.generate_embeddings([text])[0].tolist()
+    
+    def generate_embeddings(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Generate embeddings for many texts as one float32 matrix
+        """
+        embeddings = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
         
-        # Create frequency vector (simplified 128-dim embedding)
-        word_freq = Counter(keywords)
-        max_freq = max(word_freq.values()) if word_freq else 1
+        for row, text in enumerate(texts):
+            # Preprocess
+            clean_text = self._preprocess_text(text)
+            keywords = self._extract_keywords(clean_text, top_n=50)
+            
+            # Frequency vector over the keyword slots
+            word_freq = Counter(keywords)
+            slots = keywords[:EMBEDDING_DIM]
+            embeddings[row, :len(slots)] = [word_freq[k] for k in slots]
         
-        # Normalize frequencies to create embedding
-        embedding = []
-        for i in range(128):
-            if i < len(keywords):
-                freq = word_freq.get(keywords[i], 0)
-                embedding.append(freq / max_freq)
-            else:
-                embedding.append(0.0)
+        # Normalize each row by its maximum frequency
+        max_freq = embeddings.max(axis=1, keepdims=True)
+        max_freq[max_freq == 0] = 1.0
+        embeddings /= max_freq
         
-        return embedding
+        return embeddings
 
 # ============================================
 # app/models/founder_evaluator.py
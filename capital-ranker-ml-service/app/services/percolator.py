@@ -0,0 +1,384 @@
+# ============================================
+# app/services/percolator.py
+# Thesis Subscriptions Matched Against Incoming Deals
+# ============================================
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, astuple, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.deal_columns import SECTOR_BITS, STAGE_CODES, sector_mask
+from app.services.shared_records import Records, SharedRecords
+from app.services.tokenizer import Tokenizer
+from app.utils.single_flight import canonical_key
+
+# Upper bound on the (deals, subscriptions) cells evaluated at once
+MAX_CELLS = 1 << 20
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """
+    Saved thesis conditions a deal must meet to trigger an alert
+
+    Every required term must appear in the deal text. Relevancy is the
+    share of optional terms that appear (100 without optional terms).
+    Empty sector/stage lists and a None `min_score` match anything.
+    """
+    subscription_id: str
+    required_terms: Tuple[str, ...] = ()
+    optional_terms: Tuple[str, ...] = ()
+    sectors: Tuple[str, ...] = ()
+    stages: Tuple[str, ...] = ()
+    min_relevancy: float = 0.0
+    min_score: Optional[float] = None
+
+
+@dataclass
+class PercolatorIndex:
+    """
+    Subscriptions compiled into term postings and constraint arrays
+
+    Postings are CSR: the subscriptions holding term `t` are
+    `postings[ptr[t]:ptr[t + 1]]`.
+    """
+    subscriptions: List[Subscription]
+    vocabulary: Dict[str, int]
+    required_ptr: np.ndarray
+    required_postings: np.ndarray
+    optional_ptr: np.ndarray
+    optional_postings: np.ndarray
+    required_count: np.ndarray
+    optional_count: np.ndarray
+    sector_mask: np.ndarray
+    stage_mask: np.ndarray
+    min_relevancy: np.ndarray
+    min_score: np.ndarray
+
+    @property
+    def needs_score(self) -> bool:
+        """Some subscription has a score threshold"""
+        return bool((~np.isnan(self.min_score)).any())
+
+
+def _postings(
+    lists: Sequence[Sequence[int]],
+    vocabulary_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR postings from the term IDs of each subscription"""
+    terms = np.array([t for terms in lists for t in terms], dtype=np.int64)
+    owners = np.repeat(
+        np.arange(len(lists), dtype=np.int64), [len(terms) for terms in lists]
+    )
+    order = np.argsort(terms, kind='stable')
+    ptr = np.zeros(vocabulary_size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(terms, minlength=vocabulary_size), out=ptr[1:])
+    return ptr, owners[order]
+
+
+def _gather(
+    ptr: np.ndarray,
+    postings: np.ndarray,
+    rows: np.ndarray,
+    terms: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(row, subscription) pairs for every posting of the (row, term) pairs"""
+    starts = ptr[terms]
+    lengths = ptr[terms + 1] - starts
+    total = int(lengths.sum())
+    # Position within each posting list, offset by its start
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(rows, lengths), postings[np.repeat(starts, lengths) + offsets]
+
+
+class Percolator:
+    """
+    Match deals against every saved thesis subscription in one pass
+
+    Instead of matching each deal with each thesis, subscriptions are
+    compiled once (and again only after they change) into postings from
+    term to subscriptions plus arrays of sector/stage bitmasks and
+    thresholds. A batch of deals is then tokenized once, its terms look
+    up their postings and the hit counts and constraints of all
+    subscriptions are evaluated as (deals, subscriptions) arrays.
+
+    With a `store`, subscriptions live in a file shared by all workers:
+    changes are written there and every worker reloads it (and
+    recompiles) before matching once another worker has changed it, so
+    each worker percolates against, and fingerprints, the same set.
+    Without one they are held by this process only.
+    """
+
+    def __init__(self, tokenizer: Tokenizer, store: Optional[SharedRecords] = None):
+        self.tokenizer = tokenizer
+        self.store = store
+        self._subscriptions: "OrderedDict[str, Subscription]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._index: Optional[PercolatorIndex] = None
+        self._index_version = -1
+        self._fingerprint: Tuple[int, str] = (-1, "")
+        # Bumped on every change so the index knows to recompile
+        self.version = 0
+        if store is not None:
+            self._apply(store.load())
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._subscriptions)
+
+    def _apply(self, records: Records):
+        """Replace the subscriptions with those of the shared store"""
+        self._subscriptions = OrderedDict(
+            (subscription_id, Subscription(**{
+                field: tuple(value) if isinstance(value, list) else value
+                for field, value in record.items()
+            }))
+            for subscription_id, record in records.items()
+        )
+        self.version += 1
+
+    def _sync(self):
+        """Reload the shared store if another worker changed it (lock held)"""
+        if self.store is not None and self.store.changed():
+            self._apply(self.store.load())
+
+    def terms(self, phrases: Sequence[str]) -> Tuple[str, ...]:
+        """
+        Distinct index terms of the given phrases; a phrase of several
+        words contributes each of them
+        """
+        terms: Dict[str, None] = {}
+        for phrase in phrases:
+            tokens = self.tokenizer.tokenize(phrase)
+            if not tokens:
+                raise ValueError(
+                    f"Term '{phrase}' has no searchable words "
+                    f"(stop words and words under {self.tokenizer.min_length} characters are ignored)"
+                )
+            terms.update(dict.fromkeys(tokens))
+        return tuple(terms)
+
+    def subscribe(
+        self,
+        subscription_id: str,
+        required_terms: Sequence[str] = (),
+        optional_terms: Sequence[str] = (),
+        sectors: Sequence[str] = (),
+        stages: Sequence[str] = (),
+        min_relevancy: float = 0.0,
+        min_score: Optional[float] = None
+    ) -> Subscription:
+        """Add or replace a subscription"""
+        sectors = tuple(s.lower() for s in sectors)
+        stages = tuple(s.lower() for s in stages)
+        unknown = [s for s in sectors if s not in SECTOR_BITS]
+        unknown += [s for s in stages if s not in STAGE_CODES]
+        if unknown:
+            raise ValueError(f"Unknown sectors or stages: {', '.join(unknown)}")
+
+        required = self.terms(required_terms)
+        subscription = Subscription(
+            subscription_id=subscription_id,
+            required_terms=required,
+            optional_terms=tuple(
+                t for t in self.terms(optional_terms) if t not in required
+            ),
+            sectors=sectors,
+            stages=stages,
+            min_relevancy=min_relevancy,
+            min_score=min_score
+        )
+        with self._lock:
+            if self.store is not None:
+                def save(records: Records) -> bool:
+                    records[subscription_id] = asdict(subscription)
+                    return True
+                self._apply(self.store.update(save)[0])
+            else:
+                self._subscriptions[subscription_id] = subscription
+                self.version += 1
+        return subscription
+
+    def unsubscribe(self, subscription_id: str) -> bool:
+        with self._lock:
+            if self.store is not None:
+                def delete(records: Records) -> bool:
+                    return records.pop(subscription_id, None) is not None
+                records, removed = self.store.update(delete)
+                # Applied either way: the file was re-read for the update
+                self._apply(records)
+                return removed
+            if self._subscriptions.pop(subscription_id, None) is None:
+                return False
+            self.version += 1
+            return True
+
+    def fingerprint(self) -> str:
+        """
+        Hash of the saved subscriptions (in order, which breaks ties in
+        results), recomputed only after changes
+        """
+        with self._lock:
+            self._sync()
+            if self._fingerprint[0] != self.version:
+                self._fingerprint = (self.version, canonical_key(
+                    [astuple(s) for s in self._subscriptions.values()]
+                ))
+            return self._fingerprint[1]
+
+    def index(self) -> PercolatorIndex:
+        """Compiled subscriptions, rebuilt when they change"""
+        with self._lock:
+            self._sync()
+            if self._index_version != self.version:
+                self._index = self._compile(list(self._subscriptions.values()))
+                self._index_version = self.version
+            return self._index
+
+    @staticmethod
+    def _compile(subscriptions: List[Subscription]) -> PercolatorIndex:
+        vocabulary: Dict[str, int] = {}
+        required = [
+            [vocabulary.setdefault(t, len(vocabulary)) for t in s.required_terms]
+            for s in subscriptions
+        ]
+        optional = [
+            [vocabulary.setdefault(t, len(vocabulary)) for t in s.optional_terms]
+            for s in subscriptions
+        ]
+        required_ptr, required_postings = _postings(required, len(vocabulary))
+        optional_ptr, optional_postings = _postings(optional, len(vocabulary))
+
+        return PercolatorIndex(
+            subscriptions=subscriptions,
+            vocabulary=vocabulary,
+            required_ptr=required_ptr,
+            required_postings=required_postings,
+            optional_ptr=optional_ptr,
+            optional_postings=optional_postings,
+            required_count=np.array([len(t) for t in required], dtype=np.int64),
+            optional_count=np.array([len(t) for t in optional], dtype=np.int64),
+            sector_mask=np.array(
+                [sector_mask(s.sectors) for s in subscriptions], dtype=np.uint32
+            ),
+            # Bit per stage code; 0 accepts any stage
+            stage_mask=np.array(
+                [sum(1 << STAGE_CODES[stage] for stage in s.stages) for s in subscriptions],
+                dtype=np.uint32
+            ),
+            min_relevancy=np.array(
+                [s.min_relevancy for s in subscriptions], dtype=np.float64
+            ),
+            min_score=np.array(
+                [np.nan if s.min_score is None else s.min_score for s in subscriptions],
+                dtype=np.float64
+            )
+        )
+
+    def percolate(
+        self,
+        texts: Sequence[str],
+        sectors: Sequence[Sequence[str]],
+        stages: Sequence[Optional[str]],
+        scores: Optional[np.ndarray] = None,
+        index: Optional[PercolatorIndex] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        (subscription ID, relevancy) pairs each deal triggers, most
+        relevant first
+
+        `scores` are investment fit scores (NaN for unknown); a deal
+        without a score never meets a score threshold.
+        """
+        index = index or self.index()
+        n = len(texts)
+        if not index.subscriptions:
+            return [[] for _ in range(n)]
+
+        # Known terms of each deal, once per deal
+        vocabulary = index.vocabulary
+        term_ids = [
+            {vocabulary[t] for t in self.tokenizer.tokenize(text) if t in vocabulary}
+            for text in texts
+        ]
+        deal_sectors = np.array(
+            [sector_mask(s.lower() for s in deal) for deal in sectors], dtype=np.uint32
+        )
+        deal_stages = np.array(
+            [
+                1 << STAGE_CODES[stage.lower()]
+                if stage and stage.lower() in STAGE_CODES else 0
+                for stage in stages
+            ],
+            dtype=np.uint32
+        )
+        if scores is None:
+            scores = np.full(n, np.nan)
+
+        results: List[List[Tuple[str, float]]] = []
+        chunk = max(1, MAX_CELLS // len(index.subscriptions))
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            results.extend(self._evaluate(
+                index,
+                term_ids[start:stop],
+                deal_sectors[start:stop],
+                deal_stages[start:stop],
+                scores[start:stop]
+            ))
+        return results
+
+    @staticmethod
+    def _evaluate(
+        index: PercolatorIndex,
+        term_ids: List[set],
+        deal_sectors: np.ndarray,
+        deal_stages: np.ndarray,
+        scores: np.ndarray
+    ) -> List[List[Tuple[str, float]]]:
+        n, count = len(term_ids), len(index.subscriptions)
+        rows = np.repeat(np.arange(n, dtype=np.int64), [len(t) for t in term_ids])
+        terms = np.fromiter(
+            (t for ids in term_ids for t in ids), dtype=np.int64, count=len(rows)
+        )
+
+        def hits(ptr: np.ndarray, postings: np.ndarray) -> np.ndarray:
+            row, subscription = _gather(ptr, postings, rows, terms)
+            return np.bincount(
+                row * count + subscription, minlength=n * count
+            ).reshape(n, count)
+
+        required_hits = hits(index.required_ptr, index.required_postings)
+        optional_hits = hits(index.optional_ptr, index.optional_postings)
+        relevancy = np.where(
+            index.optional_count > 0,
+            optional_hits * 100.0 / np.maximum(index.optional_count, 1),
+            100.0
+        )
+
+        with np.errstate(invalid='ignore'):
+            score_ok = np.isnan(index.min_score) | (scores[:, None] >= index.min_score)
+        matched = (
+            (required_hits == index.required_count) &
+            (relevancy >= index.min_relevancy) &
+            ((index.sector_mask == 0) | ((deal_sectors[:, None] & index.sector_mask) != 0)) &
+            ((index.stage_mask == 0) | ((deal_stages[:, None] & index.stage_mask) != 0)) &
+            score_ok
+        )
+
+        results: List[List[Tuple[str, float]]] = [[] for _ in range(n)]
+        deals, subscriptions = np.nonzero(matched)
+        values = relevancy[deals, subscriptions]
+        # Grouped by deal, most relevant first
+        order = np.lexsort((-values, deals))
+        for deal, subscription, value in zip(
+            deals[order].tolist(), subscriptions[order].tolist(), values[order].tolist()
+        ):
+            results[deal].append(
+                (index.subscriptions[subscription].subscription_id, round(value, 2))
+            )
+        return results
@@ -0,0 +1,101 @@
+# ============================================
+# app/services/portfolio_analytics.py
+# Portfolio-Level Aggregates over Batch Scores
+# ============================================
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from app.services.deal_columns import DealColumns, SECTORS, STAGES
+
+DISTRIBUTION_SCORES = (
+    'investment_fit_score', 'market_score', 'traction_score',
+    'team_score', 'financial_score'
+)
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def score_distribution(values: np.ndarray, bins: int = 10) -> Dict[str, Any]:
+    """Fixed-width 0-100 histogram, quantiles and mean of one score"""
+    counts, edges = np.histogram(values, bins=bins, range=(0, 100))
+    if len(values):
+        quantiles = np.quantile(values, QUANTILES)
+        mean = float(values.mean())
+    else:
+        quantiles = np.full(len(QUANTILES), np.nan)
+        mean = None
+
+    return {
+        "bin_edges": edges.tolist(),
+        "counts": counts.tolist(),
+        "quantiles": {
+            f"p{round(q * 100)}": None if np.isnan(v) else round(float(v), 2)
+            for q, v in zip(QUANTILES, quantiles)
+        },
+        "mean": None if mean is None else round(mean, 2)
+    }
+
+
+def _group_stats(
+    labels: Sequence[str],
+    counts: np.ndarray,
+    totals: np.ndarray
+) -> List[Dict[str, Any]]:
+    """Count and mean score of every non-empty group"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = totals / counts
+    return [
+        {"name": label, "count": int(count), "mean_score": round(float(mean), 2)}
+        for label, count, mean in zip(labels, counts, means)
+        if count
+    ]
+
+
+def stage_breakdown(stage: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+    """Group by stage code, with unknown stages (-1) last"""
+    # Shift codes so unknown (-1) lands in the last bucket
+    codes = np.where(stage < 0, len(STAGES), stage).astype(np.intp)
+    counts = np.bincount(codes, minlength=len(STAGES) + 1)
+    totals = np.bincount(codes, weights=scores, minlength=len(STAGES) + 1)
+    return _group_stats(STAGES + ('unknown',), counts, totals)
+
+
+def sector_breakdown(masks: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Group by sector bit; a deal in several sectors counts in each
+    """
+    bits = (masks[:, None] >> np.arange(len(SECTORS), dtype=np.uint32)) & 1
+    bits = bits.astype(np.float64)
+    return _group_stats(SECTORS, bits.sum(axis=0), scores @ bits)
+
+
+def label_counts(codes: np.ndarray, labels: Sequence[str]) -> Dict[str, int]:
+    """Occurrences of every label of a coded column"""
+    counts = np.bincount(codes.astype(np.intp), minlength=len(labels))
+    return dict(zip(labels, counts.tolist()))
+
+
+def portfolio_analytics(
+    columns: DealColumns,
+    results: Dict[str, np.ndarray],
+    label_tables: Dict[str, Sequence[str]],
+    bins: int = 10
+) -> Dict[str, Any]:
+    """
+    Distributions, sector/stage breakdowns and label counts of a
+    scored batch
+    """
+    overall = results['investment_fit_score']
+    return {
+        "distributions": {
+            name: score_distribution(results[name], bins)
+            for name in DISTRIBUTION_SCORES
+        },
+        "stages": stage_breakdown(columns.stage, overall),
+        "sectors": sector_breakdown(columns.sector_mask, overall),
+        **{
+            name: label_counts(results[name], labels)
+            for name, labels in label_tables.items()
+        }
+    }
@@ -3,26 +3,116 @@
 # Investment Scoring Service
 # ============================================
 
+from dataclasses import fields
 import numpy as np
-from typing import Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.schemas.founder_schema import FounderData
 from app.schemas.scoring_schema import (
     DealData, ScoringWeights, ScoreResponse,
     ScoreBreakdown, DetailedAnalysis
 )
-from app.services.feature_engineering import FeatureEngineering
+from app.services.analysis_templates import ANALYSIS_TEMPLATES
+from app.services.deal_columns import DealColumns, STAGES, sector_mask
+from app.services.drift_monitor import DriftMonitor
+from app.services.founder_scores import FounderScoreCache
+from app.services.shared_store import (
+    SharedScoreStore,
+    STORE_SCORES,
+    columns_from_matrix,
+    deal_key,
+    feature_matrix
+)
+from app.services.shadow_scoring import ShadowScorer
 from app.config.settings import settings
+from app.utils.deadline import check_deadline
 from app.utils.logger import setup_logger
 
 logger = setup_logger()
-feature_eng = FeatureEngineering()
+
+# Scoring rules: (threshold, points) tiers, first match wins
+HIGH_GROWTH_SECTORS = ('ai-ml', 'fintech', 'healthtech', 'saas')
+STAGE_POINTS = {
+    'pre-seed': 15,
+    'seed': 12,
+    'series-a': 10,
+    'series-b': 8,
+    'series-c': 5
+}
+DEFAULT_STAGE_POINTS = 5
+REVENUE_TIERS = ((1000000, 25), (500000, 20), (100000, 15), (0, 10))
+GROWTH_TIERS = ((200, 25), (100, 20), (50, 15), (20, 10))
+CUSTOMER_TIERS = ((10000, 10), (1000, 7), (100, 5))
+TEAM_SIZE_TIERS = ((20, 20), (10, 15), (5, 10), (2, 5))  # inclusive
+RUNWAY_TIERS = ((24, 25), (12, 20), (6, 10), (3, 5))
+CRITICAL_RUNWAY_POINTS = -10
+GROSS_MARGIN_TIERS = ((70, 15), (50, 10), (30, 5))
+FOUNDER_EXPERIENCE_POINTS = 15  # Deals without founder profiles
+FOUNDER_SCORE_POINTS = 30  # Founders with a mean overall score of 100
+
+SUB_SCORE_BASES = {
+    'market_score': 50.0,
+    'traction_score': 30.0,
+    'team_score': 40.0,
+    'financial_score': 40.0
+}
+
+# Label tables for coded batch results
+GROWTH_LABELS = ('low', 'medium', 'high', 'very-high')
+RISK_LABELS = ('low', 'medium', 'high')
+RECOMMENDATIONS = ('pass', 'watch', 'consider', 'strong-consider', 'pursue')
+
+SCORE_COLUMNS = (
+    'investment_fit_score', 'market_score', 'traction_score',
+    'team_score', 'financial_score', 'confidence'
+)
+
+# Stage code -> market points, with unknown stages (-1) in the last slot
+STAGE_POINTS_BY_CODE = np.array(
+    [STAGE_POINTS.get(stage, DEFAULT_STAGE_POINTS) for stage in STAGES] +
+    [DEFAULT_STAGE_POINTS],
+    dtype=np.float64
+)
+
+
+def tier_points(
+    values: np.ndarray,
+    tiers: Tuple[Tuple[float, float], ...],
+    inclusive: bool = False,
+    default: float = 0.0
+) -> np.ndarray:
+    """Points of the first tier whose threshold the value exceeds"""
+    conditions = [
+        values >= threshold if inclusive else values > threshold
+        for threshold, _ in tiers
+    ]
+    return np.select(conditions, [points for _, points in tiers], default)
+
 
 class ScoringService:
     """
     Investment scoring service using ML
     """
     
-    def __init__(self):
-        self.model_version = settings.ML_MODEL_VERSION
+    def __init__(
+        self,
+        drift_monitor: Optional[DriftMonitor] = None,
+        shadow: Optional[ShadowScorer] = None,
+        model_version: Optional[str] = None,
+        default_weights: Optional[ScoringWeights] = None,
+        founder_scores: Optional[FounderScoreCache] = None,
+        store: Optional[SharedScoreStore] = None
+    ):
+        self.model_version = model_version or settings.ML_MODEL_VERSION
+        self.default_weights = default_weights or ScoringWeights()
+        if founder_scores is None:
+            from app.models.founder_evaluator import FounderEvaluator
+            founder_scores = FounderScoreCache(
+                FounderEvaluator(), max_size=settings.FOUNDER_CACHE_SIZE
+            )
+        self.founder_scores = founder_scores
+        self.store = store
+        self.drift_monitor = drift_monitor
+        self.shadow = shadow
         logger.info(f"Scoring service initialized (v{self.model_version})")
     
     def score_deal(
@@ -33,285 +123,378 @@ class ScoringService:
         """
         Score a deal based on multiple factors
         """
-        # Use default weights if not provided
-        weights = custom_weights or ScoringWeights()
-        
-        # Calculate individual scores
-        market_score = self._calculate_market_score(deal_data)
-        traction_score = self._calculate_traction_score(deal_data)
-        team_score = self._calculate_team_score(deal_data)
-        financial_score = self._calculate_financial_score(deal_data)
-        
-        # Calculate weighted overall score
-        overall_score = (
-            market_score * weights.market_weight +
-            traction_score * weights.traction_weight +
-            team_score * weights.team_weight +
-            financial_score * weights.financial_weight
+        return self.score_deals([deal_data], [custom_weights])[0]
+    
+    def score_deals(
+        self,
+        deals: Sequence[DealData],
+        custom_weights: Sequence[Optional[ScoringWeights]]
+    ) -> List[ScoreResponse]:
+        """
+        Score independent deal requests in vectorized passes, one per
+        distinct set of weights
+        """
+        groups: Dict[Tuple[float, ...], List[int]] = {}
+        for row, weights in enumerate(custom_weights):
+            weights = weights or self.default_weights
+            key = (
+                weights.market_weight, weights.traction_weight,
+                weights.team_weight, weights.financial_weight
+            )
+            groups.setdefault(key, []).append(row)
+        
+        # Columns and weight-independent scores of all deals at once
+        check_deadline("scoring")
+        all_columns, all_scores = self._deal_scores(deals)
+        
+        responses: List[Optional[ScoreResponse]] = [None] * len(deals)
+        for rows in groups.values():
+            columns = all_columns.take(rows)
+            
+            # Weighted overall scores
+            scores = self.weighted(
+                {name: values[rows] for name, values in all_scores.items()},
+                custom_weights[rows[0]]
+            )
+            self._observe(columns, scores)
+            rounded = {name: np.round(scores[name], 2).tolist() for name in SCORE_COLUMNS}
+            
+            # Generate detailed analysis
+            check_deadline("analysis")
+            classes = self.classify(columns, scores)
+            masks = ANALYSIS_TEMPLATES.condition_masks(columns, scores).tolist()
+            self._shadow(columns, custom_weights[rows[0]], scores, classes)
+            
+            for i, row in enumerate(rows):
+                responses[row] = ScoreResponse(
+                    investment_fit_score=rounded['investment_fit_score'][i],
+                    breakdown=ScoreBreakdown(
+                        market_score=rounded['market_score'][i],
+                        traction_score=rounded['traction_score'][i],
+                        team_score=rounded['team_score'][i],
+                        financial_score=rounded['financial_score'][i]
+                    ),
+                    detailed_analysis=self._generate_analysis(classes, masks[i], i),
+                    confidence=rounded['confidence'][i],
+                    ml_model_version=self.model_version
+                )
+        
+        return responses
+    
+    def _deal_scores(
+        self,
+        deals: Sequence[DealData]
+    ) -> Tuple[DealColumns, Dict[str, np.ndarray]]:
+        """
+        Columns and base scores of deals, from the shared store where
+        another request (in any worker) already computed them
+        """
+        if self.store is None:
+            columns = DealColumns.from_deals(
+                deals, self.team_scores([d.founders for d in deals])
+            )
+            return columns, self.base_scores(columns)
+        
+        keys = np.array(
+            [deal_key(deal, self.model_version) for deal in deals], dtype=np.uint64
         )
+        found, features, scores = self.store.get_many(keys)
+        missing = np.flatnonzero(~found)
+        if len(missing):
+            fresh_deals = [deals[i] for i in missing]
+            fresh = DealColumns.from_deals(
+                fresh_deals, self.team_scores([d.founders for d in fresh_deals])
+            )
+            fresh_scores = self.base_scores(fresh)
+            features[missing] = feature_matrix(fresh)
+            scores[missing] = np.column_stack([fresh_scores[name] for name in STORE_SCORES])
+            self.store.put_many(keys[missing], features[missing], scores[missing])
+        
+        return columns_from_matrix(features), {
+            name: scores[:, i] for i, name in enumerate(STORE_SCORES)
+        }
+    
+    def team_scores(self, teams: Sequence[Sequence[FounderData]]) -> np.ndarray:
+        """
+        Mean cached founder score per deal (NaN without founders), for
+        the founder_score column
+        """
+        if not any(teams):
+            return np.full(len(teams), np.nan)
+        return self.founder_scores.team_scores(teams)
+    
+    def score_columns(
+        self,
+        columns: DealColumns,
+        custom_weights: Optional[ScoringWeights] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score a batch of deals in one vectorized pass
         
-        # Ensure score is between 0-100
-        overall_score = max(0, min(100, overall_score))
-        
-        # Generate detailed analysis
-        analysis = self._generate_analysis(
-            deal_data, 
-            overall_score,
-            market_score,
-            traction_score,
-            team_score,
-            financial_score
+        Returns one array per score in SCORE_COLUMNS.
+        """
+        return self.weighted(self.base_scores(columns), custom_weights)
+    
+    def base_scores(self, columns: DealColumns) -> Dict[str, np.ndarray]:
+        """Sub-scores and confidence, which don't depend on the weights"""
+        scores = self._sub_scores(self.rule_points(columns), len(columns))
+        scores['confidence'] = self._calculate_confidences(columns)
+        return scores
+    
+    def weighted(
+        self,
+        scores: Dict[str, np.ndarray],
+        custom_weights: Optional[ScoringWeights] = None
+    ) -> Dict[str, np.ndarray]:
+        """Add the weighted overall score (0-100) to base scores"""
+        # Use default weights if not provided
+        weights = custom_weights or self.default_weights
+        
+        # Calculate weighted overall score, between 0-100
+        scores['investment_fit_score'] = np.clip(
+            scores['market_score'] * weights.market_weight +
+            scores['traction_score'] * weights.traction_weight +
+            scores['team_score'] * weights.team_weight +
+            scores['financial_score'] * weights.financial_weight,
+            0, 100
         )
+        return scores
+    
+    def classify(
+        self,
+        columns: DealColumns,
+        scores: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Growth potential, risk level and recommendation codes, indexing
+        GROWTH_LABELS, RISK_LABELS and RECOMMENDATIONS
+        """
+        traction = scores['traction_score']
+        financial = scores['financial_score']
+        overall = scores['investment_fit_score']
         
-        # Calculate confidence based on data completeness
-        confidence = self._calculate_confidence(deal_data)
-        
-        return ScoreResponse(
-            investment_fit_score=round(overall_score, 2),
-            breakdown=ScoreBreakdown(
-                market_score=round(market_score, 2),
-                traction_score=round(traction_score, 2),
-                team_score=round(team_score, 2),
-                financial_score=round(financial_score, 2)
-            ),
-            detailed_analysis=analysis,
-            confidence=round(confidence, 2),
-            ml_model_version=self.model_version
+        growth = np.select(
+            [traction >= 80, traction >= 60, traction >= 40], [3, 2, 1], 0
+        )
+        risk = np.select(
+            [(financial < 40) | (columns.runway_months < 6), financial < 60],
+            [2, 1],
+            0
         )
+        recommendation = np.select(
+            [overall >= 80, overall >= 70, overall >= 60, overall >= 50],
+            [4, 3, 2, 1],
+            0
+        )
+        
+        return {
+            'growth_potential': growth.astype(np.int8),
+            'risk_level': risk.astype(np.int8),
+            'recommendation': recommendation.astype(np.int8)
+        }
     
-    def _calculate_market_score(self, deal: DealData) -> float:
-        """Calculate market opportunity score"""
-        score = 50.0  # Base score
+    def score_batch(
+        self,
+        columns: DealColumns,
+        custom_weights: Optional[ScoringWeights] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rounded score columns plus classification codes and analysis
+        condition masks for a batch
+        """
+        check_deadline("scoring")
+        scores = self.score_columns(columns, custom_weights)
+        self._observe(columns, scores)
+        results = {name: np.round(scores[name], 2) for name in SCORE_COLUMNS}
+        
+        check_deadline("analysis")
+        results.update(self.classify(columns, scores))
+        results['analysis_mask'] = ANALYSIS_TEMPLATES.condition_masks(columns, scores)
+        self._shadow(columns, custom_weights, scores, results)
+        return results
+    
+    def attribute(
+        self,
+        columns: DealColumns,
+        custom_weights: Optional[ScoringWeights] = None
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Exact contribution of each input column to investment_fit_score
         
+        Rule points are weighted into the overall score; where a sub-score
+        or the overall score is clipped, the contributions feeding it are
+        scaled down proportionally. Returns the per-deal base value and
+        per-column contributions, which sum to the overall score; points
+        not tied to an input column are folded into the base.
+        """
+        weights = custom_weights or self.default_weights
+        sub_weights = {
+            'market_score': weights.market_weight,
+            'traction_score': weights.traction_weight,
+            'team_score': weights.team_weight,
+            'financial_score': weights.financial_weight
+        }
+        size = len(columns)
+        column_names = {column.name for column in fields(DealColumns)}
+        
+        base = np.zeros(size)
+        contributions: Dict[str, np.ndarray] = {}
+        for name, points_by_field in self.rule_points(columns).items():
+            points = sum(points_by_field.values(), np.zeros(size))
+            clipped = np.clip(SUB_SCORE_BASES[name] + points, 0, 100)
+            scale = _clip_scale(clipped - SUB_SCORE_BASES[name], points)
+            
+            base = base + SUB_SCORE_BASES[name] * sub_weights[name]
+            for field, value in points_by_field.items():
+                contribution = value * scale * sub_weights[name]
+                if field in column_names:
+                    contributions[field] = contributions.get(field, 0.0) + contribution
+                else:
+                    # Points not tied to an input column count as base
+                    base = base + contribution
+        
+        total = sum(contributions.values(), np.zeros(size))
+        overall = np.clip(base + total, 0, 100)
+        scale = _clip_scale(overall - base, total)
+        for field in contributions:
+            contributions[field] = contributions[field] * scale
+        
+        return base, contributions
+    
+    def rule_points(self, deals: DealColumns) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Points each input column adds to each sub-score, before the
+        sub-score base and clipping
+        """
+        return {
+            'market_score': self._market_points(deals),
+            'traction_score': self._traction_points(deals),
+            'team_score': self._team_points(deals),
+            'financial_score': self._financial_points(deals)
+        }
+    
+    def _sub_scores(
+        self,
+        points: Dict[str, Dict[str, np.ndarray]],
+        size: int
+    ) -> Dict[str, np.ndarray]:
+        """Base plus rule points, clipped to 0-100"""
+        scores = {}
+        for name, fields in points.items():
+            score = np.full(size, SUB_SCORE_BASES[name])
+            for value in fields.values():
+                score = score + value
+            scores[name] = np.clip(score, 0, 100)
+        return scores
+    
+    def _market_points(self, deals: DealColumns) -> Dict[str, np.ndarray]:
+        """Market opportunity points"""
         # Sector scoring (high-growth sectors get higher scores)
-        high_growth_sectors = ['ai-ml', 'fintech', 'healthtech', 'saas']
-        if any(sector in high_growth_sectors for sector in deal.sector):
-            score += 20
-        
-        # Stage scoring (earlier stages have higher growth potential)
-        stage_scores = {
-            'pre-seed': 15,
-            'seed': 12,
-            'series-a': 10,
-            'series-b': 8,
-            'series-c': 5
+        high_growth = deals.sector_mask & sector_mask(HIGH_GROWTH_SECTORS)
+        
+        return {
+            'sector_mask': np.where(high_growth != 0, 20.0, 0.0),
+            # Stage scoring (earlier stages have higher growth potential)
+            'stage': STAGE_POINTS_BY_CODE[deals.stage],
+            # Location scoring (tech hubs get bonus)
+            'tech_hub': np.where(deals.tech_hub, 10.0, 0.0)
         }
-        score += stage_scores.get(deal.stage, 5)
-        
-        # Location scoring (tech hubs get bonus)
-        tech_hubs = ['US', 'United States', 'UK', 'Singapore', 'India']
-        if any(hub.lower() in deal.location.get('country', '').lower() 
-               for hub in tech_hubs):
-            score += 10
-        
-        return min(100, score)
     
-    def _calculate_traction_score(self, deal: DealData) -> float:
-        """Calculate traction and growth score"""
-        score = 30.0  # Base score
-        
-        metrics = deal.metrics
-        
-        # Revenue score
-        if metrics.revenue > 1000000:  # $1M+
-            score += 25
-        elif metrics.revenue > 500000:  # $500K+
-            score += 20
-        elif metrics.revenue > 100000:  # $100K+
-            score += 15
-        elif metrics.revenue > 0:
-            score += 10
-        
-        # Growth rate score
-        if metrics.growth_rate_yoy > 200:  # 200%+ YoY
-            score += 25
-        elif metrics.growth_rate_yoy > 100:  # 100%+ YoY
-            score += 20
-        elif metrics.growth_rate_yoy > 50:  # 50%+ YoY
-            score += 15
-        elif metrics.growth_rate_yoy > 20:  # 20%+ YoY
-            score += 10
-        
-        # Customer count (if available)
-        if metrics.customer_count:
-            if metrics.customer_count > 10000:
-                score += 10
-            elif metrics.customer_count > 1000:
-                score += 7
-            elif metrics.customer_count > 100:
-                score += 5
-        
-        return min(100, score)
+    def _traction_points(self, deals: DealColumns) -> Dict[str, np.ndarray]:
+        """Traction and growth points"""
+        return {
+            'revenue': tier_points(deals.revenue, REVENUE_TIERS),
+            'growth_rate_yoy': tier_points(deals.growth_rate_yoy, GROWTH_TIERS),
+            # Missing customer counts are NaN and score nothing
+            'customer_count': tier_points(deals.customer_count, CUSTOMER_TIERS)
+        }
     
-    def _calculate_team_score(self, deal: DealData) -> float:
-        """Calculate team quality score"""
-        score = 40.0  # Base score
-        
-        # Team size scoring
-        if deal.team_size >= 20:
-            score += 20
-        elif deal.team_size >= 10:
-            score += 15
-        elif deal.team_size >= 5:
-            score += 10
-        elif deal.team_size >= 2:
-            score += 5
-        
-        # Company age (maturity indicator)
-        # Simple heuristic: older companies with teams are more stable
-        score += 15  # Placeholder for founder experience
-        
-        return min(100, score)
+    def _team_points(self, deals: DealColumns) -> Dict[str, np.ndarray]:
+        """Team quality points"""
+        return {
+            'team_size': tier_points(deals.team_size, TEAM_SIZE_TIERS, inclusive=True),
+            'founders': np.full(len(deals), float(FOUNDER_EXPERIENCE_POINTS)),
+            # Founder evaluations replace the default where a deal has them
+            'founder_score': np.where(
+                np.isnan(deals.founder_score),
+                0.0,
+                deals.founder_score * FOUNDER_SCORE_POINTS / 100 - FOUNDER_EXPERIENCE_POINTS
+            )
+        }
     
-    def _calculate_financial_score(self, deal: DealData) -> float:
-        """Calculate financial health score"""
-        score = 40.0  # Base score
-        
-        metrics = deal.metrics
-        
-        # Burn rate vs runway
-        if metrics.runway_months > 24:  # 2+ years runway
-            score += 25
-        elif metrics.runway_months > 12:  # 1+ year runway
-            score += 20
-        elif metrics.runway_months > 6:  # 6+ months runway
-            score += 10
-        elif metrics.runway_months > 3:  # 3+ months runway
-            score += 5
-        else:
-            score -= 10  # Critical runway
-        
-        # Gross margin (if available)
-        if metrics.gross_margin:
-            if metrics.gross_margin > 70:
-                score += 15
-            elif metrics.gross_margin > 50:
-                score += 10
-            elif metrics.gross_margin > 30:
-                score += 5
-        
-        # Unit economics (if available)
-        if metrics.customer_count and metrics.customer_count > 0:
-            score += 10
-        
-        return max(0, min(100, score))
+    def _financial_points(self, deals: DealColumns) -> Dict[str, np.ndarray]:
+        """Financial health points"""
+        return {
+            # Burn rate vs runway (critical runway is penalized)
+            'runway_months': tier_points(
+                deals.runway_months, RUNWAY_TIERS, default=CRITICAL_RUNWAY_POINTS
+            ),
+            # Gross margin (if available)
+            'gross_margin': tier_points(deals.gross_margin, GROSS_MARGIN_TIERS),
+            # Unit economics (if available)
+            'customer_count': np.where(deals.customer_count > 0, 10.0, 0.0)
+        }
+    
+    def _observe(self, columns: DealColumns, scores: Dict[str, np.ndarray]):
+        """Feed live traffic to the drift monitor"""
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe(columns, scores)
+    
+    def _shadow(
+        self,
+        columns: DealColumns,
+        custom_weights: Optional[ScoringWeights],
+        scores: Dict[str, np.ndarray],
+        classes: Dict[str, np.ndarray]
+    ):
+        """Offer a sample of live traffic to the shadow candidate"""
+        if self.shadow is not None:
+            self.shadow.submit(columns, custom_weights, scores, classes['recommendation'])
     
     def _generate_analysis(
         self,
-        deal: DealData,
-        overall_score: float,
-        market: float,
-        traction: float,
-        team: float,
-        financial: float
+        classes: Dict[str, np.ndarray],
+        mask: int,
+        row: int = 0
     ) -> DetailedAnalysis:
-        """Generate detailed investment analysis"""
-        
-        # Determine growth potential
-        if traction >= 80:
-            growth = "very-high"
-        elif traction >= 60:
-            growth = "high"
-        elif traction >= 40:
-            growth = "medium"
-        else:
-            growth = "low"
-        
-        # Determine risk level
-        if financial < 40 or deal.metrics.runway_months < 6:
-            risk = "high"
-        elif financial < 60:
-            risk = "medium"
-        else:
-            risk = "low"
-        
-        # Determine recommendation
-        if overall_score >= 80:
-            recommendation = "pursue"
-        elif overall_score >= 70:
-            recommendation = "strong-consider"
-        elif overall_score >= 60:
-            recommendation = "consider"
-        elif overall_score >= 50:
-            recommendation = "watch"
-        else:
-            recommendation = "pass"
-        
-        # Generate strengths
-        strengths = []
-        if market >= 70:
-            strengths.append("Strong market opportunity in growing sector")
-        if traction >= 70:
-            strengths.append("Excellent traction and growth metrics")
-        if team >= 70:
-            strengths.append("Experienced team with domain expertise")
-        if financial >= 70:
-            strengths.append("Solid financial position with healthy runway")
-        
-        if not strengths:
-            strengths.append("Promising early-stage opportunity")
-        
-        # Generate weaknesses
-        weaknesses = []
-        if market < 50:
-            weaknesses.append("Limited market opportunity or competitive sector")
-        if traction < 50:
-            weaknesses.append("Needs to demonstrate stronger traction")
-        if team < 50:
-            weaknesses.append("Small team size may limit execution capability")
-        if financial < 50:
-            weaknesses.append("Limited runway requires attention")
-        
-        # Generate key risks
-        risks = []
-        if deal.metrics.runway_months < 6:
-            risks.append("Critical: Short runway (< 6 months)")
-        if deal.metrics.growth_rate_yoy < 20:
-            risks.append("Slow growth rate may indicate market fit issues")
-        if deal.team_size < 3:
-            risks.append("Very small team size")
-        
-        if not risks:
-            risks.append("Standard startup execution risks")
-        
-        # Generate opportunities
-        opportunities = []
-        if 'ai-ml' in deal.sector or 'saas' in deal.sector:
-            opportunities.append("Operating in high-growth technology sector")
-        if deal.metrics.growth_rate_yoy > 50:
-            opportunities.append("Strong growth momentum to capitalize on")
-        if deal.stage in ['seed', 'series-a']:
-            opportunities.append("Early-stage entry with significant upside potential")
+        """Generate detailed investment analysis for one deal"""
+        messages = ANALYSIS_TEMPLATES.messages_for(mask)
         
         return DetailedAnalysis(
-            growth_potential=growth,
-            risk_level=risk,
-            recommendation=recommendation,
-            strengths=strengths,
-            weaknesses=weaknesses,
-            key_risks=risks,
-            opportunities=opportunities
+            growth_potential=GROWTH_LABELS[classes['growth_potential'][row]],
+            risk_level=RISK_LABELS[classes['risk_level'][row]],
+            recommendation=RECOMMENDATIONS[classes['recommendation'][row]],
+            strengths=list(messages['strengths']),
+            weaknesses=list(messages['weaknesses']),
+            key_risks=list(messages['key_risks']),
+            opportunities=list(messages['opportunities'])
         )
     
-    def _calculate_confidence(self, deal: DealData) -> float:
+    def _calculate_confidences(self, deals: DealColumns) -> np.ndarray:
         """
-        Calculate confidence score based on data completeness
+        Calculate confidence scores based on data completeness
         """
-        confidence = 0.5  # Base confidence
+        confidence = np.full(len(deals), 0.5)  # Base confidence
         
         # Check data completeness
-        if deal.metrics.revenue > 0:
-            confidence += 0.1
-        if deal.metrics.growth_rate_yoy != 0:
-            confidence += 0.1
-        if deal.metrics.customer_count:
-            confidence += 0.1
-        if deal.metrics.gross_margin:
-            confidence += 0.1
-        if deal.team_size >= 5:
-            confidence += 0.1
+        confidence += np.where(deals.revenue > 0, 0.1, 0)
+        confidence += np.where(deals.growth_rate_yoy != 0, 0.1, 0)
+        confidence += np.where(_present(deals.customer_count), 0.1, 0)
+        confidence += np.where(_present(deals.gross_margin), 0.1, 0)
+        confidence += np.where(deals.team_size >= 5, 0.1, 0)
         
-        return min(1.0, confidence)
+        return np.minimum(1.0, confidence)
+
+
+def _clip_scale(clipped: np.ndarray, raw: np.ndarray) -> np.ndarray:
+    """Factor mapping raw point totals onto their clipped values"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(raw != 0, clipped / raw, 1.0)
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    """Optional metric is set and non-zero"""
+    return ~np.isnan(values) & (values != 0)
 
 # ============================================
 # app/services/feature_engineering.py
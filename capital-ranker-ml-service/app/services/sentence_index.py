@@ -0,0 +1,81 @@
+# ============================================
+# app/services/sentence_index.py
+# Sentence-level Index for Matched Sections
+# ============================================
+
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+
+
+class SentenceIndex:
+    """
+    Per-document sentence index: token -> sentence ids postings plus
+    a sparse term vector for every sentence
+    """
+
+    def __init__(self, text: str, tokenize: Callable[[str], List[str]]):
+        self.sentences: List[str] = []
+        self.term_vectors: List[Counter] = []
+        self.postings: Dict[str, List[int]] = {}
+
+        for raw in SENTENCE_SPLIT.split(text):
+            sentence = raw.strip()
+            if not sentence:
+                continue
+
+            sentence_id = len(self.sentences)
+            terms = Counter(tokenize(sentence))
+            self.sentences.append(sentence)
+            self.term_vectors.append(terms)
+
+            for term in terms:
+                self.postings.setdefault(term, []).append(sentence_id)
+
+    def lookup(self, term: str) -> List[int]:
+        """Sentence ids containing the term"""
+        return self.postings.get(term, [])
+
+    def vectorize(
+        self,
+        sentence_ids: Sequence[int],
+        vocabulary: Dict[str, int]
+    ) -> np.ndarray:
+        """L2-normalized term matrix for the given sentences"""
+        matrix = np.zeros((len(sentence_ids), len(vocabulary)), dtype=np.float32)
+
+        for row, sentence_id in enumerate(sentence_ids):
+            for term, count in self.term_vectors[sentence_id].items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    matrix[row, column] = count
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+def pairwise_similarity(
+    left: SentenceIndex,
+    left_ids: Sequence[int],
+    right: SentenceIndex,
+    right_ids: Sequence[int]
+) -> np.ndarray:
+    """
+    Cosine similarity between every left/right sentence pair,
+    computed as a single matrix product
+    """
+    vocabulary: Dict[str, int] = {}
+    for index, ids in ((left, left_ids), (right, right_ids)):
+        for sentence_id in ids:
+            for term in index.term_vectors[sentence_id]:
+                vocabulary.setdefault(term, len(vocabulary))
+
+    left_matrix = left.vectorize(left_ids, vocabulary)
+    right_matrix = right.vectorize(right_ids, vocabulary)
+
+    return left_matrix @ right_matrix.T
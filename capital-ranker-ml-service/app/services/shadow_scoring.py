@@ -0,0 +1,175 @@
+# ============================================
+# app/services/shadow_scoring.py
+# Shadow Scoring of a Candidate Model on Live Traffic
+# ============================================
+
+import queue
+import random
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.schemas.scoring_schema import ScoringWeights
+from app.services.deal_columns import DealColumns
+from app.utils.logger import setup_logger
+from app.utils.metrics import metrics
+
+logger = setup_logger()
+
+shadow_requests = metrics.counter(
+    "ml_shadow_requests_total",
+    "Scoring requests offered to the shadow candidate model, by outcome",
+    labels=("outcome",)
+)
+
+SHADOW_SCORES = (
+    'investment_fit_score', 'market_score', 'traction_score',
+    'team_score', 'financial_score'
+)
+
+# Histogram of candidate - primary investment_fit_score
+DELTA_EDGES = np.array([-20, -10, -5, -2, -0.5, 0.5, 2, 5, 10, 20], dtype=np.float64)
+
+_STOP = object()
+
+
+class ShadowScorer:
+    """
+    Re-score a sample of live requests with a candidate model
+
+    `submit` runs on the request path and only draws a random number
+    and tries a non-blocking put on a bounded queue; when the queue is
+    full the sample is dropped. Worker threads score the queued batches
+    with the candidate and fold the differences into fixed-size
+    aggregates: per-score delta sums, a histogram of overall score
+    deltas and a matrix of recommendation changes.
+    """
+
+    def __init__(
+        self,
+        candidate,
+        sample_rate: float = 0.05,
+        queue_size: int = 64,
+        workers: int = 1,
+        recommendations: int = 5
+    ):
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.deals = 0
+        self.delta_sum = np.zeros(len(SHADOW_SCORES))
+        self.abs_delta_sum = np.zeros(len(SHADOW_SCORES))
+        self.squared_delta_sum = np.zeros(len(SHADOW_SCORES))
+        self.max_abs_delta = np.zeros(len(SHADOW_SCORES))
+        self.delta_counts = np.zeros(len(DELTA_EDGES) + 1, dtype=np.int64)
+        self.flips = np.zeros((recommendations, recommendations), dtype=np.int64)
+
+        self._threads = [
+            threading.Thread(target=self._work, name=f"shadow-scorer-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        columns: DealColumns,
+        custom_weights: Optional[ScoringWeights],
+        scores: Dict[str, np.ndarray],
+        recommendation: np.ndarray
+    ) -> bool:
+        """Queue a scored batch for comparison if it is sampled"""
+        if random.random() >= self.sample_rate:
+            return False
+        try:
+            self._queue.put_nowait((columns, custom_weights, scores, recommendation))
+        except queue.Full:
+            shadow_requests.inc(outcome="dropped")
+            return False
+        shadow_requests.inc(outcome="queued")
+        return True
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            try:
+                self._compare(*item)
+                shadow_requests.inc(outcome="compared")
+            except Exception as e:
+                shadow_requests.inc(outcome="failed")
+                logger.error(f"Shadow scoring failed: {str(e)}")
+
+    def _compare(
+        self,
+        columns: DealColumns,
+        custom_weights: Optional[ScoringWeights],
+        scores: Dict[str, np.ndarray],
+        recommendation: np.ndarray
+    ):
+        candidate_scores = self.candidate.score_columns(columns, custom_weights)
+        candidate_recommendation = self.candidate.classify(
+            columns, candidate_scores
+        )['recommendation']
+
+        deltas = np.stack([candidate_scores[name] - scores[name] for name in SHADOW_SCORES])
+        delta_counts = np.bincount(
+            np.searchsorted(DELTA_EDGES, deltas[0], side='right'),
+            minlength=len(self.delta_counts)
+        )
+
+        with self._lock:
+            self.requests += 1
+            self.deals += len(columns)
+            self.delta_sum += deltas.sum(axis=1)
+            self.abs_delta_sum += np.abs(deltas).sum(axis=1)
+            self.squared_delta_sum += (deltas ** 2).sum(axis=1)
+            np.maximum(self.max_abs_delta, np.abs(deltas).max(axis=1), out=self.max_abs_delta)
+            self.delta_counts += delta_counts
+            np.add.at(self.flips, (recommendation, candidate_recommendation), 1)
+
+    def stats(self, labels: List[str]) -> Dict[str, Any]:
+        """Comparison aggregates, with recommendations named by `labels`"""
+        with self._lock:
+            deals = self.deals
+            per_score = {}
+            for i, name in enumerate(SHADOW_SCORES):
+                per_score[name] = {
+                    "mean_delta": round(float(self.delta_sum[i] / deals), 4) if deals else None,
+                    "mean_abs_delta": round(float(self.abs_delta_sum[i] / deals), 4) if deals else None,
+                    "rmse": round(float(np.sqrt(self.squared_delta_sum[i] / deals)), 4) if deals else None,
+                    "max_abs_delta": round(float(self.max_abs_delta[i]), 4)
+                }
+            flips = self.flips.copy()
+            delta_counts = self.delta_counts.tolist()
+            requests = self.requests
+
+        changed = int(flips.sum() - np.trace(flips))
+        return {
+            "candidate_version": self.candidate.model_version,
+            "sample_rate": self.sample_rate,
+            "compared_requests": requests,
+            "compared_deals": deals,
+            "queued": self._queue.qsize(),
+            "scores": per_score,
+            "delta_edges": DELTA_EDGES.tolist(),
+            "delta_counts": delta_counts,
+            "recommendation_flips": changed,
+            "flip_rate": round(changed / deals, 4) if deals else None,
+            "flip_matrix": {
+                labels[i]: {labels[j]: int(flips[i, j]) for j in range(len(labels)) if flips[i, j]}
+                for i in range(len(labels)) if flips[i].any()
+            }
+        }
+
+    def close(self):
+        """Stop the workers once the queued samples are done"""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout=5)
@@ -0,0 +1,79 @@
+# ============================================
+# app/services/shared_records.py
+# Records by ID in a File Shared by All Workers
+# ============================================
+
+import fcntl
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Records = Dict[str, Any]
+
+
+class SharedRecords:
+    """
+    JSON object of ID -> record in a file every worker reads and writes
+
+    Writers take an exclusive file lock (and a thread lock, since flock
+    doesn't exclude threads sharing a descriptor), re-read the file,
+    apply their change and atomically replace it, so concurrent updates
+    from different workers are never lost. Readers take no lock: a
+    replaced file is seen whole or not at all, and `changed` tells from
+    one stat call whether there is anything new to load. Records keep
+    their insertion order; replacing one keeps its position.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock_path = f"{path}.lock"
+        self._thread_lock = threading.Lock()
+        # (inode, mtime, size) of the file last loaded or written
+        self._seen: Optional[Tuple[int, int, int]] = None
+
+    @staticmethod
+    def _version(st: os.stat_result) -> Tuple[int, int, int]:
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def changed(self) -> bool:
+        """The file was replaced since this process last loaded or wrote it"""
+        try:
+            version = self._version(os.stat(self.path))
+        except FileNotFoundError:
+            version = None
+        return version != self._seen
+
+    def load(self) -> Records:
+        """All records, as of the file's current version"""
+        try:
+            with open(self.path, "rb") as f:
+                version = self._version(os.fstat(f.fileno()))
+                records = json.load(f)
+        except FileNotFoundError:
+            version, records = None, {}
+        self._seen = version
+        return records
+
+    def update(self, change: Callable[[Records], bool]) -> Tuple[Records, bool]:
+        """
+        Apply `change` to the current records under the file lock
+
+        `change` edits the records in place and returns whether it
+        changed anything; the file is only rewritten if it did. Returns
+        the records after the change and that flag.
+        """
+        with self._thread_lock, open(self._lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            records = self.load()
+            if not change(records):
+                return records, False
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(records, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+            self._seen = self._version(os.stat(self.path))
+            return records, True
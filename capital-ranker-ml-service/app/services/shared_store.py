@@ -0,0 +1,227 @@
+# ============================================
+# app/services/shared_store.py
+# Cross-Worker Shared-Memory Score and Feature Store
+# ============================================
+
+import fcntl
+import hashlib
+import importlib.util
+import os
+import tempfile
+import threading
+import time
+from dataclasses import fields
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from app.services.deal_columns import DealColumns
+from app.utils.logger import setup_logger
+from app.utils.metrics import metrics
+from app.utils.single_flight import canonical_key
+
+logger = setup_logger()
+
+store_lookups = metrics.counter(
+    "ml_shared_store_lookups_total",
+    "Shared score store lookups, by outcome",
+    labels=("outcome",)
+)
+
+# Every DealColumns field, stored as float64 (exact for all of them)
+STORE_FEATURES = tuple(f.name for f in fields(DealColumns))
+# Weight-independent scores; investment_fit_score is recomputed per request
+STORE_SCORES = ('market_score', 'traction_score', 'team_score', 'financial_score', 'confidence')
+
+ENTRY_DTYPE = np.dtype([
+    ('seq', '<u8'),  # Seqlock: odd while a writer is inside the entry
+    ('key', '<u8'),  # Deal hash; 0 marks an empty slot
+    ('features', '<f8', (len(STORE_FEATURES),)),
+    ('scores', '<f8', (len(STORE_SCORES),))
+])
+
+# Modules whose code decides stored features and sub-scores (team
+# scores fold in founder evaluations)
+SCORING_MODULES = (
+    'app.services.deal_columns',
+    'app.services.scoring_service',
+    'app.services.founder_scores',
+    'app.models.founder_evaluator',
+)
+
+# Header words: magic, layout hash, capacity
+HEADER_DTYPE = np.dtype('<u8')
+HEADER_SIZE = 64
+MAGIC = 0x53434f5245535431  # "SCOREST1"
+
+
+def layout_hash() -> int:
+    """Changes whenever the entry layout does, so old segments aren't reused"""
+    layout = repr((ENTRY_DTYPE.descr, STORE_FEATURES, STORE_SCORES))
+    return int.from_bytes(hashlib.sha256(layout.encode()).digest()[:8], 'little')
+
+
+def rules_hash() -> str:
+    """
+    Hash of the scoring code, so a deploy that changes thresholds or
+    rules without a new model version doesn't read old sub-scores
+    """
+    digest = hashlib.sha256()
+    for module in SCORING_MODULES:
+        with open(importlib.util.find_spec(module).origin, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def deal_key(deal: Any, model_version: str) -> int:
+    """Non-zero 64-bit hash of a deal's content under a model version"""
+    return int(canonical_key(deal, model_version)[:16], 16) or 1
+
+
+def feature_matrix(columns: DealColumns) -> np.ndarray:
+    """(deals, STORE_FEATURES) float64 rows of a column batch"""
+    return np.column_stack(
+        [getattr(columns, name).astype(np.float64) for name in STORE_FEATURES]
+    ) if len(columns) else np.zeros((0, len(STORE_FEATURES)))
+
+
+def columns_from_matrix(matrix: np.ndarray) -> DealColumns:
+    """Inverse of `feature_matrix`"""
+    dtypes = {
+        'stage': np.int8, 'sector_mask': np.uint32, 'tech_hub': bool
+    }
+    return DealColumns(**{
+        name: matrix[:, i].astype(dtypes.get(name, np.float64))
+        for i, name in enumerate(STORE_FEATURES)
+    })
+
+
+class SharedScoreStore:
+    """
+    Fixed-size table of deal hash -> feature row and sub-scores in a
+    shared memory segment, so every worker process sees one warm set
+
+    Slots are direct-mapped by hash; a write replaces whatever was in
+    its slot. Readers take no lock: each entry carries a sequence
+    number that writers make odd before changing the entry and even
+    again after, and a read only counts if the number was even and
+    unchanged around the copy. Writers are serialized with a file lock
+    (and a thread lock, since flock doesn't exclude threads sharing a
+    descriptor). This relies on stores becoming visible in program
+    order, as on x86.
+
+    The segment outlives the workers; its name carries hashes of the
+    entry layout and of the scoring code, so a deploy that changes
+    either starts a fresh one (the old segment stays until unlinked or
+    the host restarts).
+    """
+
+    def __init__(self, name: str, capacity: int = 65536):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self.name = f"{name}-{layout_hash():016x}-{rules_hash()[:16]}"
+        size = HEADER_SIZE + capacity * ENTRY_DTYPE.itemsize
+        try:
+            self._shm = shared_memory.SharedMemory(self.name, create=True, size=size)
+            created = True
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(self.name)
+            created = False
+        # Workers come and go; the segment must not be unlinked when one exits
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        self._header = np.ndarray((3,), dtype=HEADER_DTYPE, buffer=self._shm.buf)
+        if created:
+            self._header[1:] = (layout_hash(), capacity)
+            self._header[0] = MAGIC
+        else:
+            self._wait_for_header(capacity)
+
+        self.capacity = capacity
+        self._entries = np.ndarray(
+            (capacity,), dtype=ENTRY_DTYPE, buffer=self._shm.buf, offset=HEADER_SIZE
+        )
+        self._mask = np.uint64(capacity - 1)
+        self._thread_lock = threading.Lock()
+        self._lock_file = open(
+            os.path.join(tempfile.gettempdir(), f"{self.name}.lock"), "a"
+        )
+        logger.info(
+            f"{'Created' if created else 'Attached to'} shared score store "
+            f"{self.name} ({capacity} slots, {size / 1e6:.1f} MB)"
+        )
+
+    def _wait_for_header(self, capacity: int, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while self._header[0] != MAGIC:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Shared store {self.name} was never initialized")
+            time.sleep(0.01)
+        if int(self._header[2]) != capacity:
+            raise ValueError(
+                f"Shared store {self.name} has {int(self._header[2])} slots, "
+                f"not {capacity}; unlink it or use another name"
+            )
+
+    def get_many(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (found mask, feature rows, score rows) for the given keys
+
+        Entries being written during the read count as misses.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        slots = (keys & self._mask).astype(np.intp)
+        entries = self._entries
+        before = entries['seq'][slots]
+        snapshot = entries[slots]
+        after = entries['seq'][slots]
+
+        stable = (before == after) & (before % 2 == 0)
+        found = stable & (snapshot['key'] == keys)
+        hits = int(found.sum())
+        store_lookups.inc(hits, outcome="hit")
+        store_lookups.inc(int((~stable).sum()), outcome="torn")
+        store_lookups.inc(len(keys) - hits - int((~stable).sum()), outcome="miss")
+        return found, snapshot['features'].copy(), snapshot['scores'].copy()
+
+    def put_many(self, keys: np.ndarray, features: np.ndarray, scores: np.ndarray):
+        """Store feature and score rows, replacing what their slots held"""
+        keys = np.asarray(keys, dtype=np.uint64)
+        if not len(keys):
+            return
+        slots = (keys & self._mask).astype(np.intp)
+        entries = self._entries
+        with self._thread_lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                # Keys sharing a slot collapse to the last one, consistently
+                entries['seq'][slots] += np.uint64(1)
+                entries['key'][slots] = keys
+                entries['features'][slots] = features
+                entries['scores'][slots] = scores
+                entries['seq'][slots] += np.uint64(1)
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "occupied": int(np.count_nonzero(self._entries['key'])),
+            "hits": int(store_lookups.value(outcome="hit")),
+            "misses": int(store_lookups.value(outcome="miss")),
+            "torn_reads": int(store_lookups.value(outcome="torn"))
+        }
+
+    def close(self):
+        """Detach this process; the segment stays for the other workers"""
+        self._header = self._entries = None
+        self._shm.close()
+        self._lock_file.close()
+
+    def unlink(self):
+        """Remove the segment for good (after every worker has stopped)"""
+        # SharedMemory.unlink unregisters it from the tracker again
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
@@ -0,0 +1,243 @@
+# ============================================
+# app/services/taxonomy.py
+# Sector and Stage Taxonomy Matching (Aho-Corasick)
+# ============================================
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.services.tokenizer import Tokenizer
+
+# Phrases and synonyms per canonical sector (see deal_columns.SECTORS)
+SECTOR_PHRASES: Dict[str, Tuple[str, ...]] = {
+    'fintech': (
+        'fintech', 'financial technology', 'payments', 'payment processing',
+        'neobank', 'digital banking', 'lending', 'insurtech', 'wealthtech',
+        'regtech', 'embedded finance', 'buy now pay later', 'bnpl'
+    ),
+    'healthtech': (
+        'healthtech', 'health tech', 'digital health', 'healthcare',
+        'medtech', 'telemedicine', 'telehealth', 'biotech', 'diagnostics',
+        'clinical', 'patients'
+    ),
+    'edtech': (
+        'edtech', 'education technology', 'online learning', 'e learning',
+        'elearning', 'upskilling', 'learning management system', 'students'
+    ),
+    'e-commerce': (
+        'e commerce', 'ecommerce', 'online retail', 'marketplace',
+        'direct to consumer', 'd2c', 'dtc', 'online store', 'social commerce'
+    ),
+    'saas': (
+        'saas', 'b2b saas', 'software as a service', 'subscription software',
+        'cloud software', 'vertical saas'
+    ),
+    'ai-ml': (
+        'ai', 'ml', 'artificial intelligence', 'machine learning',
+        'deep learning', 'neural network', 'neural networks', 'generative ai',
+        'genai', 'llm', 'llms', 'large language model', 'large language models',
+        'computer vision', 'natural language processing', 'nlp'
+    ),
+    'blockchain': (
+        'blockchain', 'web3', 'crypto', 'cryptocurrency', 'defi',
+        'decentralized finance', 'nft', 'nfts', 'smart contracts', 'tokenization'
+    ),
+    'iot': (
+        'iot', 'internet of things', 'connected devices', 'smart home',
+        'sensors', 'edge computing', 'industrial iot', 'iiot'
+    ),
+    'cybersecurity': (
+        'cybersecurity', 'cyber security', 'infosec', 'information security',
+        'threat detection', 'zero trust', 'identity and access management',
+        'endpoint security', 'security operations'
+    ),
+    'climate-tech': (
+        'climate tech', 'climatetech', 'cleantech', 'clean energy',
+        'renewable energy', 'renewables', 'solar', 'carbon capture',
+        'decarbonization', 'energy storage', 'sustainability', 'net zero'
+    ),
+    'agritech': (
+        'agritech', 'agtech', 'agriculture', 'precision agriculture',
+        'farming', 'farmers', 'vertical farming', 'food supply chain'
+    ),
+    'mobility': (
+        'mobility', 'electric vehicles', 'electric vehicle', 'ev charging',
+        'ride hailing', 'micromobility', 'autonomous vehicles', 'transportation'
+    ),
+    'real-estate': (
+        'real estate', 'proptech', 'property management', 'construction tech',
+        'contech', 'mortgages', 'rental housing'
+    ),
+    'logistics': (
+        'logistics', 'supply chain', 'freight', 'last mile delivery',
+        'last mile', 'warehousing', 'fulfillment', 'shipping', 'fleet management'
+    ),
+    'hr-tech': (
+        'hr tech', 'hrtech', 'human resources', 'recruiting', 'recruitment',
+        'talent acquisition', 'payroll', 'workforce management',
+        'employee engagement', 'future of work'
+    ),
+    'martech': (
+        'martech', 'marketing technology', 'adtech', 'advertising technology',
+        'digital marketing', 'marketing automation', 'customer engagement',
+        'influencer marketing'
+    ),
+    'consumer': (
+        'consumer', 'consumer apps', 'consumer app', 'b2c', 'consumer brands',
+        'gaming', 'social media', 'creator economy'
+    ),
+    'enterprise': (
+        'enterprise', 'enterprise software', 'b2b', 'fortune 500',
+        'enterprise customers', 'workflow automation'
+    ),
+    'devtools': (
+        'devtools', 'developer tools', 'developer tooling', 'developer platform',
+        'devops', 'api platform', 'open source', 'observability', 'ci cd',
+        'infrastructure as code'
+    ),
+}
+
+# Phrases per canonical stage (see deal_columns.STAGES)
+STAGE_PHRASES: Dict[str, Tuple[str, ...]] = {
+    'pre-seed': ('pre seed', 'preseed', 'angel round', 'friends and family round'),
+    'seed': ('seed', 'seed stage', 'seed round', 'seed funding', 'post seed'),
+    'series-a': ('series a', 'series a round'),
+    'series-b': ('series b', 'series b round'),
+    'series-c': ('series c', 'series c round'),
+    'growth': (
+        'growth stage', 'growth equity', 'growth round', 'late stage',
+        'series d', 'series e', 'pre ipo'
+    ),
+}
+
+# Inferred sectors must be mentioned at least this share as often as
+# the most mentioned one, so passing mentions in long decks don't count
+MIN_SECTOR_SHARE = 0.25
+
+
+@dataclass(frozen=True)
+class TaxonomyHits:
+    """Mentions of each canonical sector and stage in a text"""
+    sectors: Counter
+    stages: Counter
+
+    def top_sectors(self, min_share: float = MIN_SECTOR_SHARE) -> Tuple[str, ...]:
+        """Sectors mentioned about as often as the most mentioned one"""
+        if not self.sectors:
+            return ()
+        floor = max(self.sectors.values()) * min_share
+        return tuple(s for s, n in self.sectors.most_common() if n >= floor)
+
+    def top_stage(self) -> Optional[str]:
+        """Most mentioned stage"""
+        return self.stages.most_common(1)[0][0] if self.stages else None
+
+
+class AhoCorasick:
+    """
+    Multi-phrase matcher over word sequences
+
+    Phrases are compiled once into a trie of words with failure links,
+    so every phrase occurrence in a text is found in a single scan that
+    is linear in the number of words, however many phrases there are.
+    Matching whole words keeps 'ai' from matching inside 'detail'.
+    Matches don't overlap: the leftmost, then longest phrase wins and
+    phrases inside it aren't reported ('series a round' once, not also
+    'series a'; 'b2b saas', not also 'b2b').
+    """
+
+    def __init__(self, phrases: Sequence[Tuple[Tuple[str, ...], Any]]):
+        # Node 0 is the root; goto[node][word] -> node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._depth: List[int] = [0]
+        own: List[Any] = [None]
+        for words, label in phrases:
+            node = 0
+            for word in words:
+                child = self._goto[node].get(word)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][word] = child
+                    self._goto.append({})
+                    self._depth.append(self._depth[node] + 1)
+                    own.append(None)
+                node = child
+            own[node] = label
+
+        # Breadth-first failure links; a node without a phrase of its
+        # own reports the longest phrase ending at its failure node
+        self._fail = [0] * len(self._goto)
+        self._output: List[Optional[Tuple[Any, int]]] = [None] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            if own[node] is not None:
+                self._output[node] = (own[node], self._depth[node])
+        for node in queue:
+            for word, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                self._output[child] = (
+                    (own[child], self._depth[child]) if own[child] is not None
+                    else self._output[self._fail[child]]
+                )
+                queue.append(child)
+
+    def find(self, words: Sequence[str]) -> List[Tuple[Any, int, int]]:
+        """(label, start, end) word spans of the phrases found, in order"""
+        goto, fail, output = self._goto, self._fail, self._output
+        # Longest phrase ending at each word; shorter ones ending there
+        # lie inside it and would be dropped below anyway
+        candidates = []
+        node = 0
+        for position, word in enumerate(words):
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            if output[node] is not None:
+                label, length = output[node]
+                candidates.append((position + 1 - length, -length, label))
+
+        # Leftmost-longest: keep a span only if it starts after the last kept one
+        matches = []
+        end = 0
+        for start, negative_length, label in sorted(candidates, key=lambda c: c[:2]):
+            if start >= end:
+                end = start - negative_length
+                matches.append((label, start, end))
+        return matches
+
+
+class TaxonomyMatcher:
+    """
+    Canonical sectors and stages mentioned in free text
+
+    Catches the phrases and short terms ('machine learning', 'B2B SaaS',
+    'series A', 'AI') that the keyword tokenizer drops or splits.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        sectors: Dict[str, Tuple[str, ...]] = SECTOR_PHRASES,
+        stages: Dict[str, Tuple[str, ...]] = STAGE_PHRASES
+    ):
+        self.tokenizer = tokenizer
+        phrases = []
+        for kind, taxonomy in (('sector', sectors), ('stage', stages)):
+            for label, synonyms in taxonomy.items():
+                for phrase in synonyms + (label,):
+                    words = tuple(tokenizer.normalize(phrase).split())
+                    if words:
+                        phrases.append((words, (kind, label)))
+        self._automaton = AhoCorasick(phrases)
+
+    def match(self, text: str) -> TaxonomyHits:
+        sectors: Counter = Counter()
+        stages: Counter = Counter()
+        words = self.tokenizer.normalize(text).split()
+        for (kind, label), _, _ in self._automaton.find(words):
+            (sectors if kind == 'sector' else stages)[label] += 1
+        return TaxonomyHits(sectors=sectors, stages=stages)
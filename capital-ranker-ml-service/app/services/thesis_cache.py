@@ -0,0 +1,200 @@
+# ============================================
+# app/services/thesis_cache.py
+# Cache of Preprocessed Investor Theses
+# ============================================
+
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from app.services.sentence_index import SentenceIndex
+from app.services.shared_records import Records, SharedRecords
+
+
+def content_hash(
+    text: str,
+    sectors: Sequence[str] = (),
+    stages: Sequence[str] = ()
+) -> str:
+    """Stable hash of thesis content used for cache invalidation"""
+    digest = hashlib.sha256(text.encode("utf-8"))
+    for values in (sectors, stages):
+        digest.update(b"\0" + "\x1f".join(sorted(values)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ThesisChanged(Exception):
+    """A registered thesis no longer has the content the caller expects"""
+
+
+@dataclass(frozen=True)
+class PreparedThesis:
+    """Tokenized, keyword-extracted and vectorized thesis"""
+    thesis_id: str
+    content_hash: str
+    text: str
+    clean_text: str
+    keywords: List[str]
+    term_counts: Counter
+    sentence_index: SentenceIndex
+    sectors: Tuple[str, ...] = ()
+    stages: Tuple[str, ...] = ()
+    # Canonical sectors and stages mentioned in the text
+    text_sectors: Tuple[str, ...] = ()
+    text_stages: Tuple[str, ...] = ()
+
+
+class ThesisCache:
+    """
+    Bounded LRU cache of prepared theses keyed by thesis ID
+
+    With a `store`, registrations live in a file shared by all workers:
+    each worker prepares the theses another has registered (and drops
+    removed ones) on its next lookup, so every worker matches against
+    the same corpus. The bound then evicts the least recently
+    registered thesis, as lookups aren't written back.
+    """
+
+    def __init__(
+        self,
+        prepare: Callable[..., PreparedThesis],
+        max_size: int = 1024,
+        store: Optional[SharedRecords] = None
+    ):
+        self._prepare = prepare
+        self._max_size = max_size
+        self.store = store
+        self._entries: "OrderedDict[str, PreparedThesis]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every change so corpus-level indexes know to rebuild
+        self.version = 0
+        self._fingerprint: Tuple[int, str] = (-1, "")
+        if store is not None:
+            self._apply(store.load())
+
+    def _apply(self, records: Records):
+        """
+        Mirror the shared store, preparing only new or changed theses
+        (lock held)
+        """
+        entries: "OrderedDict[str, PreparedThesis]" = OrderedDict()
+        for thesis_id, record in records.items():
+            entry = self._entries.get(thesis_id)
+            digest = content_hash(record["text"], record["sectors"], record["stages"])
+            if entry is None or entry.content_hash != digest:
+                entry = self._prepare(
+                    thesis_id, record["text"], record["sectors"], record["stages"]
+                )
+            entries[thesis_id] = entry
+        if list(entries.items()) != list(self._entries.items()):
+            self._entries = entries
+            self.version += 1
+
+    def _sync(self):
+        """Reload the shared store if another worker changed it (lock held)"""
+        if self.store is not None and self.store.changed():
+            self._apply(self.store.load())
+
+    def register(
+        self,
+        thesis_id: str,
+        text: str,
+        sectors: Sequence[str] = (),
+        stages: Sequence[str] = ()
+    ) -> Tuple[PreparedThesis, bool]:
+        """
+        Store the prepared form of a thesis
+
+        Returns the entry and whether it was (re)built. Re-registering
+        unchanged content keeps the existing entry.
+        """
+        digest = content_hash(text, sectors, stages)
+
+        if self.store is not None:
+            def save(records: Records) -> bool:
+                existing = records.get(thesis_id)
+                if existing is not None and content_hash(
+                    existing["text"], existing["sectors"], existing["stages"]
+                ) == digest:
+                    return False
+                records.pop(thesis_id, None)
+                records[thesis_id] = {
+                    "text": text, "sectors": list(sectors), "stages": list(stages)
+                }
+                while len(records) > self._max_size:
+                    del records[next(iter(records))]
+                return True
+
+            with self._lock:
+                records, updated = self.store.update(save)
+                self._apply(records)
+                return self._entries[thesis_id], updated
+
+        with self._lock:
+            existing = self._entries.get(thesis_id)
+            if existing is not None and existing.content_hash == digest:
+                self._entries.move_to_end(thesis_id)
+                return existing, False
+
+        prepared = self._prepare(thesis_id, text, sectors, stages)
+
+        with self._lock:
+            self._entries[thesis_id] = prepared
+            self._entries.move_to_end(thesis_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+            self.version += 1
+
+        return prepared, True
+
+    def get(self, thesis_id: str) -> Optional[PreparedThesis]:
+        """Look up a registered thesis, refreshing its recency"""
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(thesis_id)
+            if entry is not None and self.store is None:
+                self._entries.move_to_end(thesis_id)
+            return entry
+
+    def remove(self, thesis_id: str) -> bool:
+        """Drop a registered thesis"""
+        with self._lock:
+            if self.store is not None:
+                def delete(records: Records) -> bool:
+                    return records.pop(thesis_id, None) is not None
+                records, removed = self.store.update(delete)
+                self._apply(records)
+                return removed
+            removed = self._entries.pop(thesis_id, None) is not None
+            if removed:
+                self.version += 1
+            return removed
+
+    def fingerprint(self) -> str:
+        """
+        Hash of the registered theses' content, recomputed only after
+        changes; equal in every worker that holds the same theses
+        """
+        with self._lock:
+            self._sync()
+            if self._fingerprint[0] != self.version:
+                digest = hashlib.sha256()
+                for thesis_id in sorted(self._entries):
+                    digest.update(
+                        f"{thesis_id}\0{self._entries[thesis_id].content_hash}\n".encode("utf-8")
+                    )
+                self._fingerprint = (self.version, digest.hexdigest())
+            return self._fingerprint[1]
+
+    def values(self) -> List[PreparedThesis]:
+        """Snapshot of all registered theses"""
+        with self._lock:
+            self._sync()
+            return list(self._entries.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._entries)
@@ -0,0 +1,107 @@
+# ============================================
+# app/services/tokenizer.py
+# Text Normalization and Tokenization
+# ============================================
+
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Pattern
+
+ENGLISH_STOP_WORDS: FrozenSet[str] = frozenset([
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that',
+    'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+])
+
+BENGALI_STOP_WORDS: FrozenSet[str] = frozenset(
+    unicodedata.normalize('NFC', word) for word in [
+        'এবং', 'ও', 'এই', 'সেই', 'যে', 'যা', 'এর', 'তার', 'তাদের', 'আমাদের',
+        'করে', 'করা', 'করতে', 'কে', 'থেকে', 'জন্য', 'সাথে', 'সঙ্গে', 'না',
+        'হয়', 'হবে', 'হয়েছে', 'ছিল', 'একটি', 'এক', 'আর', 'বা', 'কিন্তু',
+        'তিনি', 'তারা', 'আমরা', 'আমি', 'সে', 'তা', 'দিয়ে', 'নেই', 'কোন',
+        'কোনো', 'প্রতি', 'মধ্যে', 'পর', 'আগে', 'যদি', 'তবে', 'খুব'
+    ]
+)
+
+STOP_WORDS: Dict[str, FrozenSet[str]] = {
+    'en': ENGLISH_STOP_WORDS,
+    'bn': BENGALI_STOP_WORDS,
+}
+
+ALL_STOP_WORDS: FrozenSet[str] = frozenset().union(*STOP_WORDS.values())
+
+ASCII_STRIP = re.compile(r'[^a-z0-9\s]')
+
+
+@lru_cache(maxsize=1)
+def unicode_strip_pattern() -> Pattern:
+    """
+    Pattern matching everything except word characters and combining marks
+
+    `\\w` alone does not cover combining marks, which would split Bengali
+    and other Indic words apart. The mark ranges are collected from the
+    Basic Multilingual Plane once, on first use.
+    """
+    ranges = []
+    start = previous = None
+    for code in range(0x80, min(sys.maxunicode, 0xFFFF) + 1):
+        if unicodedata.category(chr(code)) in ('Mn', 'Mc', 'Me'):
+            if previous is not None and code == previous + 1:
+                previous = code
+                continue
+            if start is not None:
+                ranges.append((start, previous))
+            start = previous = code
+    if start is not None:
+        ranges.append((start, previous))
+
+    marks = ''.join(
+        f'\\u{lo:04x}' if lo == hi else f'\\u{lo:04x}-\\u{hi:04x}'
+        for lo, hi in ranges
+    )
+    return re.compile(rf'[^\w\s{marks}]|_')
+
+
+class Tokenizer:
+    """
+    Normalize text and split it into content terms
+
+    English-only (ASCII) text takes the original lowercase/[a-z0-9] path.
+    Other text is NFC-normalized, casefolded and split on `\\w`, so
+    accented names and non-Latin scripts survive.
+    """
+
+    def __init__(self, mode: str = 'unicode', min_length: int = 4):
+        if mode not in ('unicode', 'ascii'):
+            raise ValueError(f"Unknown tokenizer mode: {mode}")
+        self.mode = mode
+        self.min_length = min_length
+
+    def normalize(self, text: str) -> str:
+        """Clean text into space-separated lowercase tokens"""
+        if self.mode == 'ascii' or text.isascii():
+            # Fast path for English-only text
+            text = ASCII_STRIP.sub(' ', text.lower())
+        else:
+            text = unicodedata.normalize('NFC', text).casefold()
+            text = unicode_strip_pattern().sub(' ', text)
+
+        return ' '.join(text.split())
+
+    def filter(self, normalized: str) -> List[str]:
+        """Drop stop words and short tokens from normalized text"""
+        stop_words = (
+            ENGLISH_STOP_WORDS if normalized.isascii() else ALL_STOP_WORDS
+        )
+        return [
+            w for w in normalized.split()
+            if w not in stop_words and len(w) >= self.min_length
+        ]
+
+    def tokenize(self, text: str) -> List[str]:
+        """Normalize raw text into content terms"""
+        return self.filter(self.normalize(text))
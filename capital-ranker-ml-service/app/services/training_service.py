@@ -0,0 +1,273 @@
+# ============================================
+# app/services/training_service.py
+# Out-of-Core Model Training from Historical Deal Outcomes
+# ============================================
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.linear_model import LinearModel, StackedSGD
+from app.services.deal_columns import DealColumns
+from app.services.deal_files import read_chunks
+from app.services.feature_engineering import FeatureEngineering, SUB_SCORE_FEATURES
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Predicted-probability bins for the streaming AUC
+AUC_BINS = 1000
+
+TRUE_STRINGS = {'true', 'yes', 'y'}
+FALSE_STRINGS = {'false', 'no', 'n'}
+
+
+@dataclass
+class TrainingConfig:
+    """Hyperparameters and input options of a training run"""
+    task: str = 'logistic'
+    features: Sequence[str] = SUB_SCORE_FEATURES
+    outcome: str = 'outcome'
+    fmt: Optional[str] = None
+    chunk_size: int = 50000
+    batch_size: int = 512
+    epochs: int = 5
+    folds: int = 5
+    learning_rate: float = 0.01
+    l2: float = 1e-4
+    seed: int = 0
+
+
+class TrainingService:
+    """
+    Fit a linear or logistic model on a deal history too large for memory
+
+    The file is streamed in chunks through DealColumns validation and
+    FeatureEngineering, so memory depends on the chunk size only. One
+    pass collects standardization statistics, each epoch is one pass of
+    mini-batch updates to the k cross-validation fold models and the
+    final model at once, and a last pass evaluates them. Rows are
+    assigned to folds by a hash of their row number, so every pass
+    agrees without storing the assignment.
+    """
+
+    def __init__(self, config: TrainingConfig, scoring_service=None):
+        self.config = config
+        self.features = FeatureEngineering(scoring_service)
+        self.team_scores = scoring_service.team_scores if scoring_service else None
+        self.skipped_invalid = 0
+        self.skipped_outcome = 0
+
+    def chunks(self, path: str) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(features, outcomes, row numbers) of the usable rows per chunk"""
+        self.skipped_invalid = 0
+        self.skipped_outcome = 0
+        start = 0
+        for records in read_chunks(path, self.config.chunk_size, self.config.fmt):
+            columns, errors = DealColumns.from_records(records, self.team_scores)
+            invalid, _ = columns.check(errors)
+            outcomes = np.array(
+                [self._outcome(record) for record in records], dtype=np.float64
+            )
+            no_outcome = np.isnan(outcomes) & ~invalid
+
+            self.skipped_invalid += int(invalid.sum())
+            self.skipped_outcome += int(no_outcome.sum())
+            keep = np.flatnonzero(~invalid & ~no_outcome)
+            if len(keep):
+                X = self.features.transform(columns.take(keep), self.config.features)
+                yield X, outcomes[keep], keep + start
+            start += len(records)
+
+    def feature_stats(self, path: str) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Mean and standard deviation per feature, merged chunk by chunk"""
+        n = 0
+        mean = np.zeros(len(self.config.features))
+        m2 = np.zeros(len(self.config.features))
+        for X, _, _ in self.chunks(path):
+            # Chan et al. parallel variance merge
+            k = len(X)
+            chunk_mean = X.mean(axis=0)
+            delta = chunk_mean - mean
+            total = n + k
+            mean = mean + delta * k / total
+            m2 = m2 + ((X - chunk_mean) ** 2).sum(axis=0) + delta ** 2 * n * k / total
+            n = total
+        scale = np.sqrt(m2 / n) if n else np.ones_like(mean)
+        scale[scale == 0] = 1.0
+        return mean, scale, n
+
+    def train(self, path: str, version: str) -> LinearModel:
+        """Cross-validate, fit the final model and return it with metrics"""
+        config = self.config
+        started = time.perf_counter()
+        mean, scale, rows = self.feature_stats(path)
+        if rows == 0:
+            raise ValueError(
+                f"No usable rows in '{path}' (need valid deals with a '{config.outcome}'"
+                + (" between 0 and 1)" if config.task == 'logistic' else ")")
+            )
+        logger.info(
+            f"Training on {rows} rows ({self.skipped_invalid} invalid, "
+            f"{self.skipped_outcome} without a usable outcome skipped)"
+        )
+
+        folds = config.folds if config.folds > 1 else 0
+        sgd = StackedSGD(
+            config.task, folds + 1, len(config.features),
+            learning_rate=config.learning_rate, l2=config.l2
+        )
+        rng = np.random.default_rng(config.seed)
+
+        for epoch in range(config.epochs):
+            for X, y, row_numbers in self.chunks(path):
+                X = (X - mean) / scale
+                mask = self._fold_mask(row_numbers, folds)
+                # Shuffle within the chunk; histories are often sorted by date
+                order = rng.permutation(len(X))
+                for i in range(0, len(X), config.batch_size):
+                    batch = order[i:i + config.batch_size]
+                    sgd.step(X[batch], y[batch], mask[batch])
+            logger.info(
+                f"Epoch {epoch + 1}/{config.epochs} done "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+
+        evaluation = self._evaluate(path, sgd, mean, scale, folds)
+        metrics = {
+            "rows": rows,
+            "skipped_invalid": self.skipped_invalid,
+            "skipped_outcome": self.skipped_outcome,
+            "epochs": config.epochs,
+            "train": evaluation[-1],
+            "training_seconds": round(time.perf_counter() - started, 2)
+        }
+        if folds:
+            metrics["cv"] = _summarize_folds(evaluation[:-1])
+
+        model = sgd.model(
+            folds, config.features, mean, scale, version=version, metrics=metrics
+        )
+        weights = model.scoring_weights()
+        if weights is not None:
+            metrics["scoring_weights"] = weights.model_dump()
+        return model
+
+    def _evaluate(
+        self,
+        path: str,
+        sgd: StackedSGD,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        folds: int
+    ) -> List[Dict[str, float]]:
+        """Held-out metrics per fold model, then training metrics of the final one"""
+        n_models = folds + 1
+        logistic = self.config.task == 'logistic'
+        n = np.zeros(n_models)
+        loss = np.zeros(n_models)
+        correct = np.zeros(n_models)
+        sum_y = np.zeros(n_models)
+        sum_y2 = np.zeros(n_models)
+        histograms = np.zeros((n_models, 2, AUC_BINS), dtype=np.int64)
+
+        for X, y, row_numbers in self.chunks(path):
+            predictions = sgd.predict((X - mean) / scale)
+            # Fold models are scored on their held-out rows only
+            mask = ~self._fold_mask(row_numbers, folds)
+            mask[:, -1] = True
+            n += mask.sum(axis=0)
+            if logistic:
+                p = np.clip(predictions, 1e-12, 1 - 1e-12)
+                row_loss = -(y[:, None] * np.log(p) + (1 - y[:, None]) * np.log(1 - p))
+                loss += (row_loss * mask).sum(axis=0)
+                correct += (((p >= 0.5) == (y[:, None] >= 0.5)) & mask).sum(axis=0)
+                bins = np.minimum((p * AUC_BINS).astype(np.int64), AUC_BINS - 1)
+                positive = (y >= 0.5).astype(np.int64)
+                for m in range(n_models):
+                    rows = mask[:, m]
+                    np.add.at(histograms[m], (positive[rows], bins[rows, m]), 1)
+            else:
+                loss += (((predictions - y[:, None]) ** 2) * mask).sum(axis=0)
+                sum_y += (y[:, None] * mask).sum(axis=0)
+                sum_y2 += ((y ** 2)[:, None] * mask).sum(axis=0)
+
+        results = []
+        for m in range(n_models):
+            count = max(n[m], 1)
+            if logistic:
+                results.append({
+                    "rows": int(n[m]),
+                    "log_loss": round(float(loss[m] / count), 6),
+                    "accuracy": round(float(correct[m] / count), 6),
+                    "auc": _histogram_auc(histograms[m])
+                })
+            else:
+                variance = sum_y2[m] / count - (sum_y[m] / count) ** 2
+                mse = loss[m] / count
+                results.append({
+                    "rows": int(n[m]),
+                    "rmse": round(float(np.sqrt(mse)), 6),
+                    "r2": round(float(1 - mse / variance), 6) if variance > 0 else None
+                })
+        return results
+
+    def _outcome(self, record: Any) -> float:
+        """
+        Numeric outcome of a record, NaN (skipped) when missing or
+        unusable; logistic labels must lie in [0, 1]
+        """
+        if not isinstance(record, dict):
+            return np.nan
+        value = record.get(self.config.outcome)
+        if isinstance(value, str):
+            value = value.strip().lower()
+            if value in TRUE_STRINGS | FALSE_STRINGS:
+                return float(value in TRUE_STRINGS)
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return np.nan
+        if not np.isfinite(number):
+            return np.nan
+        if self.config.task == 'logistic' and not 0 <= number <= 1:
+            return np.nan
+        return number
+
+    @staticmethod
+    def _fold_mask(row_numbers: np.ndarray, folds: int) -> np.ndarray:
+        """(rows, folds + 1) training mask; the last model trains on every row"""
+        mask = np.ones((len(row_numbers), folds + 1), dtype=bool)
+        if folds:
+            # Multiplicative hash so folds don't follow the file order
+            fold = (row_numbers.astype(np.uint64) * np.uint64(2654435761)) % np.uint64(2 ** 32)
+            fold = fold % np.uint64(folds)
+            mask[:, :-1] = fold[:, None] != np.arange(folds, dtype=np.uint64)
+        return mask
+
+
+def _histogram_auc(histogram: np.ndarray) -> Optional[float]:
+    """ROC AUC from (negative, positive) counts per probability bin"""
+    negatives, positives = histogram.astype(np.float64)
+    total_negative, total_positive = negatives.sum(), positives.sum()
+    if not total_negative or not total_positive:
+        return None
+    # Positives ranked above each negative, ties counting half
+    above = total_positive - np.cumsum(positives)
+    pairs = np.sum(negatives * (above + 0.5 * positives))
+    return round(float(pairs / (total_negative * total_positive)), 6)
+
+
+def _summarize_folds(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Mean and standard deviation of each metric across folds"""
+    summary: Dict[str, Any] = {"folds": len(results)}
+    for name in results[0]:
+        if name == "rows":
+            continue
+        values = [r[name] for r in results if r[name] is not None]
+        if values:
+            summary[name] = round(float(np.mean(values)), 6)
+            summary[f"{name}_std"] = round(float(np.std(values)), 6)
+    return summary
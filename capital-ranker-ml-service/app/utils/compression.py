@@ -0,0 +1,73 @@
+# ============================================
+# app/utils/compression.py
+# Content-Encoding Negotiation and Compression
+# ============================================
+
+import gzip
+from typing import Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional; gzip is always available
+    zstandard = None
+
+# Supported content codings, most preferred first
+ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """Content codings of an Accept-Encoding header and their q-values"""
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header: Optional[str]) -> Optional[str]:
+    """
+    Preferred supported coding the client accepts, or None to send the
+    body as is
+
+    Ties on q-value go to the order of ENCODINGS (zstd before gzip).
+    """
+    if not header:
+        return None
+    accepted = accepted_encodings(header)
+    best, best_q = None, 0.0
+    for coding in ENCODINGS:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data: bytes, coding: str) -> bytes:
+    if coding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if coding == "gzip":
+        # mtime=0 keeps the output a function of the input alone
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content coding '{coding}'")
+
+
+def decompress(data: bytes, coding: str) -> bytes:
+    if coding == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    if coding == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"Unsupported content coding '{coding}'")
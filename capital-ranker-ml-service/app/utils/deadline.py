@@ -0,0 +1,80 @@
+# ============================================
+# app/utils/deadline.py
+# Request Deadlines and Cooperative Cancellation
+# ============================================
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from app.utils.metrics import metrics
+
+cancellations = metrics.counter(
+    "ml_requests_cancelled_total",
+    "Requests abandoned because their deadline passed or the client disconnected",
+    labels=("reason", "stage")
+)
+
+
+class DeadlineExceeded(Exception):
+    """Work stopped because nobody is waiting for its result any more"""
+
+    def __init__(self, reason: str, stage: str):
+        super().__init__(f"Request abandoned ({reason}) during {stage}")
+        self.reason = reason
+        self.stage = stage
+
+
+class Deadline:
+    """
+    Point in (monotonic) time after which a request's result is useless,
+    plus a flag for clients that went away early
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+        self.cancel_reason: Optional[str] = None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a time limit"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def cancel(self, reason: str = "disconnected"):
+        if self.cancel_reason is None:
+            self.cancel_reason = reason
+
+    def extend(self, other: Optional["Deadline"]):
+        """Stretch to also cover another request's deadline"""
+        if other is None or other.expires_at is None:
+            self.expires_at = None
+        elif self.expires_at is not None:
+            self.expires_at = max(self.expires_at, other.expires_at)
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why the work should stop, or None while it is still wanted"""
+        if self.cancel_reason is not None:
+            return self.cancel_reason
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            return "timeout"
+        return None
+
+    def check(self, stage: str):
+        """Raise DeadlineExceeded if the result is no longer wanted"""
+        reason = self.reason
+        if reason is not None:
+            cancellations.inc(reason=reason, stage=stage)
+            raise DeadlineExceeded(reason, stage)
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def check_deadline(stage: str):
+    """Checkpoint between pipeline stages of the current request"""
+    deadline = current_deadline.get()
+    if deadline is not None:
+        deadline.check(stage)
+
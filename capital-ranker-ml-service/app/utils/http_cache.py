@@ -0,0 +1,212 @@
+# ============================================
+# app/utils/http_cache.py
+# ETags, Conditional Requests and Cached Compressed Responses
+# ============================================
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.utils.compression import compress, decompress, negotiate
+from app.utils.metrics import metrics
+from app.utils.single_flight import canonical_key
+
+response_requests = metrics.counter(
+    "ml_response_cache_requests_total",
+    "Conditional and cached responses, by outcome",
+    labels=("outcome",)
+)
+
+IDENTITY = "identity"
+# Headers describing the body, which the cached entry sets itself
+BODY_HEADERS = ("content-length", "content-type", "content-encoding")
+
+
+def request_etag(*parts: Any) -> str:
+    """
+    Entity tag (unquoted) of a response fully determined by `parts`:
+    the canonical request hash plus the model and state versions it
+    depends on
+    """
+    return canonical_key(*parts)[:32]
+
+
+def body_hash(body: bytes) -> str:
+    """Hash of a raw request body, for payloads that aren't parsed up front"""
+    return hashlib.sha256(body).hexdigest()
+
+
+def format_etag(etag: str, coding: Optional[str] = None) -> str:
+    """
+    Quoted ETag header value; each content coding gets its own tag,
+    as the bytes differ
+    """
+    return f'"{etag}-{coding}"' if coding and coding != IDENTITY else f'"{etag}"'
+
+
+def if_none_match(request: Request, etag: str) -> Optional[str]:
+    """
+    The If-None-Match tag that matches `etag` in any coding, if any
+
+    Comparison is weak, as RFC 9110 specifies for If-None-Match.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    for tag in header.split(","):
+        tag = tag.strip()
+        value = tag.removeprefix("W/").strip('"')
+        if value.split("-", 1)[0] == etag:
+            return tag
+    return None
+
+
+def not_modified(tag: str, vary: Optional[str] = None) -> Response:
+    """304 for a client whose copy is current; no body is computed"""
+    response_requests.inc(outcome="not_modified")
+    headers = {"ETag": tag}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=304, headers=headers)
+
+
+@dataclass
+class CachedResponse:
+    """A rendered 200 response with its body in one or more codings"""
+    media_type: Optional[str]
+    headers: Dict[str, str]
+    size: int  # Uncompressed body bytes
+    bodies: Dict[str, bytes]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(body) for body in self.bodies.values())
+
+
+class ResponseCache:
+    """
+    Byte-bounded LRU of rendered responses keyed by ETag
+
+    Bodies are stored in the codings clients asked for (just the
+    compressed one, usually), so a hit skips both serialization and
+    compression. A coding not yet stored is derived from a stored one
+    and added. Bodies under `min_compress_bytes` are always sent as is.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, min_compress_bytes: int = 1024):
+        self.max_bytes = max_bytes
+        self.min_compress_bytes = min_compress_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, etag: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is not None:
+                self._entries.move_to_end(etag)
+            return entry
+
+    def put(self, etag: str, entry: CachedResponse):
+        """Store or replace an entry, evicting the least recently used"""
+        if entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(etag, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[etag] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def coding_for(self, entry: CachedResponse, accept_encoding: Optional[str]) -> str:
+        """Coding to send `entry` in for a client's Accept-Encoding"""
+        if entry.size < self.min_compress_bytes:
+            return IDENTITY
+        return negotiate(accept_encoding) or IDENTITY
+
+    def encode(self, etag: str, entry: CachedResponse, coding: str) -> bytes:
+        """Body of `entry` in `coding`, compressing (and storing) it if needed"""
+        body = entry.bodies.get(coding)
+        if body is not None:
+            return body
+        source_coding, source = next(iter(entry.bodies.items()))
+        raw = source if source_coding == IDENTITY else decompress(source, source_coding)
+        body = raw if coding == IDENTITY else compress(raw, coding)
+        self.put(etag, CachedResponse(
+            media_type=entry.media_type,
+            headers=entry.headers,
+            size=entry.size,
+            bodies={**entry.bodies, coding: body}
+        ))
+        return body
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+async def conditional_response(
+    request: Request,
+    etag: str,
+    render: Callable[[], Awaitable[Response]],
+    cache: ResponseCache
+) -> Response:
+    """
+    Answer a request whose response is fully determined by `etag`
+
+    A matching If-None-Match gets a 304 before anything is computed; a
+    cached response is sent in the negotiated coding without rendering;
+    otherwise `render` runs and its 200 response is compressed when
+    large enough and cached. Other responses pass through untouched.
+    """
+    vary = "Accept, Accept-Encoding"
+    tag = if_none_match(request, etag)
+    if tag is not None:
+        return not_modified(tag, vary)
+
+    entry = cache.get(etag)
+    if entry is None:
+        response_requests.inc(outcome="miss")
+        response = await render()
+        if response.status_code != 200:
+            return response
+        entry = CachedResponse(
+            media_type=response.media_type,
+            headers={
+                name: value for name, value in response.headers.items()
+                if name not in BODY_HEADERS
+            },
+            size=len(response.body),
+            bodies={IDENTITY: response.body}
+        )
+        coding = cache.coding_for(entry, request.headers.get("accept-encoding"))
+        if coding != IDENTITY:
+            # Only the coding that is sent is kept
+            entry.bodies = {coding: compress(response.body, coding)}
+        cache.put(etag, entry)
+    else:
+        response_requests.inc(outcome="hit")
+        coding = cache.coding_for(entry, request.headers.get("accept-encoding"))
+
+    headers = {**entry.headers, "ETag": format_etag(etag, coding), "Vary": vary}
+    if coding != IDENTITY:
+        headers["Content-Encoding"] = coding
+    return Response(
+        content=cache.encode(etag, entry, coding),
+        media_type=entry.media_type,
+        headers=headers
+    )
@@ -21,7 +21,8 @@ def setup_logger():
     )
     console_handler.setFormatter(formatter)
     
-    # Add handler
-    logger.addHandler(console_handler)
+    # Add handler once, however many modules ask for the logger
+    if not logger.handlers:
+        logger.addHandler(console_handler)
     
     return logger
\ No newline at end of file
@@ -0,0 +1,94 @@
+# ============================================
+# app/utils/micro_batcher.py
+# Micro-Batching of Concurrent Single-Item Requests
+# ============================================
+
+import asyncio
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.deadline import current_deadline
+
+
+class MicroBatcher:
+    """
+    Group concurrent single-item calls into calls of a batch function
+
+    When idle, pending items are dispatched on the next event-loop
+    iteration, so requests arriving together share a batch without any
+    added wait. While a batch is running, new items accumulate until it
+    finishes, `max_batch_size` items are pending or `max_wait_ms` has
+    passed since the first of them, whichever comes first. The batch
+    function runs in the threadpool and must return one result per
+    item, in order.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0
+    ):
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Handle] = None
+        self._running = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Result of the batch function for one item"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            delay = self.max_wait if self._running else 0
+            self._timer = loop.call_later(delay, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch = self._pending[:self.max_batch_size]
+        del self._pending[:self.max_batch_size]
+        self._running += 1
+        asyncio.ensure_future(self._run(batch))
+
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        # The batch serves many requests, so no single request's deadline
+        # applies; items whose caller already went away are skipped
+        current_deadline.set(None)
+        batch = [(item, future) for item, future in batch if not future.done()]
+        try:
+            if not batch:
+                return
+            results = await run_in_threadpool(self.process, [item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch function returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._running -= 1
+            # Items that waited for this batch go out now
+            if self._pending:
+                self._flush()
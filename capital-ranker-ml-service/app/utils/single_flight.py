@@ -0,0 +1,99 @@
+# ============================================
+# app/utils/single_flight.py
+# Coalescing of Identical Concurrent Requests
+# ============================================
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.deadline import Deadline, current_deadline
+
+
+def canonical_key(*parts: Any) -> str:
+    """
+    Hash of request content that ignores key order and formatting
+
+    Pydantic models are dumped in JSON mode first, so equal requests
+    hash equally however the client serialized them.
+    """
+    def dump(value: Any) -> Any:
+        if isinstance(value, BaseModel):
+            return value.model_dump(mode="json")
+        raise TypeError(f"Cannot hash {type(value).__name__}")
+
+    payload = json.dumps(
+        parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=dump
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """One shared computation, its deadline and the callers awaiting it"""
+
+    def __init__(self, deadline: Deadline):
+        self.deadline = deadline
+        self.callers = 0
+        self.task: Optional[asyncio.Future] = None
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time
+
+    Callers arriving while a computation for their key is in flight
+    await it and share its result (or exception) instead of computing
+    again. Blocking functions run in the threadpool, coroutine functions
+    on the event loop. The computation gets its own Deadline covering
+    every caller's: a caller going away does not cancel it, but once all
+    of them have, its remaining stages are skipped.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Flight] = {}
+
+    async def run(self, key: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Result of func(*args, **kwargs), shared among callers with the same key"""
+        caller_deadline = current_deadline.get()
+        flight = self._calls.get(key)
+        if flight is None:
+            flight = _Flight(Deadline())
+            flight.deadline.expires_at = (
+                caller_deadline.expires_at if caller_deadline is not None else None
+            )
+            flight.task = asyncio.ensure_future(
+                self._compute(flight.deadline, func, args, kwargs)
+            )
+            self._calls[key] = flight
+            flight.task.add_done_callback(lambda done: self._finish(key, flight))
+        else:
+            flight.deadline.extend(caller_deadline)
+
+        flight.callers += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.callers -= 1
+            if not flight.callers and not flight.task.done():
+                flight.deadline.cancel("abandoned")
+
+    async def _compute(self, deadline: Deadline, func: Callable[..., Any], args, kwargs) -> Any:
+        # Runs in its own task, so this only affects the shared computation
+        current_deadline.set(deadline)
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        return await run_in_threadpool(func, *args, **kwargs)
+
+    def _finish(self, key: str, flight: _Flight):
+        if self._calls.get(key) is flight:
+            del self._calls[key]
+        # Mark the exception retrieved in case every caller went away
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
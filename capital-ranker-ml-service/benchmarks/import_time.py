@@ -0,0 +1,84 @@
+# ============================================
+# benchmarks/import_time.py
+# Import-Time Budget for the Application Module
+# ============================================
+
+"""
+Measure how long `import app.main` takes in a fresh interpreter
+
+Run from the service root:
+
+    python benchmarks/import_time.py --budget-ms 1500
+
+Prints the median wall time over several runs and the slowest imports
+from `python -X importtime`, and exits non-zero when the median is over
+budget. Services are built by the container, not at import, so this is
+the cost a new worker pays before it can accept connections.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_wall_ms(module: str) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=SERVICE_ROOT, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def slowest_imports(module: str, top: int) -> List[Tuple[float, str]]:
+    """(cumulative ms, module) of the slowest top-level imports"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVICE_ROOT, check=True, capture_output=True, text=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        # The module itself, what it imports directly, and our own modules
+        if depth <= 1 or name.strip().startswith("app."):
+            name = name.strip()
+            timings[name] = max(timings.get(name, 0.0), int(cumulative) / 1000)
+    return sorted(((ms, name) for name, ms in timings.items()), reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    # First run warms the filesystem and bytecode caches
+    import_wall_ms(args.module)
+    runs = [import_wall_ms(args.module) for _ in range(args.runs)]
+    median = statistics.median(runs)
+
+    print(f"import {args.module}: median {median:.0f}ms over {args.runs} runs "
+          f"(min {min(runs):.0f}ms, max {max(runs):.0f}ms)")
+    print("Slowest imports:")
+    for cumulative, name in slowest_imports(args.module, args.top):
+        print(f"  {cumulative:8.1f}ms  {name}")
+
+    within = median <= args.budget_ms
+    print(f"Budget {args.budget_ms:.0f}ms: {'OK' if within else 'EXCEEDED'}")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())